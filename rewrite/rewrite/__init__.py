@@ -1,13 +1,16 @@
 __path__ = __import__('pkgutil').extend_path(__path__, __name__)
 
-# helps pytest to rewrite the assert statements in test.py
-import pytest
-pytest.register_assert_rewrite("rewrite.test")
+import sys
 
-from .execution import ExecutionContext, DelegatingExecutionContext, InMemoryExecutionContext, Recipe, RecipeRunException
+# helps pytest to rewrite the assert statements in test.py, without importing pytest outside of test runs
+if 'pytest' in sys.modules:
+    sys.modules['pytest'].register_assert_rewrite("rewrite.test")
+
+from .execution import ExecutionContext, DelegatingExecutionContext, InMemoryExecutionContext, PrintEqualsInputMode, \
+    Recipe, RecipeRunException
 from .markers import *
 from .tree import Checksum, FileAttributes, SourceFile, Tree, PrintOutputCapture, PrinterFactory
-from .utils import random_id, list_find, list_map, list_map_last
+from .utils import random_id, use_id_generator, SequentialIdGenerator, list_find, list_map, list_map_last
 from .visitor import Cursor, TreeVisitor
 from .parser import *
 from .result import *
@@ -21,6 +24,8 @@ __all__ = [
     'PrintOutputCapture',
     'PrinterFactory',
     'random_id',
+    'use_id_generator',
+    'SequentialIdGenerator',
     'list_find',
     'list_map',
     'list_map_last',
@@ -29,6 +34,7 @@ __all__ = [
     'ExecutionContext',
     'DelegatingExecutionContext',
     'InMemoryExecutionContext',
+    'PrintEqualsInputMode',
 
     # Markers
     'Marker',
@@ -3,6 +3,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from collections.abc import Callable
 from dataclasses import dataclass
+from enum import Enum
 from typing import Any, ClassVar, TYPE_CHECKING, List, Optional
 
 from .tree import SourceFile
@@ -11,8 +12,22 @@ if TYPE_CHECKING:
     from .visitor import TreeVisitor, Cursor
 
 
+class PrintEqualsInputMode(Enum):
+    """How parsers verify that a parsed source file prints back to its input."""
+    FULL = 'full'
+    """Print every source file and compare the text to the input."""
+    HASH = 'hash'
+    """Compare a digest of the printed output, computed without building the printed text, to one of the input."""
+    SAMPLED = 'sampled'
+    """Fully verify a stable sample of `PRINT_EQUALS_INPUT_SAMPLE_RATE` percent of the source files."""
+    OFF = 'off'
+
+
 class ExecutionContext(ABC):
     REQUIRE_PRINT_EQUALS_INPUT: ClassVar[str] = "org.openrewrite.requirePrintEqualsInput"
+    PRINT_EQUALS_INPUT_MODE: ClassVar[str] = "org.openrewrite.python.printEqualsInputMode"
+    PRINT_EQUALS_INPUT_SAMPLE_RATE: ClassVar[str] = "org.openrewrite.python.printEqualsInputSampleRate"
+    PRINT_EQUALS_INPUT_VERIFIED: ClassVar[str] = "org.openrewrite.python.printEqualsInputVerified"
     CHARSET: ClassVar[str] = "org.openrewrite.parser.charset"
 
     @abstractmethod
@@ -1,6 +1,8 @@
 __path__ = __import__('pkgutil').extend_path(__path__, __name__)
 
 from .support_types import *
+from .type_table import *
+from .fingerprint import TreeFingerprinter
 from .visitor import *
 from .markers import *
 
@@ -9,9 +11,12 @@ __all__ = [
     'TextComment',
     'J',
     'JavaType',
+    'TypeTable',
+    'TreeFingerprinter',
     'JContainer',
     'JLeftPadded',
     'JRightPadded',
+    'Deferred',
     'Space',
     'JavaVisitor',
 
@@ -0,0 +1,127 @@
+import hashlib
+from dataclasses import fields, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from pathlib import PurePath
+from typing import Dict, List, Tuple
+from uuid import UUID
+
+from rewrite import Marker, Tree
+from .support_types import Deferred, JavaType, Space
+
+_SCALARS = (bool, int, float, complex, str, bytes, date, datetime)
+_TYPE_ATTRIBUTION = (JavaType, JavaType.FullyQualified, JavaType.GenericTypeVariable, JavaType.Primitive,
+                     JavaType.Method, JavaType.Variable, JavaType.Array)
+
+
+class TreeFingerprinter:
+    """
+    Computes Merkle-style content hashes of trees. The fingerprint of a tree covers its kind, its fields, including
+    whitespace, comments and markers, and the fingerprints of its subtrees, but neither ids nor type attribution.
+    Two subtrees with the same structure and the same source text have the same fingerprint, wherever they occur.
+    Type attribution is recognized by its value and encoded like `None`, so a tree without types has the same
+    fingerprint as one with types. Markers that are not dataclasses count by their kind only, and any other value
+    that is not a dataclass raises a `TypeError`.
+
+    Fingerprints are computed bottom-up and cached by identity for every tree they cover. As an edited tree shares
+    its unchanged subtrees with the original, fingerprinting it afterwards only hashes the nodes on the paths to
+    the changes. The cache keeps the trees it has seen alive, so a fingerprinter should not outlive its use.
+    """
+
+    def __init__(self) -> None:
+        self._fingerprints: Dict[int, Tuple[Tree, bytes]] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def fingerprint(self, tree: Tree) -> bytes:
+        cached = self._fingerprints.get(id(tree))
+        if cached is not None and cached[0] is tree:
+            return cached[1]
+        out: List[str] = []
+        self.__encode_fields(tree, out)
+        fingerprint = hashlib.blake2b('\0'.join(out).encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        self._fingerprints[id(tree)] = (tree, fingerprint)
+        return fingerprint
+
+    def clear(self) -> None:
+        self._fingerprints.clear()
+
+    def __encode_fields(self, obj: object, out: List[str]) -> None:
+        layout = _layouts.get(type(obj))
+        if layout is None:
+            layout = _layouts[type(obj)] = _layout(type(obj))
+        kind, names = layout
+        out.append(kind)
+        for name in names:
+            self.__encode(getattr(obj, name), out)
+
+    def __encode(self, value: object, out: List[str]) -> None:
+        category = _categories.get(type(value))
+        if category is None:
+            category = _categories[type(value)] = _category(type(value))
+        if category == _TREE:
+            out.append(self.fingerprint(value).hex())  # type: ignore
+        elif category == _SCALAR:
+            out.append(repr(value))
+        elif category == _DATACLASS:
+            self.__encode_fields(value, out)
+        elif category == _SEQUENCE:
+            out.append('[')
+            for element in value:  # type: ignore
+                self.__encode(element, out)
+            out.append(']')
+        elif category == _SPACE:
+            out.append('Space')
+            out.append(repr(value.whitespace))  # type: ignore
+            self.__encode(value.comments, out)  # type: ignore
+        elif category == _IGNORED:
+            out.append('-')
+        elif category == _ENUM:
+            out.append(f'{type(value).__qualname__}.{value.name}')  # type: ignore
+        elif category == _PATH:
+            out.append(repr(value.as_posix()))  # type: ignore
+        elif category == _OPAQUE_MARKER:
+            out.append(f'{type(value).__module__}.{type(value).__qualname__}')
+        elif category == _DEFERRED:
+            self.__encode(value.get(), out)  # type: ignore
+        else:
+            raise TypeError(f'cannot fingerprint a {type(value).__qualname__}')
+
+
+_TREE, _SCALAR, _DATACLASS, _SEQUENCE, _SPACE, _IGNORED, _ENUM, _PATH, _OPAQUE_MARKER, _DEFERRED, \
+    _UNSUPPORTED = range(11)
+
+
+def _category(cls: type) -> int:
+    if issubclass(cls, Tree):
+        return _TREE
+    if cls in _SCALARS:
+        return _SCALAR
+    if issubclass(cls, (list, tuple)):
+        return _SEQUENCE
+    if cls is Space:
+        return _SPACE
+    if cls is Deferred:
+        return _DEFERRED
+    if cls is type(None) or issubclass(cls, (UUID,) + _TYPE_ATTRIBUTION):
+        return _IGNORED
+    if issubclass(cls, Enum):
+        return _ENUM
+    if issubclass(cls, PurePath):
+        return _PATH
+    if is_dataclass(cls):
+        return _DATACLASS
+    if issubclass(cls, Marker):
+        return _OPAQUE_MARKER
+    return _UNSUPPORTED
+
+
+def _layout(cls: type) -> Tuple[str, Tuple[str, ...]]:
+    """The kind of the instances of a dataclass and the names of the fields that their fingerprint covers."""
+    names = tuple(f.name for f in fields(cls) if f.name not in ('_id', 'id'))
+    return f'{cls.__module__}.{cls.__qualname__}', names
+
+
+_layouts: Dict[type, Tuple[str, Tuple[str, ...]]] = {}
+_categories: Dict[type, int] = {}
@@ -7,6 +7,7 @@ from rewrite_remote import RemotingContext, SerializationContext, Deserializatio
     BREAK_MARKER
 
 from ..tree import JavaType
+from ..type_table import TypeTable
 
 
 def register_codecs():
@@ -81,9 +82,11 @@ def register_codecs():
 
 def deserialize_java_class(type_: str, decoder: CBORDecoder, context: DeserializationContext) -> JavaType.Class:
     cls = JavaType.ShallowClass() if type_ == 'org.openrewrite.java.tree.JavaType$ShallowClass' else JavaType.Class()
+    ref = None
     while not (key := decoder.decode()) == break_marker:
         if key == '@ref':
-            context.remoting_context.add_by_id(decoder.decode(), cls)
+            ref = decoder.decode()
+            context.remoting_context.add_by_id(ref, cls)
         elif key == 'flagsBitMap':
             setattr(cls, '_flags_bit_map', decoder.decode())
         elif key == 'fullyQualifiedName':
@@ -106,14 +109,16 @@ def deserialize_java_class(type_: str, decoder: CBORDecoder, context: Deserializ
             setattr(cls, '_methods', context.deserialize(List[JavaType.Method], decoder))
         else:
             raise ValueError(f"Unexpected key: {key}")
-    return cls
+    return _intern(cls, ref, context)
 
 
 def deserialize_java_method(_: str, decoder: CBORDecoder, context: DeserializationContext) -> JavaType.Method:
     method = JavaType.Method()
+    ref = None
     while not (key := decoder.decode()) == break_marker:
         if key == '@ref':
-            context.remoting_context.add_by_id(decoder.decode(), method)
+            ref = decoder.decode()
+            context.remoting_context.add_by_id(ref, method)
         elif key == 'flagsBitMap':
             method._flags_bit_map = decoder.decode()
         elif key == 'declaringType':
@@ -136,7 +141,7 @@ def deserialize_java_method(_: str, decoder: CBORDecoder, context: Deserializati
             method._declared_formal_type_names = context.deserialize(List[str], decoder)
         else:
             raise ValueError(f"Unexpected key: {key}")
-    return method
+    return _intern(method, ref, context)
 
 
 def deserialize_java_variable(_: str, decoder: CBORDecoder, context: DeserializationContext) -> JavaType.Variable:
@@ -176,16 +181,18 @@ def deserialize_java_array(_: str, decoder: CBORDecoder, context: Deserializatio
 def deserialize_java_parameterized(_: str, decoder: CBORDecoder,
                                    context: DeserializationContext) -> JavaType.Parameterized:
     param = JavaType.Parameterized()
+    ref = None
     while not (key := decoder.decode()) == break_marker:
         if key == '@ref':
-            context.remoting_context.add_by_id(decoder.decode(), param)
+            ref = decoder.decode()
+            context.remoting_context.add_by_id(ref, param)
         elif key == 'type':
             setattr(param, '_type', context.deserialize(JavaType.FullyQualified, decoder))
         elif key == 'typeParameters':
             setattr(param, '_type_parameters', context.deserialize(List[JavaType], decoder))
         else:
             raise ValueError(f"Unexpected key: {key}")
-    return param
+    return _intern(param, ref, context)
 
 
 def deserialize_java_generic_type_variable(_: str, decoder: CBORDecoder,
@@ -205,6 +212,18 @@ def deserialize_java_generic_type_variable(_: str, decoder: CBORDecoder,
     return type_variable
 
 
+def _intern(type_: JavaType, ref: Optional[int], context: DeserializationContext) -> Any:
+    interned = TypeTable.current().intern(type_)
+    if interned is type_ or TypeTable.refers_back(type_):
+        # the types deserialized along with `type_` that refer to it, like its methods, would otherwise refer to
+        # another instance than the trees do
+        return type_
+    # later references to the same type must resolve to the interned instance
+    if ref is not None:
+        context.remoting_context.add_by_id(ref, interned)
+    return interned
+
+
 def deserialize_java_primitive(_: str, decoder: CBORDecoder, context: DeserializationContext) -> JavaType.Primitive:
     kind = decoder.decode()
     assert decoder.decode() == break_marker
@@ -137,7 +137,7 @@ class JavaSender(Sender):
             ctx.send_node(class_declaration, attrgetter('_extends'), JavaSender.send_left_padded)
             ctx.send_node(class_declaration, attrgetter('_implements'), JavaSender.send_container)
             ctx.send_node(class_declaration, attrgetter('_permits'), JavaSender.send_container)
-            ctx.send_node(class_declaration, attrgetter('_body'), ctx.send_tree)
+            ctx.send_node(class_declaration, attrgetter('body'), ctx.send_tree)
             ctx.send_typed_value(class_declaration, attrgetter('_type'))
             return class_declaration
 
@@ -372,7 +372,7 @@ class JavaSender(Sender):
             ctx.send_node(method_declaration, attrgetter('_name'), self.send_method_identifier_with_annotations)
             ctx.send_node(method_declaration, attrgetter('_parameters'), JavaSender.send_container)
             ctx.send_node(method_declaration, attrgetter('_throws'), JavaSender.send_container)
-            ctx.send_node(method_declaration, attrgetter('_body'), ctx.send_tree)
+            ctx.send_node(method_declaration, attrgetter('body'), ctx.send_tree)
             ctx.send_node(method_declaration, attrgetter('_default_value'), JavaSender.send_left_padded)
             ctx.send_typed_value(method_declaration, attrgetter('_method_type'))
             return method_declaration
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-import weakref
+import threading
 from abc import abstractmethod, ABC
-from dataclasses import dataclass, field, replace
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import List, Optional, TypeVar, Generic, ClassVar, Dict, Any, TYPE_CHECKING, Iterable, cast
+from typing import List, Optional, TypeVar, Generic, ClassVar, Dict, Any, TYPE_CHECKING, Iterable, Callable, cast
 from uuid import UUID
 
 from rewrite import Markers
 from rewrite import Tree, SourceFile, TreeVisitor
+from rewrite.utils import frozen_state, replace, set_frozen_state
 
 if TYPE_CHECKING:
     from .visitor import JavaVisitor
@@ -17,6 +18,8 @@ P = TypeVar('P')
 
 
 class J(Tree):
+    __slots__ = ()
+
     @property
     @abstractmethod
     def prefix(self) -> Space:
@@ -40,6 +43,10 @@ class J(Tree):
 
 @dataclass(frozen=True)
 class Comment(ABC):
+    __slots__ = ('_text', '_suffix', '_markers')
+    __getstate__ = frozen_state
+    __setstate__ = set_frozen_state
+
     @property
     @abstractmethod
     def multiline(self) -> bool:
@@ -75,6 +82,8 @@ class Comment(ABC):
 
 @dataclass(frozen=True)
 class TextComment(Comment):
+    __slots__ = ('_multiline',)
+
     _multiline: bool
 
     @property
@@ -94,6 +103,10 @@ class TextComment(Comment):
 
 @dataclass(frozen=True)
 class Space:
+    __slots__ = ('_comments', '_whitespace')
+    __getstate__ = frozen_state
+    __setstate__ = set_frozen_state
+
     _comments: List[Comment]
 
     @property
@@ -101,7 +114,9 @@ class Space:
         return self._comments
 
     def with_comments(self, comments: List[Comment]) -> Space:
-        return self if comments is self._comments else replace(self, _comments=comments)
+        if comments is self._comments:
+            return self
+        return Space.build(comments, self._whitespace) if not comments else replace(self, _comments=comments)
 
     _whitespace: Optional[str]
 
@@ -110,7 +125,24 @@ class Space:
         return self._whitespace if self._whitespace is not None else ""
 
     def with_whitespace(self, whitespace: Optional[str]) -> Space:
-        return self if whitespace is self._whitespace else replace(self, _whitespace=whitespace)
+        if whitespace is self._whitespace or whitespace == self._whitespace:
+            return self
+        return Space.build(self._comments, whitespace) if not self._comments else replace(self, _whitespace=whitespace)
+
+    @classmethod
+    def build(cls, comments: List[Comment], whitespace: Optional[str]) -> Space:
+        """
+        Returns a `Space` with the given comments and whitespace. Short comment-free whitespace is interned,
+        so that equal values share a single instance.
+        """
+        if comments or whitespace is None or len(whitespace) > cls._FLYWEIGHT_MAX_LENGTH:
+            return Space(comments, whitespace)
+        space = cls._flyweights.get(whitespace)
+        if space is None:
+            space = Space([], whitespace)
+            if len(cls._flyweights) < cls._FLYWEIGHTS_SIZE:
+                space = cls._flyweights.setdefault(whitespace, space)
+        return space
 
     def is_empty(self) -> bool:
         return len(self._comments) == 0 and (self._whitespace is None or self._whitespace == '')
@@ -160,6 +192,10 @@ class Space:
     EMPTY: ClassVar[Space]
     SINGLE_SPACE: ClassVar[Space]
 
+    _flyweights: ClassVar[Dict[str, Space]] = {}
+    _FLYWEIGHTS_SIZE: ClassVar[int] = 4096
+    _FLYWEIGHT_MAX_LENGTH: ClassVar[int] = 100
+
     class Location(Enum):
         ANNOTATED_TYPE_PREFIX = auto()
         ANNOTATIONS = auto()
@@ -315,8 +351,8 @@ class Space:
         YIELD_PREFIX = auto()
 
 
-Space.EMPTY = Space([], '')
-Space.SINGLE_SPACE = Space([], ' ')
+Space.EMPTY = Space.build([], '')
+Space.SINGLE_SPACE = Space.build([], ' ')
 
 
 @dataclass
@@ -389,37 +425,41 @@ class JavaCoordinates:
 
 
 class JavaSourceFile(J, SourceFile):
-    pass
+    __slots__ = ()
 
 
 class Expression(J):
+    __slots__ = ()
+
     def get_coordinates(self) -> CoordinateBuilder.Expression:  # type: ignore
         return CoordinateBuilder.Expression(self)  # type: ignore
 
 
 class Statement(J):
+    __slots__ = ()
+
     def get_coordinates(self) -> CoordinateBuilder.Statement:  # type: ignore
         return CoordinateBuilder.Statement(self)  # type: ignore
 
 
 class TypedTree(J):
-    pass
+    __slots__ = ()
 
 
 class NameTree(TypedTree):
-    pass
+    __slots__ = ()
 
 
 class TypeTree(NameTree):
-    pass
+    __slots__ = ()
 
 
 class Loop(Statement):
-    pass
+    __slots__ = ()
 
 
 class MethodCall(Expression):
-    pass
+    __slots__ = ()
 
 
 class JavaType(ABC):
@@ -546,6 +586,10 @@ J3 = TypeVar('J3', bound=J)
 
 @dataclass(frozen=True)
 class JRightPadded(Generic[T]):
+    __slots__ = ('_element', '_after', '_markers')
+    __getstate__ = frozen_state
+    __setstate__ = set_frozen_state
+
     _element: T
 
     @property
@@ -656,8 +700,46 @@ class JRightPadded(Generic[T]):
             self.after_location = after_location
 
 
+
+
+class Deferred(Generic[T]):
+    """
+    Stands in for a tree held by another tree, such as the body of a function that is only mapped once it is used.
+    The accessor of the field holding it replaces it with the tree when first called, so that neither visitors nor
+    printers ever see it. It is pickled as the tree it stands in for.
+    """
+
+    __slots__ = ('_produce', '_tree')
+
+    def __init__(self, produce: Callable[[], T]):
+        self._produce: Optional[Callable[[], T]] = produce
+        self._tree: Optional[T] = None
+
+    def get(self) -> T:
+        with _deferring:
+            if self._produce is not None:
+                self._tree = self._produce()
+                self._produce = None
+        return cast(T, self._tree)
+
+    def __reduce__(self):
+        return _produced, (self.get(),)
+
+
+def _produced(tree: T) -> T:
+    return tree
+
+
+# producing a tree may use the trees deferred in it
+_deferring = threading.RLock()
+
+
 @dataclass(frozen=True)
 class JLeftPadded(Generic[T]):
+    __slots__ = ('_before', '_element', '_markers')
+    __getstate__ = frozen_state
+    __setstate__ = set_frozen_state
+
     _before: Space
 
     @property
@@ -714,6 +796,10 @@ class JLeftPadded(Generic[T]):
 
 @dataclass(frozen=True)
 class JContainer(Generic[J2]):
+    __slots__ = ('_before', '_elements', '_markers')
+    __getstate__ = frozen_state
+    __setstate__ = set_frozen_state
+
     _before: Space
 
     @property
@@ -743,6 +829,8 @@ class JContainer(Generic[J2]):
 
     @dataclass
     class PaddingHelper(Generic[J3]):
+        __slots__ = ('_t',)
+
         _t: JContainer[J3]
 
         @property
@@ -752,21 +840,9 @@ class JContainer(Generic[J2]):
         def with_elements(self, elements: List[JRightPadded[J3]]) -> JContainer[J3]:
             return self._t if self._t._elements is elements else JContainer(self._t._before, elements, self._t._markers)
 
-    _padding: Optional[weakref.ReferenceType[JContainer.PaddingHelper[J2]]] = None
-
     @property
     def padding(self) -> JContainer.PaddingHelper[J2]:
-        p: Optional[JContainer.PaddingHelper[J2]]
-        if self._padding is None:
-            p = JContainer.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = JContainer.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return JContainer.PaddingHelper(self)
 
     @classmethod
     def with_elements_nullable(cls, before: Optional[JContainer[J2]], elements: Optional[List[J2]]) -> Optional[
@@ -777,7 +853,7 @@ class JContainer(Generic[J2]):
             return JContainer(Space.EMPTY, JRightPadded.with_elements([], elements), Markers.EMPTY)
         return before.padding.with_elements(JRightPadded.with_elements(before._elements, elements))
 
-    _EMPTY: Optional[JContainer[J]] = None
+    _EMPTY: ClassVar[Optional[JContainer[J]]] = None
 
     @classmethod
     def empty(cls) -> JContainer[J2]:
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import weakref
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, replace
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, TYPE_CHECKING
 from uuid import UUID
@@ -13,10 +12,13 @@ if TYPE_CHECKING:
 from . import extensions
 from .support_types import *
 from rewrite import Checksum, FileAttributes, SourceFile, Tree, TreeVisitor, Markers, Cursor, PrintOutputCapture, PrinterFactory
+from rewrite.utils import replace
 
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class AnnotatedType(Expression, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_annotations', '_type_expression')
+
     _id: UUID
 
     @property
@@ -68,6 +70,8 @@ class AnnotatedType(Expression, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Annotation(Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_annotation_type', '_arguments')
+
     _id: UUID
 
     @property
@@ -115,6 +119,8 @@ class Annotation(Expression):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Annotation
 
         @property
@@ -124,21 +130,9 @@ class Annotation(Expression):
         def with_arguments(self, arguments: Optional[JContainer[Expression]]) -> Annotation:
             return self._t if self._t._arguments is arguments else replace(self._t, _arguments=arguments)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Annotation.PaddingHelper
-        if self._padding is None:
-            p = Annotation.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Annotation.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Annotation.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_annotation(self, p)
@@ -146,6 +140,8 @@ class Annotation(Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ArrayAccess(Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_indexed', '_dimension', '_type')
+
     _id: UUID
 
     @property
@@ -206,6 +202,8 @@ class ArrayAccess(Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ArrayType(TypeTree, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_element_type', '_annotations', '_dimension', '_type')
+
     _id: UUID
 
     @property
@@ -275,6 +273,8 @@ class ArrayType(TypeTree, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Assert(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_condition', '_detail')
+
     _id: UUID
 
     @property
@@ -326,6 +326,8 @@ class Assert(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Assignment(Statement, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_variable', '_assignment', '_type')
+
     _id: UUID
 
     @property
@@ -382,6 +384,8 @@ class Assignment(Statement, Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Assignment
 
         @property
@@ -391,21 +395,9 @@ class Assignment(Statement, Expression, TypedTree):
         def with_assignment(self, assignment: JLeftPadded[Expression]) -> Assignment:
             return self._t if self._t._assignment is assignment else replace(self._t, _assignment=assignment)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Assignment.PaddingHelper
-        if self._padding is None:
-            p = Assignment.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Assignment.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Assignment.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_assignment(self, p)
@@ -413,6 +405,8 @@ class Assignment(Statement, Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class AssignmentOperation(Statement, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_variable', '_operator', '_assignment', '_type')
+
     _id: UUID
 
     @property
@@ -494,6 +488,8 @@ class AssignmentOperation(Statement, Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: AssignmentOperation
 
         @property
@@ -503,21 +499,9 @@ class AssignmentOperation(Statement, Expression, TypedTree):
         def with_operator(self, operator: JLeftPadded[AssignmentOperation.Type]) -> AssignmentOperation:
             return self._t if self._t._operator is operator else replace(self._t, _operator=operator)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: AssignmentOperation.PaddingHelper
-        if self._padding is None:
-            p = AssignmentOperation.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = AssignmentOperation.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return AssignmentOperation.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_assignment_operation(self, p)
@@ -525,6 +509,8 @@ class AssignmentOperation(Statement, Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Binary(Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_left', '_operator', '_right', '_type')
+
     _id: UUID
 
     @property
@@ -611,6 +597,8 @@ class Binary(Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Binary
 
         @property
@@ -620,21 +608,9 @@ class Binary(Expression, TypedTree):
         def with_operator(self, operator: JLeftPadded[Binary.Type]) -> Binary:
             return self._t if self._t._operator is operator else replace(self._t, _operator=operator)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Binary.PaddingHelper
-        if self._padding is None:
-            p = Binary.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Binary.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Binary.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_binary(self, p)
@@ -642,6 +618,8 @@ class Binary(Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Block(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_static', '_statements', '_end')
+
     _id: UUID
 
     @property
@@ -698,6 +676,8 @@ class Block(Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Block
 
         @property
@@ -714,21 +694,9 @@ class Block(Statement):
         def with_statements(self, statements: List[JRightPadded[Statement]]) -> Block:
             return self._t if self._t._statements is statements else replace(self._t, _statements=statements)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Block.PaddingHelper
-        if self._padding is None:
-            p = Block.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Block.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Block.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_block(self, p)
@@ -739,6 +707,8 @@ class Block(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Break(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_label')
+
     _id: UUID
 
     @property
@@ -781,6 +751,8 @@ class Break(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Case(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_type', '_case_labels', '_statements', '_body', '_guard')
+
     _id: UUID
 
     @property
@@ -859,6 +831,8 @@ class Case(Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Case
 
         @property
@@ -882,21 +856,9 @@ class Case(Statement):
         def with_body(self, body: Optional[JRightPadded[J]]) -> Case:
             return self._t if self._t._body is body else replace(self._t, _body=body)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Case.PaddingHelper
-        if self._padding is None:
-            p = Case.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Case.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Case.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_case(self, p)
@@ -904,6 +866,11 @@ class Case(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ClassDeclaration(Statement, TypedTree):
+    __slots__ = (
+        '_id', '_prefix', '_markers', '_leading_annotations', '_modifiers', '_kind', '_name', '_type_parameters',
+        '_primary_constructor', '_extends', '_implements', '_permits', '_body', '_type'
+    )
+
     _id: UUID
 
     @property
@@ -1012,6 +979,8 @@ class ClassDeclaration(Statement, TypedTree):
 
     @property
     def body(self) -> Block:
+        if isinstance(self._body, Deferred):
+            object.__setattr__(self, '_body', self._body.get())
         return self._body
 
     def with_body(self, body: Block) -> ClassDeclaration:
@@ -1029,6 +998,8 @@ class ClassDeclaration(Statement, TypedTree):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Kind(J):
+        __slots__ = ('_id', '_prefix', '_markers', '_annotations', '_type')
+
         _id: UUID
 
         @property
@@ -1087,6 +1058,8 @@ class ClassDeclaration(Statement, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: ClassDeclaration
 
         @property
@@ -1131,21 +1104,9 @@ class ClassDeclaration(Statement, TypedTree):
         def with_permits(self, permits: Optional[JContainer[TypeTree]]) -> ClassDeclaration:
             return self._t if self._t._permits is permits else replace(self._t, _permits=permits)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: ClassDeclaration.PaddingHelper
-        if self._padding is None:
-            p = ClassDeclaration.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = ClassDeclaration.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return ClassDeclaration.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_class_declaration(self, p)
@@ -1153,6 +1114,11 @@ class ClassDeclaration(Statement, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class CompilationUnit(JavaSourceFile, SourceFile):
+    __slots__ = (
+        '_id', '_prefix', '_markers', '_source_path', '_file_attributes', '_charset_name', '_charset_bom_marked',
+        '_checksum', '_package_declaration', '_imports', '_classes', '_eof'
+    )
+
     _id: UUID
 
     @property
@@ -1263,6 +1229,8 @@ class CompilationUnit(JavaSourceFile, SourceFile):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: CompilationUnit
 
         @property
@@ -1279,21 +1247,9 @@ class CompilationUnit(JavaSourceFile, SourceFile):
         def with_imports(self, imports: List[JRightPadded[Import]]) -> CompilationUnit:
             return self._t if self._t._imports is imports else replace(self._t, _imports=imports)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: CompilationUnit.PaddingHelper
-        if self._padding is None:
-            p = CompilationUnit.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = CompilationUnit.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return CompilationUnit.PaddingHelper(self)
 
     def printer(self, cursor: Cursor) -> TreeVisitor[Tree, PrintOutputCapture[P]]:
         if factory := PrinterFactory.current():
@@ -1307,6 +1263,8 @@ class CompilationUnit(JavaSourceFile, SourceFile):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Continue(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_label')
+
     _id: UUID
 
     @property
@@ -1349,6 +1307,8 @@ class Continue(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class DoWhileLoop(Loop):
+    __slots__ = ('_id', '_prefix', '_markers', '_body', '_while_condition')
+
     _id: UUID
 
     @property
@@ -1396,6 +1356,8 @@ class DoWhileLoop(Loop):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: DoWhileLoop
 
         @property
@@ -1412,21 +1374,9 @@ class DoWhileLoop(Loop):
         def with_while_condition(self, while_condition: JLeftPadded[ControlParentheses[Expression]]) -> DoWhileLoop:
             return self._t if self._t._while_condition is while_condition else replace(self._t, _while_condition=while_condition)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: DoWhileLoop.PaddingHelper
-        if self._padding is None:
-            p = DoWhileLoop.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = DoWhileLoop.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return DoWhileLoop.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_do_while_loop(self, p)
@@ -1434,6 +1384,8 @@ class DoWhileLoop(Loop):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Empty(Statement, Expression, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers')
+
     _id: UUID
 
     @property
@@ -1467,6 +1419,8 @@ class Empty(Statement, Expression, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class EnumValue(J):
+    __slots__ = ('_id', '_prefix', '_markers', '_annotations', '_name', '_initializer')
+
     _id: UUID
 
     @property
@@ -1527,6 +1481,8 @@ class EnumValue(J):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class EnumValueSet(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_enums', '_terminated_with_semicolon')
+
     _id: UUID
 
     @property
@@ -1574,6 +1530,8 @@ class EnumValueSet(Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: EnumValueSet
 
         @property
@@ -1583,21 +1541,9 @@ class EnumValueSet(Statement):
         def with_enums(self, enums: List[JRightPadded[EnumValue]]) -> EnumValueSet:
             return self._t if self._t._enums is enums else replace(self._t, _enums=enums)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: EnumValueSet.PaddingHelper
-        if self._padding is None:
-            p = EnumValueSet.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = EnumValueSet.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return EnumValueSet.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_enum_value_set(self, p)
@@ -1605,6 +1551,8 @@ class EnumValueSet(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class FieldAccess(TypeTree, Expression, Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_target', '_name', '_type')
+
     _id: UUID
 
     @property
@@ -1661,6 +1609,8 @@ class FieldAccess(TypeTree, Expression, Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: FieldAccess
 
         @property
@@ -1670,21 +1620,9 @@ class FieldAccess(TypeTree, Expression, Statement):
         def with_name(self, name: JLeftPadded[Identifier]) -> FieldAccess:
             return self._t if self._t._name is name else replace(self._t, _name=name)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: FieldAccess.PaddingHelper
-        if self._padding is None:
-            p = FieldAccess.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = FieldAccess.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return FieldAccess.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_field_access(self, p)
@@ -1692,6 +1630,8 @@ class FieldAccess(TypeTree, Expression, Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ForEachLoop(Loop):
+    __slots__ = ('_id', '_prefix', '_markers', '_control', '_body')
+
     _id: UUID
 
     @property
@@ -1740,6 +1680,8 @@ class ForEachLoop(Loop):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Control(J):
+        __slots__ = ('_id', '_prefix', '_markers', '_variable', '_iterable')
+
         _id: UUID
 
         @property
@@ -1787,6 +1729,8 @@ class ForEachLoop(Loop):
 
         @dataclass
         class PaddingHelper:
+            __slots__ = ('_t',)
+
             _t: ForEachLoop.Control
 
             @property
@@ -1803,27 +1747,17 @@ class ForEachLoop(Loop):
             def with_iterable(self, iterable: JRightPadded[Expression]) -> ForEachLoop.Control:
                 return self._t if self._t._iterable is iterable else replace(self._t, _iterable=iterable)
 
-        _padding: weakref.ReferenceType[PaddingHelper] = None
-
         @property
         def padding(self) -> PaddingHelper:
-            p: ForEachLoop.Control.PaddingHelper
-            if self._padding is None:
-                p = ForEachLoop.Control.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-            else:
-                p = self._padding()
-                # noinspection PyProtectedMember
-                if p is None or p._t != self:
-                    p = ForEachLoop.Control.PaddingHelper(self)
-                    object.__setattr__(self, '_padding', weakref.ref(p))
-            return p
+            return ForEachLoop.Control.PaddingHelper(self)
 
         def accept_java(self, v: JavaVisitor[P], p: P) -> J:
             return v.visit_for_each_control(self, p)
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: ForEachLoop
 
         @property
@@ -1833,21 +1767,9 @@ class ForEachLoop(Loop):
         def with_body(self, body: JRightPadded[Statement]) -> ForEachLoop:
             return self._t if self._t._body is body else replace(self._t, _body=body)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: ForEachLoop.PaddingHelper
-        if self._padding is None:
-            p = ForEachLoop.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = ForEachLoop.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return ForEachLoop.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_for_each_loop(self, p)
@@ -1855,6 +1777,8 @@ class ForEachLoop(Loop):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ForLoop(Loop):
+    __slots__ = ('_id', '_prefix', '_markers', '_control', '_body')
+
     _id: UUID
 
     @property
@@ -1903,6 +1827,8 @@ class ForLoop(Loop):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Control(J):
+        __slots__ = ('_id', '_prefix', '_markers', '_init', '_condition', '_update')
+
         _id: UUID
 
         @property
@@ -1959,6 +1885,8 @@ class ForLoop(Loop):
 
         @dataclass
         class PaddingHelper:
+            __slots__ = ('_t',)
+
             _t: ForLoop.Control
 
             @property
@@ -1982,27 +1910,17 @@ class ForLoop(Loop):
             def with_update(self, update: List[JRightPadded[Statement]]) -> ForLoop.Control:
                 return self._t if self._t._update is update else replace(self._t, _update=update)
 
-        _padding: weakref.ReferenceType[PaddingHelper] = None
-
         @property
         def padding(self) -> PaddingHelper:
-            p: ForLoop.Control.PaddingHelper
-            if self._padding is None:
-                p = ForLoop.Control.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-            else:
-                p = self._padding()
-                # noinspection PyProtectedMember
-                if p is None or p._t != self:
-                    p = ForLoop.Control.PaddingHelper(self)
-                    object.__setattr__(self, '_padding', weakref.ref(p))
-            return p
+            return ForLoop.Control.PaddingHelper(self)
 
         def accept_java(self, v: JavaVisitor[P], p: P) -> J:
             return v.visit_for_control(self, p)
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: ForLoop
 
         @property
@@ -2012,21 +1930,9 @@ class ForLoop(Loop):
         def with_body(self, body: JRightPadded[Statement]) -> ForLoop:
             return self._t if self._t._body is body else replace(self._t, _body=body)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: ForLoop.PaddingHelper
-        if self._padding is None:
-            p = ForLoop.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = ForLoop.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return ForLoop.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_for_loop(self, p)
@@ -2034,6 +1940,8 @@ class ForLoop(Loop):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ParenthesizedTypeTree(TypeTree, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_annotations', '_parenthesized_type')
+
     _id: UUID
 
     @property
@@ -2085,6 +1993,8 @@ class ParenthesizedTypeTree(TypeTree, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Identifier(TypeTree, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_annotations', '_simple_name', '_type', '_field_type')
+
     _id: UUID
 
     @property
@@ -2154,6 +2064,8 @@ class Identifier(TypeTree, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class If(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_if_condition', '_then_part', '_else_part')
+
     _id: UUID
 
     @property
@@ -2211,6 +2123,8 @@ class If(Statement):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Else(J):
+        __slots__ = ('_id', '_prefix', '_markers', '_body')
+
         _id: UUID
 
         @property
@@ -2249,6 +2163,8 @@ class If(Statement):
 
         @dataclass
         class PaddingHelper:
+            __slots__ = ('_t',)
+
             _t: If.Else
 
             @property
@@ -2258,27 +2174,17 @@ class If(Statement):
             def with_body(self, body: JRightPadded[Statement]) -> If.Else:
                 return self._t if self._t._body is body else replace(self._t, _body=body)
 
-        _padding: weakref.ReferenceType[PaddingHelper] = None
-
         @property
         def padding(self) -> PaddingHelper:
-            p: If.Else.PaddingHelper
-            if self._padding is None:
-                p = If.Else.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-            else:
-                p = self._padding()
-                # noinspection PyProtectedMember
-                if p is None or p._t != self:
-                    p = If.Else.PaddingHelper(self)
-                    object.__setattr__(self, '_padding', weakref.ref(p))
-            return p
+            return If.Else.PaddingHelper(self)
 
         def accept_java(self, v: JavaVisitor[P], p: P) -> J:
             return v.visit_else(self, p)
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: If
 
         @property
@@ -2288,21 +2194,9 @@ class If(Statement):
         def with_then_part(self, then_part: JRightPadded[Statement]) -> If:
             return self._t if self._t._then_part is then_part else replace(self._t, _then_part=then_part)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: If.PaddingHelper
-        if self._padding is None:
-            p = If.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = If.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return If.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_if(self, p)
@@ -2310,6 +2204,8 @@ class If(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Import(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_static', '_qualid', '_alias')
+
     _id: UUID
 
     @property
@@ -2366,6 +2262,8 @@ class Import(Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Import
 
         @property
@@ -2382,21 +2280,9 @@ class Import(Statement):
         def with_alias(self, alias: Optional[JLeftPadded[Identifier]]) -> Import:
             return self._t if self._t._alias is alias else replace(self._t, _alias=alias)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Import.PaddingHelper
-        if self._padding is None:
-            p = Import.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Import.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Import.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_import(self, p)
@@ -2404,6 +2290,8 @@ class Import(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class InstanceOf(Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_expression', '_clazz', '_pattern', '_type')
+
     _id: UUID
 
     @property
@@ -2469,6 +2357,8 @@ class InstanceOf(Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: InstanceOf
 
         @property
@@ -2478,21 +2368,9 @@ class InstanceOf(Expression, TypedTree):
         def with_expression(self, expression: JRightPadded[Expression]) -> InstanceOf:
             return self._t if self._t._expression is expression else replace(self._t, _expression=expression)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: InstanceOf.PaddingHelper
-        if self._padding is None:
-            p = InstanceOf.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = InstanceOf.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return InstanceOf.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_instance_of(self, p)
@@ -2500,6 +2378,8 @@ class InstanceOf(Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class DeconstructionPattern(TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_deconstructor', '_nested', '_type')
+
     _id: UUID
 
     @property
@@ -2556,6 +2436,8 @@ class DeconstructionPattern(TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: DeconstructionPattern
 
         @property
@@ -2565,21 +2447,9 @@ class DeconstructionPattern(TypedTree):
         def with_nested(self, nested: JContainer[J]) -> DeconstructionPattern:
             return self._t if self._t._nested is nested else replace(self._t, _nested=nested)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: DeconstructionPattern.PaddingHelper
-        if self._padding is None:
-            p = DeconstructionPattern.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = DeconstructionPattern.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return DeconstructionPattern.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_deconstruction_pattern(self, p)
@@ -2587,6 +2457,8 @@ class DeconstructionPattern(TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class IntersectionType(TypeTree, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_bounds')
+
     _id: UUID
 
     @property
@@ -2625,6 +2497,8 @@ class IntersectionType(TypeTree, Expression):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: IntersectionType
 
         @property
@@ -2634,21 +2508,9 @@ class IntersectionType(TypeTree, Expression):
         def with_bounds(self, bounds: JContainer[TypeTree]) -> IntersectionType:
             return self._t if self._t._bounds is bounds else replace(self._t, _bounds=bounds)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: IntersectionType.PaddingHelper
-        if self._padding is None:
-            p = IntersectionType.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = IntersectionType.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return IntersectionType.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_intersection_type(self, p)
@@ -2656,6 +2518,8 @@ class IntersectionType(TypeTree, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Label(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_label', '_statement')
+
     _id: UUID
 
     @property
@@ -2703,6 +2567,8 @@ class Label(Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Label
 
         @property
@@ -2712,21 +2578,9 @@ class Label(Statement):
         def with_label(self, label: JRightPadded[Identifier]) -> Label:
             return self._t if self._t._label is label else replace(self._t, _label=label)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Label.PaddingHelper
-        if self._padding is None:
-            p = Label.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Label.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Label.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_label(self, p)
@@ -2734,6 +2588,8 @@ class Label(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Lambda(Statement, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_parameters', '_arrow', '_body', '_type')
+
     _id: UUID
 
     @property
@@ -2800,6 +2656,8 @@ class Lambda(Statement, Expression, TypedTree):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Parameters(J):
+        __slots__ = ('_id', '_prefix', '_markers', '_parenthesized', '_parameters')
+
         _id: UUID
 
         @property
@@ -2847,6 +2705,8 @@ class Lambda(Statement, Expression, TypedTree):
 
         @dataclass
         class PaddingHelper:
+            __slots__ = ('_t',)
+
             _t: Lambda.Parameters
 
             @property
@@ -2856,21 +2716,9 @@ class Lambda(Statement, Expression, TypedTree):
             def with_parameters(self, parameters: List[JRightPadded[J]]) -> Lambda.Parameters:
                 return self._t if self._t._parameters is parameters else replace(self._t, _parameters=parameters)
 
-        _padding: weakref.ReferenceType[PaddingHelper] = None
-
         @property
         def padding(self) -> PaddingHelper:
-            p: Lambda.Parameters.PaddingHelper
-            if self._padding is None:
-                p = Lambda.Parameters.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-            else:
-                p = self._padding()
-                # noinspection PyProtectedMember
-                if p is None or p._t != self:
-                    p = Lambda.Parameters.PaddingHelper(self)
-                    object.__setattr__(self, '_padding', weakref.ref(p))
-            return p
+            return Lambda.Parameters.PaddingHelper(self)
 
         def accept_java(self, v: JavaVisitor[P], p: P) -> J:
             return v.visit_lambda_parameters(self, p)
@@ -2881,6 +2729,8 @@ class Lambda(Statement, Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Literal(Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_value', '_value_source', '_unicode_escapes', '_type')
+
     _id: UUID
 
     @property
@@ -2970,6 +2820,11 @@ class Literal(Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class MemberReference(TypedTree, MethodCall):
+    __slots__ = (
+        '_id', '_prefix', '_markers', '_containing', '_type_parameters', '_reference', '_type', '_method_type',
+        '_variable_type'
+    )
+
     _id: UUID
 
     @property
@@ -3053,6 +2908,8 @@ class MemberReference(TypedTree, MethodCall):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: MemberReference
 
         @property
@@ -3076,21 +2933,9 @@ class MemberReference(TypedTree, MethodCall):
         def with_reference(self, reference: JLeftPadded[Identifier]) -> MemberReference:
             return self._t if self._t._reference is reference else replace(self._t, _reference=reference)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: MemberReference.PaddingHelper
-        if self._padding is None:
-            p = MemberReference.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = MemberReference.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return MemberReference.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_member_reference(self, p)
@@ -3098,6 +2943,11 @@ class MemberReference(TypedTree, MethodCall):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class MethodDeclaration(Statement, TypedTree):
+    __slots__ = (
+        '_id', '_prefix', '_markers', '_leading_annotations', '_modifiers', '_type_parameters',
+        '_return_type_expression', '_name', '_parameters', '_throws', '_body', '_default_value', '_method_type'
+    )
+
     _id: UUID
 
     @property
@@ -3178,6 +3028,8 @@ class MethodDeclaration(Statement, TypedTree):
 
     @property
     def body(self) -> Optional[Block]:
+        if isinstance(self._body, Deferred):
+            object.__setattr__(self, '_body', self._body.get())
         return self._body
 
     def with_body(self, body: Optional[Block]) -> MethodDeclaration:
@@ -3223,6 +3075,8 @@ class MethodDeclaration(Statement, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: MethodDeclaration
 
         @property
@@ -3260,24 +3114,14 @@ class MethodDeclaration(Statement, TypedTree):
         def with_default_value(self, default_value: Optional[JLeftPadded[Expression]]) -> MethodDeclaration:
             return self._t if self._t._default_value is default_value else replace(self._t, _default_value=default_value)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: MethodDeclaration.PaddingHelper
-        if self._padding is None:
-            p = MethodDeclaration.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = MethodDeclaration.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return MethodDeclaration.PaddingHelper(self)
 
     @dataclass
     class AnnotationsHelper:
+        __slots__ = ('_t',)
+
         _t: MethodDeclaration
 
         @property
@@ -3315,21 +3159,9 @@ class MethodDeclaration(Statement, TypedTree):
         def with_default_value(self, default_value: Optional[JLeftPadded[Expression]]) -> MethodDeclaration:
             return self._t if self._t._default_value is default_value else replace(self._t, _default_value=default_value)
 
-    _annotations: weakref.ReferenceType[AnnotationsHelper] = None
-
     @property
     def annotations(self) -> AnnotationsHelper:
-        p: MethodDeclaration.AnnotationsHelper
-        if self._annotations is None:
-            p = MethodDeclaration.AnnotationsHelper(self)
-            object.__setattr__(self, '_annotations', weakref.ref(p))
-        else:
-            p = self._annotations()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = MethodDeclaration.AnnotationsHelper(self)
-                object.__setattr__(self, '_annotations', weakref.ref(p))
-        return p
+        return MethodDeclaration.AnnotationsHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_method_declaration(self, p)
@@ -3337,6 +3169,8 @@ class MethodDeclaration(Statement, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class MethodInvocation(Statement, TypedTree, MethodCall):
+    __slots__ = ('_id', '_prefix', '_markers', '_select', '_type_parameters', '_name', '_arguments', '_method_type')
+
     _id: UUID
 
     @property
@@ -3411,6 +3245,8 @@ class MethodInvocation(Statement, TypedTree, MethodCall):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: MethodInvocation
 
         @property
@@ -3434,21 +3270,9 @@ class MethodInvocation(Statement, TypedTree, MethodCall):
         def with_arguments(self, arguments: JContainer[Expression]) -> MethodInvocation:
             return self._t if self._t._arguments is arguments else replace(self._t, _arguments=arguments)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: MethodInvocation.PaddingHelper
-        if self._padding is None:
-            p = MethodInvocation.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = MethodInvocation.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return MethodInvocation.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_method_invocation(self, p)
@@ -3456,6 +3280,8 @@ class MethodInvocation(Statement, TypedTree, MethodCall):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Modifier(J):
+    __slots__ = ('_id', '_prefix', '_markers', '_keyword', '_type', '_annotations')
+
     _id: UUID
 
     @property
@@ -3536,6 +3362,8 @@ class Modifier(J):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class MultiCatch(TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_alternatives')
+
     _id: UUID
 
     @property
@@ -3574,6 +3402,8 @@ class MultiCatch(TypeTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: MultiCatch
 
         @property
@@ -3583,21 +3413,9 @@ class MultiCatch(TypeTree):
         def with_alternatives(self, alternatives: List[JRightPadded[NameTree]]) -> MultiCatch:
             return self._t if self._t._alternatives is alternatives else replace(self._t, _alternatives=alternatives)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: MultiCatch.PaddingHelper
-        if self._padding is None:
-            p = MultiCatch.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = MultiCatch.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return MultiCatch.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_multi_catch(self, p)
@@ -3605,6 +3423,8 @@ class MultiCatch(TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class NewArray(Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_type_expression', '_dimensions', '_initializer', '_type')
+
     _id: UUID
 
     @property
@@ -3670,6 +3490,8 @@ class NewArray(Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: NewArray
 
         @property
@@ -3679,21 +3501,9 @@ class NewArray(Expression, TypedTree):
         def with_initializer(self, initializer: Optional[JContainer[Expression]]) -> NewArray:
             return self._t if self._t._initializer is initializer else replace(self._t, _initializer=initializer)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: NewArray.PaddingHelper
-        if self._padding is None:
-            p = NewArray.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = NewArray.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return NewArray.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_new_array(self, p)
@@ -3701,6 +3511,8 @@ class NewArray(Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ArrayDimension(J):
+    __slots__ = ('_id', '_prefix', '_markers', '_index')
+
     _id: UUID
 
     @property
@@ -3739,6 +3551,8 @@ class ArrayDimension(J):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: ArrayDimension
 
         @property
@@ -3748,21 +3562,9 @@ class ArrayDimension(J):
         def with_index(self, index: JRightPadded[Expression]) -> ArrayDimension:
             return self._t if self._t._index is index else replace(self._t, _index=index)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: ArrayDimension.PaddingHelper
-        if self._padding is None:
-            p = ArrayDimension.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = ArrayDimension.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return ArrayDimension.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_array_dimension(self, p)
@@ -3770,6 +3572,10 @@ class ArrayDimension(J):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class NewClass(Statement, TypedTree, MethodCall):
+    __slots__ = (
+        '_id', '_prefix', '_markers', '_enclosing', '_new', '_clazz', '_arguments', '_body', '_constructor_type'
+    )
+
     _id: UUID
 
     @property
@@ -3853,6 +3659,8 @@ class NewClass(Statement, TypedTree, MethodCall):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: NewClass
 
         @property
@@ -3869,21 +3677,9 @@ class NewClass(Statement, TypedTree, MethodCall):
         def with_arguments(self, arguments: JContainer[Expression]) -> NewClass:
             return self._t if self._t._arguments is arguments else replace(self._t, _arguments=arguments)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: NewClass.PaddingHelper
-        if self._padding is None:
-            p = NewClass.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = NewClass.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return NewClass.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_new_class(self, p)
@@ -3891,6 +3687,8 @@ class NewClass(Statement, TypedTree, MethodCall):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class NullableType(TypeTree, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_annotations', '_type_tree')
+
     _id: UUID
 
     @property
@@ -3938,6 +3736,8 @@ class NullableType(TypeTree, Expression):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: NullableType
 
         @property
@@ -3947,21 +3747,9 @@ class NullableType(TypeTree, Expression):
         def with_type_tree(self, type_tree: JRightPadded[TypeTree]) -> NullableType:
             return self._t if self._t._type_tree is type_tree else replace(self._t, _type_tree=type_tree)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: NullableType.PaddingHelper
-        if self._padding is None:
-            p = NullableType.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = NullableType.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return NullableType.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_nullable_type(self, p)
@@ -3969,6 +3757,8 @@ class NullableType(TypeTree, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Package(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_expression', '_annotations')
+
     _id: UUID
 
     @property
@@ -4020,6 +3810,8 @@ class Package(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ParameterizedType(TypeTree, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_clazz', '_type_parameters', '_type')
+
     _id: UUID
 
     @property
@@ -4076,6 +3868,8 @@ class ParameterizedType(TypeTree, Expression):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: ParameterizedType
 
         @property
@@ -4085,21 +3879,9 @@ class ParameterizedType(TypeTree, Expression):
         def with_type_parameters(self, type_parameters: Optional[JContainer[Expression]]) -> ParameterizedType:
             return self._t if self._t._type_parameters is type_parameters else replace(self._t, _type_parameters=type_parameters)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: ParameterizedType.PaddingHelper
-        if self._padding is None:
-            p = ParameterizedType.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = ParameterizedType.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return ParameterizedType.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_parameterized_type(self, p)
@@ -4107,6 +3889,8 @@ class ParameterizedType(TypeTree, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Parentheses(Expression, Generic[J2]):
+    __slots__ = ('_id', '_prefix', '_markers', '_tree')
+
     _id: UUID
 
     @property
@@ -4149,6 +3933,8 @@ class Parentheses(Expression, Generic[J2]):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Parentheses[J2]
 
         @property
@@ -4158,21 +3944,9 @@ class Parentheses(Expression, Generic[J2]):
         def with_tree(self, tree: JRightPadded[J2]) -> Parentheses[J2]:
             return self._t if self._t._tree is tree else replace(self._t, _tree=tree)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Parentheses[J2].PaddingHelper
-        if self._padding is None:
-            p = Parentheses[J2].PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Parentheses[J2].PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Parentheses[J2].PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_parentheses(self, p)
@@ -4180,6 +3954,8 @@ class Parentheses(Expression, Generic[J2]):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ControlParentheses(Expression, Generic[J2]):
+    __slots__ = ('_id', '_prefix', '_markers', '_tree')
+
     _id: UUID
 
     @property
@@ -4218,6 +3994,8 @@ class ControlParentheses(Expression, Generic[J2]):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: ControlParentheses[J2]
 
         @property
@@ -4227,21 +4005,9 @@ class ControlParentheses(Expression, Generic[J2]):
         def with_tree(self, tree: JRightPadded[J2]) -> ControlParentheses[J2]:
             return self._t if self._t._tree is tree else replace(self._t, _tree=tree)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: ControlParentheses[J2].PaddingHelper
-        if self._padding is None:
-            p = ControlParentheses[J2].PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = ControlParentheses[J2].PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return ControlParentheses[J2].PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_control_parentheses(self, p)
@@ -4249,6 +4015,8 @@ class ControlParentheses(Expression, Generic[J2]):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Primitive(TypeTree, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_type')
+
     _id: UUID
 
     @property
@@ -4291,6 +4059,8 @@ class Primitive(TypeTree, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Return(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_expression')
+
     _id: UUID
 
     @property
@@ -4333,6 +4103,8 @@ class Return(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Switch(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_selector', '_cases')
+
     _id: UUID
 
     @property
@@ -4384,6 +4156,8 @@ class Switch(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class SwitchExpression(Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_selector', '_cases', '_type')
+
     _id: UUID
 
     @property
@@ -4444,6 +4218,8 @@ class SwitchExpression(Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Synchronized(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_lock', '_body')
+
     _id: UUID
 
     @property
@@ -4495,6 +4271,8 @@ class Synchronized(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Ternary(Expression, Statement, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_condition', '_true_part', '_false_part', '_type')
+
     _id: UUID
 
     @property
@@ -4560,6 +4338,8 @@ class Ternary(Expression, Statement, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Ternary
 
         @property
@@ -4576,21 +4356,9 @@ class Ternary(Expression, Statement, TypedTree):
         def with_false_part(self, false_part: JLeftPadded[Expression]) -> Ternary:
             return self._t if self._t._false_part is false_part else replace(self._t, _false_part=false_part)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Ternary.PaddingHelper
-        if self._padding is None:
-            p = Ternary.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Ternary.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Ternary.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_ternary(self, p)
@@ -4598,6 +4366,8 @@ class Ternary(Expression, Statement, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Throw(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_exception')
+
     _id: UUID
 
     @property
@@ -4640,6 +4410,8 @@ class Throw(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Try(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_resources', '_body', '_catches', '_finally')
+
     _id: UUID
 
     @property
@@ -4706,6 +4478,8 @@ class Try(Statement):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Resource(J):
+        __slots__ = ('_id', '_prefix', '_markers', '_variable_declarations', '_terminated_with_semicolon')
+
         _id: UUID
 
         @property
@@ -4757,6 +4531,8 @@ class Try(Statement):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Catch(J):
+        __slots__ = ('_id', '_prefix', '_markers', '_parameter', '_body')
+
         _id: UUID
 
         @property
@@ -4807,6 +4583,8 @@ class Try(Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Try
 
         @property
@@ -4823,21 +4601,9 @@ class Try(Statement):
         def with_finally(self, finally_: Optional[JLeftPadded[Block]]) -> Try:
             return self._t if self._t._finally is finally_ else replace(self._t, _finally=finally_)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Try.PaddingHelper
-        if self._padding is None:
-            p = Try.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Try.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Try.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_try(self, p)
@@ -4845,6 +4611,8 @@ class Try(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class TypeCast(Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_clazz', '_expression')
+
     _id: UUID
 
     @property
@@ -4896,6 +4664,8 @@ class TypeCast(Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class TypeParameter(J):
+    __slots__ = ('_id', '_prefix', '_markers', '_annotations', '_modifiers', '_name', '_bounds')
+
     _id: UUID
 
     @property
@@ -4961,6 +4731,8 @@ class TypeParameter(J):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: TypeParameter
 
         @property
@@ -4970,21 +4742,9 @@ class TypeParameter(J):
         def with_bounds(self, bounds: Optional[JContainer[TypeTree]]) -> TypeParameter:
             return self._t if self._t._bounds is bounds else replace(self._t, _bounds=bounds)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: TypeParameter.PaddingHelper
-        if self._padding is None:
-            p = TypeParameter.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = TypeParameter.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return TypeParameter.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_type_parameter(self, p)
@@ -4992,6 +4752,8 @@ class TypeParameter(J):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class TypeParameters(J):
+    __slots__ = ('_id', '_prefix', '_markers', '_annotations', '_type_parameters')
+
     _id: UUID
 
     @property
@@ -5039,6 +4801,8 @@ class TypeParameters(J):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: TypeParameters
 
         @property
@@ -5048,21 +4812,9 @@ class TypeParameters(J):
         def with_type_parameters(self, type_parameters: List[JRightPadded[TypeParameter]]) -> TypeParameters:
             return self._t if self._t._type_parameters is type_parameters else replace(self._t, _type_parameters=type_parameters)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: TypeParameters.PaddingHelper
-        if self._padding is None:
-            p = TypeParameters.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = TypeParameters.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return TypeParameters.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_type_parameters(self, p)
@@ -5070,6 +4822,8 @@ class TypeParameters(J):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Unary(Statement, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_operator', '_expression', '_type')
+
     _id: UUID
 
     @property
@@ -5136,6 +4890,8 @@ class Unary(Statement, Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Unary
 
         @property
@@ -5145,21 +4901,9 @@ class Unary(Statement, Expression, TypedTree):
         def with_operator(self, operator: JLeftPadded[Unary.Type]) -> Unary:
             return self._t if self._t._operator is operator else replace(self._t, _operator=operator)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Unary.PaddingHelper
-        if self._padding is None:
-            p = Unary.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Unary.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Unary.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_unary(self, p)
@@ -5167,6 +4911,11 @@ class Unary(Statement, Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class VariableDeclarations(Statement, TypedTree):
+    __slots__ = (
+        '_id', '_prefix', '_markers', '_leading_annotations', '_modifiers', '_type_expression', '_varargs',
+        '_dimensions_before_name', '_variables'
+    )
+
     _id: UUID
 
     @property
@@ -5251,6 +5000,8 @@ class VariableDeclarations(Statement, TypedTree):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class NamedVariable(NameTree):
+        __slots__ = ('_id', '_prefix', '_markers', '_name', '_dimensions_after_name', '_initializer', '_variable_type')
+
         _id: UUID
 
         @property
@@ -5316,6 +5067,8 @@ class VariableDeclarations(Statement, TypedTree):
 
         @dataclass
         class PaddingHelper:
+            __slots__ = ('_t',)
+
             _t: VariableDeclarations.NamedVariable
 
             @property
@@ -5325,27 +5078,17 @@ class VariableDeclarations(Statement, TypedTree):
             def with_initializer(self, initializer: Optional[JLeftPadded[Expression]]) -> VariableDeclarations.NamedVariable:
                 return self._t if self._t._initializer is initializer else replace(self._t, _initializer=initializer)
 
-        _padding: weakref.ReferenceType[PaddingHelper] = None
-
         @property
         def padding(self) -> PaddingHelper:
-            p: VariableDeclarations.NamedVariable.PaddingHelper
-            if self._padding is None:
-                p = VariableDeclarations.NamedVariable.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-            else:
-                p = self._padding()
-                # noinspection PyProtectedMember
-                if p is None or p._t != self:
-                    p = VariableDeclarations.NamedVariable.PaddingHelper(self)
-                    object.__setattr__(self, '_padding', weakref.ref(p))
-            return p
+            return VariableDeclarations.NamedVariable.PaddingHelper(self)
 
         def accept_java(self, v: JavaVisitor[P], p: P) -> J:
             return v.visit_variable(self, p)
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: VariableDeclarations
 
         @property
@@ -5355,21 +5098,9 @@ class VariableDeclarations(Statement, TypedTree):
         def with_variables(self, variables: List[JRightPadded[VariableDeclarations.NamedVariable]]) -> VariableDeclarations:
             return self._t if self._t._variables is variables else replace(self._t, _variables=variables)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: VariableDeclarations.PaddingHelper
-        if self._padding is None:
-            p = VariableDeclarations.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = VariableDeclarations.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return VariableDeclarations.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_variable_declarations(self, p)
@@ -5377,6 +5108,8 @@ class VariableDeclarations(Statement, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class WhileLoop(Loop):
+    __slots__ = ('_id', '_prefix', '_markers', '_condition', '_body')
+
     _id: UUID
 
     @property
@@ -5424,6 +5157,8 @@ class WhileLoop(Loop):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: WhileLoop
 
         @property
@@ -5433,21 +5168,9 @@ class WhileLoop(Loop):
         def with_body(self, body: JRightPadded[Statement]) -> WhileLoop:
             return self._t if self._t._body is body else replace(self._t, _body=body)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: WhileLoop.PaddingHelper
-        if self._padding is None:
-            p = WhileLoop.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = WhileLoop.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return WhileLoop.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_while_loop(self, p)
@@ -5455,6 +5178,8 @@ class WhileLoop(Loop):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Wildcard(Expression, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_bound', '_bounded_type')
+
     _id: UUID
 
     @property
@@ -5506,6 +5231,8 @@ class Wildcard(Expression, TypeTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Wildcard
 
         @property
@@ -5515,21 +5242,9 @@ class Wildcard(Expression, TypeTree):
         def with_bound(self, bound: Optional[JLeftPadded[Wildcard.Bound]]) -> Wildcard:
             return self._t if self._t._bound is bound else replace(self._t, _bound=bound)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Wildcard.PaddingHelper
-        if self._padding is None:
-            p = Wildcard.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Wildcard.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Wildcard.PaddingHelper(self)
 
     def accept_java(self, v: JavaVisitor[P], p: P) -> J:
         return v.visit_wildcard(self, p)
@@ -5537,6 +5252,8 @@ class Wildcard(Expression, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Yield(Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_implicit', '_value')
+
     _id: UUID
 
     @property
@@ -5588,6 +5305,8 @@ class Yield(Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Unknown(Statement, Expression, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_source')
+
     _id: UUID
 
     @property
@@ -5627,6 +5346,8 @@ class Unknown(Statement, Expression, TypeTree):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Source(J):
+        __slots__ = ('_id', '_prefix', '_markers', '_text')
+
         _id: UUID
 
         @property
@@ -5672,6 +5393,8 @@ class Unknown(Statement, Expression, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Erroneous(Statement, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_text')
+
     _id: UUID
 
     @property
@@ -0,0 +1,207 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Optional, List, Callable, TypeVar, ClassVar, Iterator
+
+from .support_types import JavaType
+
+T = TypeVar('T')
+
+
+class TypeTable:
+    """
+    Interns `JavaType.Class`, `JavaType.Parameterized` and `JavaType.Method` instances by their structural
+    signature, so that every reference to the same type shares one instance regardless of how many source
+    files and call sites refer to it.
+
+    The table holds at most `max_size` types and evicts the least recently used ones beyond that. An evicted
+    type remains valid for the trees that refer to it; it is only no longer shared with newly created types.
+    All methods are safe to call from concurrently parsing threads.
+
+    As classes are only known by their fully qualified name, two projects may well have different classes of the
+    same name. Each parser therefore has a table of its own, which it activates while parsing, and types are
+    interned in `current()` table. The `DEFAULT` table is only used where no table is active.
+    """
+
+    DEFAULT: ClassVar['TypeTable']
+
+    def __init__(self, max_size: int = 1 << 16):
+        self._max_size = max_size
+        self._types: 'OrderedDict[str, JavaType]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def current(cls) -> 'TypeTable':
+        """The table activated in the current context, or the `DEFAULT` table if there is none."""
+        table = _current.get()
+        return table if table is not None else cls.DEFAULT
+
+    @contextmanager
+    def activate(self) -> Iterator['TypeTable']:
+        """Makes this table the `current()` one in the current context until the block exits."""
+        token = _current.set(self)
+        try:
+            yield self
+        finally:
+            _current.reset(token)
+
+    def __reduce__(self):
+        # types are not shared between processes, so a copy starts out empty
+        return TypeTable, (self._max_size,)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def get(self, signature: str) -> Optional[JavaType]:
+        with self._lock:
+            result = self._types.get(signature)
+            if result is not None:
+                self._types.move_to_end(signature)
+            return result
+
+    def class_type(self, fully_qualified_name: str,
+                   kind: JavaType.FullyQualified.Kind = JavaType.FullyQualified.Kind.Class,
+                   interfaces: Optional[List[JavaType.FullyQualified]] = None) -> JavaType.Class:
+        def create() -> JavaType.Class:
+            result = JavaType.Class()
+            result._flags_bit_map = 0
+            result._kind = kind
+            result._fully_qualified_name = fully_qualified_name
+            result._interfaces = interfaces or []
+            return result
+
+        return self.intern(create()) if interfaces else self.__get_or_create(fully_qualified_name, create)
+
+    def parameterized(self, type: JavaType.FullyQualified,
+                      type_parameters: List[JavaType]) -> JavaType.Parameterized:
+        def create() -> JavaType.Parameterized:
+            result = JavaType.Parameterized()
+            result._type = type
+            result._type_parameters = type_parameters
+            return result
+
+        return self.__get_or_create(self.signature_of_parameterized(type, type_parameters), create)
+
+    def method(self, declaring_type: Optional[JavaType.FullyQualified], name: str,
+               return_type: Optional[JavaType] = None, parameter_names: Optional[List[str]] = None,
+               parameter_types: Optional[List[JavaType]] = None) -> JavaType.Method:
+        signature = self.signature_of_method(declaring_type, name, return_type, parameter_names, parameter_types)
+        return self.__get_or_create(signature, lambda: JavaType.Method(
+            _declaring_type=declaring_type,
+            _name=name,
+            _return_type=return_type,
+            _parameter_names=parameter_names,
+            _parameter_types=parameter_types
+        ))
+
+    def intern(self, type: T) -> T:
+        """
+        Returns the interned type with the same signature as `type`, which becomes the interned one if there is
+        none yet or if it is more complete. Types other than classes, parameterized types and methods are returned
+        as they are, as are shallow classes, which must not stand in for the complete class.
+
+        Interned types are never changed, so a type that is replaced by a more complete one stays valid for the
+        trees that refer to it, like an evicted one.
+        """
+        if isinstance(type, JavaType.ShallowClass):
+            return type
+        elif isinstance(type, JavaType.Class):
+            signature = getattr(type, '_fully_qualified_name', None)
+        elif isinstance(type, JavaType.Parameterized):
+            signature = self.signature_of_parameterized(getattr(type, '_type', None),
+                                                        getattr(type, '_type_parameters', None))
+        elif isinstance(type, JavaType.Method):
+            signature = self.signature_of_method(type.declaring_type, type.name, type.return_type,
+                                                 type.parameter_names, type.parameter_types)
+        else:
+            return type
+        if signature is None:
+            return type
+        completeness = _completeness(type)
+        return self.__get_or_create(signature, lambda: type, lambda interned: _completeness(interned) >= completeness)
+
+    def __get_or_create(self, signature: str, create: Callable[[], T],
+                        keep: Callable[[JavaType], bool] = lambda _: True) -> T:
+        with self._lock:
+            result = self._types.get(signature)
+            if result is not None and keep(result):
+                self._types.move_to_end(signature)
+                return result
+            self._types[signature] = (result := create())
+            self._types.move_to_end(signature)
+            if len(self._types) > self._max_size:
+                self._types.popitem(last=False)
+            return result
+
+    @classmethod
+    def refers_back(cls, type: JavaType) -> bool:
+        """
+        Whether any of the types reachable from the attributes of `type` refers to `type` itself, as the methods
+        of a class do. Such a type cannot be replaced by the interned one without them referring to another instance.
+        """
+        seen = {id(type)}
+        pending = [type]
+        while pending:
+            for value in getattr(pending.pop(), '__dict__', {}).values():
+                for element in value if isinstance(value, list) else (value,):
+                    if element is type:
+                        return True
+                    if isinstance(element, _REFERRING) and id(element) not in seen:
+                        seen.add(id(element))
+                        pending.append(element)
+        return False
+
+    @classmethod
+    def signature(cls, type: Optional[JavaType]) -> str:
+        if type is None:
+            return 'null'
+        if isinstance(type, JavaType.Primitive):
+            return type.name
+        if isinstance(type, JavaType.Unknown):
+            return '{undefined}'
+        if isinstance(type, JavaType.Parameterized):
+            return cls.signature_of_parameterized(getattr(type, '_type', None),
+                                                  getattr(type, '_type_parameters', None))
+        if isinstance(type, JavaType.Class):
+            return getattr(type, '_fully_qualified_name', '{undefined}')
+        if isinstance(type, JavaType.Method):
+            return cls.signature_of_method(type.declaring_type, type.name, type.return_type, type.parameter_names,
+                                           type.parameter_types)
+        if isinstance(type, JavaType.Array):
+            return cls.signature(getattr(type, '_elem_type', None)) + '[]'
+        if isinstance(type, JavaType.GenericTypeVariable):
+            return f"Generic{{{getattr(type, '_name', '?')}}}"
+        return type.__class__.__name__
+
+    @classmethod
+    def signature_of_parameterized(cls, type: Optional[JavaType.FullyQualified],
+                                   type_parameters: Optional[List[JavaType]]) -> str:
+        return f"{cls.signature(type)}<{', '.join(cls.signature(p) for p in type_parameters or [])}>"
+
+    @classmethod
+    def signature_of_method(cls, declaring_type: Optional[JavaType.FullyQualified], name: str,
+                            return_type: Optional[JavaType], parameter_names: Optional[List[str]],
+                            parameter_types: Optional[List[JavaType]]) -> str:
+        parameters = ','.join(cls.signature(p) for p in parameter_types) if parameter_types is not None else \
+            ','.join(parameter_names or [])
+        return f"{cls.signature(declaring_type)}{{name={name},return={cls.signature(return_type)}," \
+               f"param=({parameters})}}"
+
+
+def _completeness(type: JavaType) -> int:
+    """The number of types and names that `type` holds, besides its own name, flags and kind."""
+    return sum(len(value) if isinstance(value, list) else 1 for value in vars(type).values()
+               if value is not None and not isinstance(value, (str, int, Enum)))
+
+
+_current: ContextVar[Optional[TypeTable]] = ContextVar('type_table', default=None)
+_REFERRING = (JavaType.FullyQualified, JavaType.Method, JavaType.Variable, JavaType.Array,
+              JavaType.GenericTypeVariable)
+
+TypeTable.DEFAULT = TypeTable()
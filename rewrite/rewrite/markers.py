@@ -10,7 +10,7 @@ if TYPE_CHECKING:
     from .parser import Parser
     from .visitor import Cursor
 
-from .utils import random_id, list_map
+from .utils import random_id, list_map, frozen_state, set_frozen_state
 
 
 class Marker(ABC):
@@ -40,6 +40,10 @@ M = TypeVar('M', bound=Marker)
 
 @dataclass(frozen=True, eq=False)
 class Markers:
+    __slots__ = ('_id', '_markers')
+    __getstate__ = frozen_state
+    __setstate__ = set_frozen_state
+
     _id: UUID
 
     @property
@@ -1,6 +1,8 @@
 import io
+import zlib
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, replace
+from dataclasses import dataclass, replace, field
+from functools import partial
 from pathlib import Path
 from time import time_ns
 from typing import Iterable, Optional, Callable, TypeVar, Any, cast, IO
@@ -8,8 +10,8 @@ from uuid import UUID
 
 from .utils import random_id
 from .result import Result
-from .tree import SourceFile, Tree, PrintOutputCapture, PrinterFactory, FileAttributes, Checksum
-from .execution import ExecutionContext, InMemoryExecutionContext
+from .tree import SourceFile, Tree, PrintOutputCapture, PrinterFactory, FileAttributes, Checksum, text_digest
+from .execution import ExecutionContext, InMemoryExecutionContext, PrintEqualsInputMode
 from .visitor import TreeVisitor, Cursor
 from .markers import Markers, ParseExceptionResult
 
@@ -40,6 +42,36 @@ class ParserInput:
     def source(self) -> Callable[[], IO[Any]]:
         return self._source
 
+    _text: Optional[str] = field(default=None, init=False, repr=False)
+
+    def text(self, charset: str = 'utf-8') -> str:
+        """
+        The decoded source text. The source is read and decoded only once, the text is shared by all
+        later callers until `forget_text()` is called.
+        """
+        text = self._text
+        if text is None:
+            with self._source() as stream:
+                data = stream.read()
+            text = data if isinstance(data, str) else str(data, charset)
+            object.__setattr__(self, '_text', text)
+        return text
+
+    def forget_text(self) -> None:
+        """
+        Drops the text kept by `text()`, which parsers call once they are done with an input, so that the inputs
+        of a run do not keep the text of every source in memory. The source is read again if needed.
+        """
+        object.__setattr__(self, '_text', None)
+
+    def digest(self, charset: str = 'utf-8') -> bytes:
+        """A digest of the source text, as compared to `SourceFile.print_digest()`."""
+        return text_digest(self.text(charset))
+
+    @classmethod
+    def from_path(cls, path: Path, file_attributes: Optional[FileAttributes] = None) -> 'ParserInput':
+        return cls(path, file_attributes, False, partial(io.FileIO, path))
+
 
 P = TypeVar('P')
 
@@ -50,12 +82,17 @@ class ParseError(SourceFile):
     @classmethod
     def build(cls, parser: 'Parser', input: ParserInput, relative_to: Optional[Path], ctx: ExecutionContext, exception: Exception,
               erroneous: Optional[SourceFile] = None) -> 'ParseError':
+        try:
+            text = input.text(parser.get_charset(ctx))
+        except (OSError, UnicodeDecodeError):
+            # the input could not be read in the first place
+            text = ''
         return cls(random_id(),
                    Markers(random_id(), [ParseExceptionResult.build(parser, exception)]),
                    input.path.relative_to(relative_to) if relative_to else input.path,
                    input.file_attributes, parser.get_charset(ctx), False,
                    None,
-                   input.source().read(),
+                   text,
                    erroneous)
 
     _id: UUID
@@ -174,7 +211,7 @@ class Parser(ABC):
 
     def parse(self, source_files: Iterable[Path], relative_to: Optional[Path], ctx: ExecutionContext) -> Iterable[
         SourceFile]:
-        inputs = [ParserInput(path, None, False, lambda: io.FileIO(path)) for path in source_files]
+        inputs = [ParserInput.from_path(path) for path in source_files]
         return self.parse_inputs(inputs, relative_to, ctx)
 
     def parse_strings(self, *sources: str) -> Iterable[SourceFile]:
@@ -223,14 +260,33 @@ class ParserBuilder(ABC):
 
 def require_print_equals_input(parser: Parser, source_file: SourceFile, parser_input: ParserInput,
                                relative_to: Optional[Path], ctx: ExecutionContext) -> SourceFile:
-    required = ctx.get_message(ExecutionContext.REQUIRE_PRINT_EQUALS_INPUT, True)
-    if (required and not source_file.print_equals_input(parser_input, ctx)):
-        diff = Result.diff(
-            parser_input.source().read(),
-            source_file.print_all(),
-            parser_input.path
-        )
-        return (ParseError.build(parser, parser_input, relative_to, ctx,
-                                 Exception(f"{source_file.source_path} is not print idempotent. \n{diff}"),
-                                 source_file))
-    return source_file
+    mode = print_equals_input_mode(ctx)
+    if mode == PrintEqualsInputMode.OFF or mode == PrintEqualsInputMode.SAMPLED and not _sampled(parser_input, ctx):
+        return source_file
+    ctx.put_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED,
+                    ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED, 0) + 1)
+    if mode == PrintEqualsInputMode.HASH:
+        if source_file.print_digest() == parser_input.digest(parser.get_charset(ctx)):
+            return source_file
+    elif source_file.print_equals_input(parser_input, ctx):
+        return source_file
+    diff = Result.diff(
+        parser_input.text(parser.get_charset(ctx)),
+        source_file.print_all(),
+        parser_input.path
+    )
+    return (ParseError.build(parser, parser_input, relative_to, ctx,
+                             Exception(f"{source_file.source_path} is not print idempotent. \n{diff}"),
+                             source_file))
+
+
+def print_equals_input_mode(ctx: ExecutionContext) -> PrintEqualsInputMode:
+    if not ctx.get_message(ExecutionContext.REQUIRE_PRINT_EQUALS_INPUT, True):
+        return PrintEqualsInputMode.OFF
+    return PrintEqualsInputMode(ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_MODE, PrintEqualsInputMode.FULL))
+
+
+def _sampled(parser_input: ParserInput, ctx: ExecutionContext) -> bool:
+    # the sample depends only on the path, so that it is the same across runs and worker processes
+    rate = ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_SAMPLE_RATE, 10)
+    return zlib.crc32(str(parser_input.path).encode('utf-8', 'surrogatepass')) % 100 < rate
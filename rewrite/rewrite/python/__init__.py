@@ -16,11 +16,13 @@ __all__ = [
     'PySpace',
     'PythonParser',
     'PythonParserBuilder',
+    'ParseTiming',
     'PythonVisitor',
 
     # Markers
     'KeywordArguments',
     'KeywordOnlyArguments',
+    'ParseBudgetExceeded',
     'Quoted',
 
     # AST types
@@ -0,0 +1,23 @@
+"""
+Builds the symbol index of `StubIndex` from typeshed and other stub directories.
+
+    python -m rewrite.python._build_stub_index index.bin [--typeshed DIR] [STUBS ...]
+"""
+import argparse
+from pathlib import Path
+
+from ._stub_index import StubIndex, typeshed_roots
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n\n')[0])
+    parser.add_argument('output', type=Path, help='file to write the index to')
+    parser.add_argument('stubs', type=Path, nargs='*', help='directories of further stubs, which take precedence')
+    parser.add_argument('--typeshed', type=Path, help='typeshed checkout, by default the one bundled with pytype')
+    args = parser.parse_args()
+    index = StubIndex.build(args.output, args.stubs + typeshed_roots(args.typeshed))
+    print(f"{len(index)} symbols written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+import ast
+import threading
+import weakref
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from rewrite.java import Space, JRightPadded, Statement
+from rewrite.java import tree as j
+from ._parser_visitor import ParserVisitor
+from .tree import CompilationUnit
+from .type_mapping import PythonTypeMapping
+
+# the printed text of the top-level statements of recently reparsed compilation units, keyed by object identity,
+# which only weakly references the compilation units
+_texts: 'OrderedDict[int, Tuple[weakref.ReferenceType[CompilationUnit], List[str], str]]' = OrderedDict()
+_texts_lock = threading.Lock()
+_TEXTS_SIZE = 16
+
+
+def reparse(cu: CompilationUnit, source: str, type_mapping: Optional[PythonTypeMapping] = None) -> \
+        Optional[CompilationUnit]:
+    """
+    Maps only those top-level statements of `source` whose text differs from that of the corresponding
+    statements in `cu` and splices them into `cu`. Unchanged statements are reused as they are.
+    The changed statements are typed by `type_mapping`, which should be configured as for the full parse.
+
+    Returns `None` when the edit cannot be applied incrementally and a full parse is required.
+    """
+    try:
+        module = ast.parse(source)
+    except (SyntaxError, ValueError):
+        # left to a full parse, which turns the source into a `ParseError`
+        return None
+    statements = cu.padding.statements
+    if not module.body or not statements or isinstance(statements[0].element, j.Empty):
+        return None
+    texts, eof_text = _statement_texts(cu)
+
+    prefix, offset = 0, 0
+    while prefix < len(texts) and source.startswith(texts[prefix], offset):
+        offset += len(texts[prefix])
+        prefix += 1
+    # the last reused statement may have consumed trailing whitespace, which must end the same way
+    if prefix and offset < len(source) and \
+            (texts[prefix] if prefix < len(texts) else eof_text)[:1] != source[offset]:
+        prefix -= 1
+        offset -= len(texts[prefix])
+
+    suffix, end = 0, len(source) - len(eof_text)
+    if source.endswith(eof_text):
+        while suffix < len(texts) - prefix and end - len(texts[-1 - suffix]) >= offset and \
+                source.startswith(texts[-1 - suffix], end - len(texts[-1 - suffix])):
+            end -= len(texts[-1 - suffix])
+            suffix += 1
+
+    changed_end = len(module.body) - suffix
+    if changed_end < prefix:
+        return None
+    visitor = ParserVisitor(source, type_mapping=type_mapping)
+    changed, cursor = visitor.visit_statements(module, prefix, changed_end, offset)
+    if suffix:
+        if cursor != end or _print(cu, changed, Space.EMPTY) != source[offset:end]:
+            return None
+        eof = cu.eof
+    else:
+        eof = visitor.visit_eof(cursor)
+        if _print(cu, changed, eof) != source[offset:]:
+            return None
+
+    reparsed = cu.padding.with_statements(statements[:prefix] + changed + statements[len(statements) - suffix:]) \
+        .with_eof(eof)
+    _remember(reparsed, texts[:prefix] + [_print(cu, [s], Space.EMPTY) for s in changed] +
+              texts[len(texts) - suffix:], _print(cu, [], eof))
+    return reparsed
+
+
+def _print(cu: CompilationUnit, statements: List[JRightPadded[Statement]], eof: Space) -> str:
+    return cu.padding.with_statements(statements).with_eof(eof).print_all()
+
+
+def _statement_texts(cu: CompilationUnit) -> Tuple[List[str], str]:
+    with _texts_lock:
+        remembered = _texts.get(id(cu))
+        if remembered and remembered[0]() is cu:
+            _texts.move_to_end(id(cu))
+            return remembered[1], remembered[2]
+    texts = [_print(cu, [s], Space.EMPTY) for s in cu.padding.statements]
+    eof_text = _print(cu, [], cu.eof)
+    _remember(cu, texts, eof_text)
+    return texts, eof_text
+
+
+def _remember(cu: CompilationUnit, texts: List[str], eof_text: str) -> None:
+    with _texts_lock:
+        _texts[id(cu)] = (weakref.ref(cu), texts, eof_text)
+        _texts.move_to_end(id(cu))
+        if len(_texts) > _TEXTS_SIZE:
+            _texts.popitem(last=False)
@@ -0,0 +1,66 @@
+import ast
+import re
+import unicodedata
+from typing import Union
+
+_ESCAPE = re.compile(r'\\(N\{[^}]*}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|x[0-9a-fA-F]{2}|[0-7]{1,3}|\n|.)', re.DOTALL)
+_SIMPLE_ESCAPES = {
+    '\n': '',
+    '\\': '\\',
+    "'": "'",
+    '"': '"',
+    'a': '\a',
+    'b': '\b',
+    'f': '\f',
+    'n': '\n',
+    'r': '\r',
+    't': '\t',
+    'v': '\v',
+}
+
+
+def decode_string(text: str) -> Union[str, bytes]:
+    """
+    Decodes the value of a string or bytes literal from its source text, such as `rb'\\d'` or `'''a\\tb'''`,
+    without compiling it. Literals using unusual escapes are left to `ast.literal_eval`.
+    """
+    start = 0
+    while text[start] not in '\'"':
+        start += 1
+    prefix = text[:start].lower()
+    quote = 3 if text.startswith(text[start] * 3, start) else 1
+    body = text[start + quote:len(text) - quote]
+    if '\r' in body:
+        body = body.replace('\r\n', '\n').replace('\r', '\n')
+    is_bytes = 'b' in prefix
+    if 'r' not in prefix and '\\' in body:
+        try:
+            body = _ESCAPE.sub(_unescape_bytes if is_bytes else _unescape, body)
+        except (ValueError, KeyError):
+            return ast.literal_eval(ast.parse(text, mode='eval').body)
+    return body.encode('latin-1') if is_bytes else body
+
+
+def _unescape(match: re.Match) -> str:
+    escape = match.group(1)
+    simple = _SIMPLE_ESCAPES.get(escape)
+    if simple is not None:
+        return simple
+    kind = escape[0]
+    if kind in 'uUx':
+        return chr(int(escape[1:], 16))
+    if kind == 'N':
+        return unicodedata.lookup(escape[2:-1])
+    if kind in '01234567':
+        return chr(int(escape, 8))
+    return match.group(0)
+
+
+def _unescape_bytes(match: re.Match) -> str:
+    escape = match.group(1)
+    if escape[0] in 'uUN':
+        return match.group(0)
+    decoded = _unescape(match)
+    if len(decoded) == 1 and ord(decoded) > 0xFF:
+        raise ValueError(f"invalid octal escape in bytes literal: {match.group(0)}")
+    return decoded
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional, List, Tuple
+
+from . import _pickling
+from .tree import CompilationUnit
+
+_parser_version: Optional[str] = None
+
+
+def parser_version() -> str:
+    """
+    A digest of the modules that determine the shape of a parsed LST. Any change to the parser or
+    to the tree classes invalidates previously cached trees.
+    """
+    global _parser_version
+    if _parser_version is None:
+        from rewrite.java import tree as j, support_types as java_support_types
+        from . import _parser_visitor, _stub_index, _tokens, _type_inference, type_mapping, tree as py, \
+            support_types
+        digest = hashlib.sha256()
+        for module in (_parser_visitor, _stub_index, _tokens, _type_inference, type_mapping, py, support_types, j,
+                       java_support_types):
+            digest.update(Path(module.__file__).read_bytes())
+        _parser_version = digest.hexdigest()
+    return _parser_version
+
+
+class LstCache:
+    """
+    A content-addressed on-disk cache of parsed compilation units.
+
+    Entries are keyed by the source text, the parser version and the Python grammar version, so a
+    changed file, a changed parser or a different interpreter simply misses. Entries are written
+    atomically, which makes it safe for several processes to share one cache directory. When the
+    directory grows beyond `max_size` bytes the least recently used entries are evicted.
+
+    Entries are pickles, and loading a pickle can run arbitrary code, so the directory must only be
+    writable by users trusted to run code in the parsing process. The cache creates the directory
+    and its entries so that only their owner can access them.
+    """
+
+    _directory: Path
+    _max_size: int
+    _size: Optional[int]
+
+    def __init__(self, directory: Path, max_size: int = 1 << 30):
+        self._directory = Path(directory)
+        self._max_size = max_size
+        self._size = None
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def key(self, source: str, variant: str = '') -> str:
+        """
+        The key of the tree parsed from `source`, where `variant` identifies any other input that the tree
+        depends on, such as the stub index its types were resolved from.
+        """
+        digest = hashlib.sha256()
+        digest.update(parser_version().encode())
+        digest.update(f"{sys.version_info.major}.{sys.version_info.minor}{variant}".encode())
+        digest.update(source.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CompilationUnit]:
+        path = self.__entry_path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            cu = _pickling.loads(zlib.decompress(data))
+        except Exception:
+            self.__remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return cu
+
+    def put(self, key: str, cu: CompilationUnit) -> None:
+        path = self.__entry_path(key)
+        data = zlib.compress(_pickling.dumps(cu), 1)
+        try:
+            self._directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            path.parent.mkdir(mode=0o700, exist_ok=True)
+            # `mkstemp` creates the entry readable and writable by its owner only
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                self.__remove(Path(tmp))
+                raise
+        except OSError:
+            return
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self.__scan())
+        else:
+            self._size += len(data)
+        if self._size > self._max_size:
+            self.__evict()
+
+    def __entry_path(self, key: str) -> Path:
+        return self._directory / key[:2] / f"{key}.lst"
+
+    def __scan(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for entry in self._directory.glob('*/*.lst'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # evicted by a concurrent writer
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+
+    def __evict(self) -> None:
+        """Removes the least recently used entries until the cache is below 90% of its maximum size."""
+        entries = sorted(self.__scan())
+        self._size = sum(size for _, size, _ in entries)
+        target = self._max_size * 9 // 10
+        for _, size, entry in entries:
+            if self._size <= target:
+                break
+            self.__remove(entry)
+            self._size -= size
+
+    @staticmethod
+    def __remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
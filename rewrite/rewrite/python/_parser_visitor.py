@@ -1,32 +1,46 @@
 import ast
 import sys
+import time
 import token
 from argparse import ArgumentError
-from functools import lru_cache
-from io import BytesIO
+from functools import lru_cache, partial
 from pathlib import Path
-from tokenize import tokenize, TokenInfo
+from tokenize import TokenInfo
 from typing import Optional, TypeVar, cast, Callable, List, Tuple, Dict, Type, Sequence, Union, Iterator
 
 from more_itertools import peekable
 
 from rewrite import random_id, Markers, list_map_last
-from rewrite.java import Space, JRightPadded, JContainer, JLeftPadded, JavaType, J, Statement, Semicolon, TrailingComma, \
-    NameTree, OmitParentheses, Expression, TypeTree, TypedTree, Comment
+from rewrite.utils import id_generator, use_id_generator, IdGenerator
+from rewrite.java import Deferred, Space, JRightPadded, JContainer, JLeftPadded, JavaType, J, Statement, Semicolon, TrailingComma, \
+    NameTree, OmitParentheses, Expression, TypeTree, TypedTree, Comment, TypeTable
 from rewrite.java import tree as j
 from . import tree as py
 from .markers import KeywordArguments, KeywordOnlyArguments, Quoted
+from ._literals import decode_string
+from ._tokens import TokenTable, LexicalIndex
 from .support_types import PyComment
+from ._type_inference import Scope
 from .type_mapping import PythonTypeMapping
 
 T = TypeVar('T')
 J2 = TypeVar('J2', bound=J)
 
 
+class ParseTimeout(Exception):
+    pass
+
+
+# Python blocks are never static, so all of them share the same padded flag
+_NOT_STATIC = JRightPadded(False, Space.EMPTY, Markers.EMPTY)
+
+
 class ParserVisitor(ast.NodeVisitor):
     _source: str
     _cursor: int
-    _parentheses_stack: List[Tuple[Callable[[T, Space], T], int, int, ast.AST, Space]]
+    _parentheses_stack: List[Tuple[Callable[[T, Space], T], int, int, ast.AST, Space, int]]
+    _tokens: TokenTable
+    _lexical_index: Optional[LexicalIndex]
 
     @property
     def _source_after_cursor(self) -> str:
@@ -37,12 +51,33 @@ class ParserVisitor(ast.NodeVisitor):
     def _slow_source_after_cursor(source: str, cursor: int) -> str:
         return source[cursor:]
 
-    def __init__(self, source: str):
+    def __init__(self, source: str, deadline: Optional[float] = None, lazy: bool = False,
+                 type_mapping: Optional[PythonTypeMapping] = None, tokens: Optional[TokenTable] = None):
+        """
+        :param source: the source text of the module
+        :param deadline: a `time.monotonic()` value after which mapping is abandoned with a `ParseTimeout`
+        :param lazy: whether to defer mapping the bodies of functions and classes until they are first used
+        :param type_mapping: the type mapping for the module, by default one inferring types from the module itself
+        :param tokens: the tokens of the part of the source to map, by default all of it
+        """
         super().__init__()
         self._source = source
         self._cursor = 0
         self._parentheses_stack = []
-        self._type_mapping = PythonTypeMapping(source)
+        self._tokens = tokens if tokens is not None else TokenTable(source)
+        self._lexical_index = None
+        self._lexical_index_built = False
+        self._ascii = source.isascii()
+        self._type_mapping = type_mapping or PythonTypeMapping(source)
+        self._deadline = deadline
+        self._lazy = lazy
+        if deadline is not None:
+            self.visit = self.__visit_before_deadline
+
+    def __visit_before_deadline(self, node):
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise ParseTimeout(f"mapping did not complete before the deadline, at line {getattr(node, 'lineno', '?')}")
+        return super().visit(node)
 
     def generic_visit(self, node):
         return super().generic_visit(node)
@@ -114,8 +149,7 @@ class ParserVisitor(ast.NodeVisitor):
                             kwonly_prefix,
                             Markers(random_id(), [KeywordOnlyArguments(random_id())]),
                             [], [], None, None, [],
-                            [self.__pad_right(empty_name, self.__source_before(','))],
-                            None
+                            [self.__pad_right(empty_name, self.__source_before(','))]
                         ),
                         Space.EMPTY,
                         Markers.EMPTY
@@ -251,6 +285,8 @@ class ParserVisitor(ast.NodeVisitor):
         else:
             interfaces = None
             self._cursor = save_cursor
+        with self._type_mapping.scope(node):
+            body = self.__convert_body(node.body)
         return j.ClassDeclaration(
             random_id(),
             prefix,
@@ -270,7 +306,7 @@ class ParserVisitor(ast.NodeVisitor):
             None,  # no `extends`, all in `implements`
             interfaces,
             None,
-            self.__convert_block(node.body),
+            body,
             self._type_mapping.type(node)
         )
 
@@ -702,36 +738,38 @@ class ParserVisitor(ast.NodeVisitor):
         return j.Continue(random_id(), self.__source_before('continue'), Markers.EMPTY, None)
 
     def visit_GeneratorExp(self, node):
-        # this weird logic is here to deal with the case of generator expressions appearing as the argument to a call
-        prefix = self.__whitespace()
-        if self._source[self._cursor] == '(':
-            save_cursor = self._cursor
-            self._cursor += 1
-            try:
-                result = self.__convert(node.elt)
-                save_cursor_2 = self._cursor
-                self.__whitespace()
-                assert self._source[self._cursor] != ')'
-                self._cursor = save_cursor_2
-                parenthesized = True
-            except:
-                self._cursor = save_cursor
+        with self._type_mapping.scope(node):
+            # this weird logic is here to deal with the case of generator expressions appearing as the argument to
+            # a call
+            prefix = self.__whitespace()
+            if self._source[self._cursor] == '(':
+                save_cursor = self._cursor
+                self._cursor += 1
+                try:
+                    result = self.__convert(node.elt)
+                    save_cursor_2 = self._cursor
+                    self.__whitespace()
+                    assert self._source[self._cursor] != ')'
+                    self._cursor = save_cursor_2
+                    parenthesized = True
+                except:
+                    self._cursor = save_cursor
+                    result = self.__convert(node.elt)
+                    parenthesized = False
+            else:
                 result = self.__convert(node.elt)
                 parenthesized = False
-        else:
-            result = self.__convert(node.elt)
-            parenthesized = False
 
-        return py.ComprehensionExpression(
-            random_id(),
-            prefix,
-            Markers.EMPTY if parenthesized else Markers.EMPTY.with_markers([OmitParentheses(random_id())]),
-            py.ComprehensionExpression.Kind.GENERATOR,
-            result,
-            cast(List[py.ComprehensionExpression.Clause], [self.__convert(g) for g in node.generators]),
-            self.__source_before(')') if parenthesized else Space.EMPTY,
-            self._type_mapping.type(node)
-        )
+            return py.ComprehensionExpression(
+                random_id(),
+                prefix,
+                Markers.EMPTY if parenthesized else Markers.EMPTY.with_markers([OmitParentheses(random_id())]),
+                py.ComprehensionExpression.Kind.GENERATOR,
+                result,
+                cast(List[py.ComprehensionExpression.Clause], [self.__convert(g) for g in node.generators]),
+                self.__source_before(')') if parenthesized else Space.EMPTY,
+                self._type_mapping.type(node)
+            )
 
     def visit_Expr(self, node):
         return self.__convert(node.value)
@@ -1243,7 +1281,7 @@ class ParserVisitor(ast.NodeVisitor):
             name if isinstance(name, j.Identifier) else j.Identifier(random_id(), Space.EMPTY, Markers.EMPTY, [], "",
                                                                      None, None),
             args,
-            name.type if isinstance(name.type, JavaType.Method) else None,
+            name.type if isinstance(name.type, JavaType.Method) else self._type_mapping.method_invocation_type(node),
         )
 
     def __sort_call_arguments(self, call: ast.Call) -> List[Union[ast.expr, ast.keyword]]:
@@ -1331,9 +1369,8 @@ class ParserVisitor(ast.NodeVisitor):
         return self.__pad_left(self.__source_before(op_str), op)
 
     def visit_Constant(self, node):
-        tokens = peekable(tokenize(BytesIO(self._source[self._cursor:].encode('utf-8')).readline))
-        tok = next(tokens)  # skip ENCODING token
-        tok = next(tokens)  # skip ENCODING token
+        tokens = self._tokens.tokens_from(self._cursor)
+        tok = next(tokens)
         while tok.type in (token.ENCODING, token.NL, token.NEWLINE, token.INDENT, token.DEDENT, token.COMMENT):
             tok = next(tokens)
 
@@ -1352,19 +1389,7 @@ class ParserVisitor(ast.NodeVisitor):
                 current, tok = self.__map_literal(node, tok, tokens)
                 end_seen = current.value.endswith(node.value)
 
-            if res is None:
-                res = current
-            else:
-                res = py.Binary(
-                    random_id(),
-                    Space.EMPTY,
-                    Markers.EMPTY,
-                    res,
-                    self.__pad_left(Space.EMPTY, py.Binary.Type.StringConcatenation),
-                    None,
-                    current,
-                    self._type_mapping.type(node)
-                )
+            res = current if res is None else self.__concatenate(res, current, node)
 
             if end_seen:
                 break
@@ -1377,6 +1402,19 @@ class ParserVisitor(ast.NodeVisitor):
 
         return res
 
+    def __concatenate(self, left: Expression, right: Expression, node: ast.expr) -> py.Binary:
+        """Appends a literal to the chain of implicitly concatenated literals ending in `left`."""
+        return py.Binary(
+            random_id(),
+            Space.EMPTY,
+            Markers.EMPTY,
+            left,
+            self.__pad_left(Space.EMPTY, py.Binary.Type.StringConcatenation),
+            None,
+            right,
+            self._type_mapping.type(node)
+        )
+
     def __map_literal(self, node, tok, tokens):
         prefix = self.__whitespace()
         start = self._cursor
@@ -1396,7 +1434,7 @@ class ParserVisitor(ast.NodeVisitor):
         if node.value is Ellipsis:
             return None
         elif isinstance(node.value, (str, bytes)):
-            return ast.literal_eval(ast.parse(tok.string, mode='eval').body)
+            return decode_string(tok.string)
         return node.value
 
     def visit_Dict(self, node):
@@ -1416,23 +1454,24 @@ class ParserVisitor(ast.NodeVisitor):
         )
 
     def visit_DictComp(self, node):
-        return py.ComprehensionExpression(
-            random_id(),
-            self.__source_before('{'),
-            Markers.EMPTY,
-            py.ComprehensionExpression.Kind.DICT,
-            py.KeyValue(
+        with self._type_mapping.scope(node):
+            return py.ComprehensionExpression(
                 random_id(),
-                self.__whitespace(),
+                self.__source_before('{'),
                 Markers.EMPTY,
-                self.__pad_right(self.__convert(node.key), self.__source_before(':')),
-                self.__convert(node.value),
-                self._type_mapping.type(node.value)
-            ),
-            cast(List[py.ComprehensionExpression.Clause], [self.__convert(g) for g in node.generators]),
-            self.__source_before('}'),
-            self._type_mapping.type(node)
-        )
+                py.ComprehensionExpression.Kind.DICT,
+                py.KeyValue(
+                    random_id(),
+                    self.__whitespace(),
+                    Markers.EMPTY,
+                    self.__pad_right(self.__convert(node.key), self.__source_before(':')),
+                    self.__convert(node.value),
+                    self._type_mapping.type(node.value)
+                ),
+                cast(List[py.ComprehensionExpression.Clause], [self.__convert(g) for g in node.generators]),
+                self.__source_before('}'),
+                self._type_mapping.type(node)
+            )
 
     def __map_dict_entry(self, key: Optional[ast.expr], value: ast.expr, last: bool) -> JRightPadded[J]:
         if key is None:
@@ -1485,18 +1524,19 @@ class ParserVisitor(ast.NodeVisitor):
             None
         ), [])
 
-        params = JContainer(self.__source_before('('), self.visit_arguments(node.args), Markers.EMPTY)
-        if node.returns is None:
-            return_type = None
-        else:
-            return_type = py.TypeHint(
-                random_id(),
-                self.__source_before('->'),
-                Markers.EMPTY,
-                self.__convert(node.returns),
-                self._type_mapping.type(node.returns)
-            )
-        body = self.__convert_block(node.body)
+        with self._type_mapping.scope(node):
+            params = JContainer(self.__source_before('('), self.visit_arguments(node.args), Markers.EMPTY)
+            if node.returns is None:
+                return_type = None
+            else:
+                return_type = py.TypeHint(
+                    random_id(),
+                    self.__source_before('->'),
+                    Markers.EMPTY,
+                    self.__convert(node.returns),
+                    self._type_mapping.type(node.returns)
+                )
+            body = self.__convert_body(node.body)
 
         return j.MethodDeclaration(
             random_id(),
@@ -1559,8 +1599,7 @@ class ParserVisitor(ast.NodeVisitor):
         )
 
     def visit_JoinedStr(self, node):
-        tokens = peekable(tokenize(BytesIO(self._source[self._cursor:].encode('utf-8')).readline))
-        next(tokens)  # skip ENCODING token
+        tokens = self._tokens.tokens_from(self._cursor)
         while (tok := next(tokens)).type not in (token.FSTRING_START, token.STRING):
             pass
 
@@ -1575,19 +1614,7 @@ class ParserVisitor(ast.NodeVisitor):
                 prefix = self.__whitespace()
                 current, tok, value_idx = self.__map_fstring(node, prefix, tok, tokens, value_idx)
 
-            if res is None:
-                res = current
-            else:
-                res = py.Binary(
-                    random_id(),
-                    Space.EMPTY,
-                    Markers.EMPTY,
-                    res,
-                    self.__pad_left(Space.EMPTY, py.Binary.Type.StringConcatenation),
-                    None,
-                    current,
-                    self._type_mapping.type(node)
-                )
+            res = current if res is None else self.__concatenate(res, current, node)
 
             if value_idx >= len(node.values):
                 break
@@ -1604,21 +1631,22 @@ class ParserVisitor(ast.NodeVisitor):
         raise ValueError("This method should not be called directly")
 
     def visit_Lambda(self, node):
-        return j.Lambda(
-            random_id(),
-            self.__source_before('lambda'),
-            Markers.EMPTY,
-            j.Lambda.Parameters(
+        with self._type_mapping.scope(node):
+            return j.Lambda(
                 random_id(),
-                self.__whitespace(),
+                self.__source_before('lambda'),
                 Markers.EMPTY,
-                False,
-                self.visit_arguments(node.args, with_close_paren=False)
-            ),
-            self.__source_before(':'),
-            self.__convert(node.body),
-            self._type_mapping.type(node)
-        )
+                j.Lambda.Parameters(
+                    random_id(),
+                    self.__whitespace(),
+                    Markers.EMPTY,
+                    False,
+                    self.visit_arguments(node.args, with_close_paren=False)
+                ),
+                self.__source_before(':'),
+                self.__convert(node.body),
+                self._type_mapping.type(node)
+            )
 
     def visit_List(self, node):
         prefix = self.__source_before('[')
@@ -1639,16 +1667,17 @@ class ParserVisitor(ast.NodeVisitor):
         )
 
     def visit_ListComp(self, node):
-        return py.ComprehensionExpression(
-            random_id(),
-            self.__source_before('['),
-            Markers.EMPTY,
-            py.ComprehensionExpression.Kind.LIST,
-            self.__convert(node.elt),
-            cast(List[py.ComprehensionExpression.Clause], [self.__convert(g) for g in node.generators]),
-            self.__source_before(']'),
-            self._type_mapping.type(node)
-        )
+        with self._type_mapping.scope(node):
+            return py.ComprehensionExpression(
+                random_id(),
+                self.__source_before('['),
+                Markers.EMPTY,
+                py.ComprehensionExpression.Kind.LIST,
+                self.__convert(node.elt),
+                cast(List[py.ComprehensionExpression.Clause], [self.__convert(g) for g in node.generators]),
+                self.__source_before(']'),
+                self._type_mapping.type(node)
+            )
 
     def visit_comprehension(self, node):
         if node.is_async:
@@ -1696,6 +1725,20 @@ class ParserVisitor(ast.NodeVisitor):
         # assert self._cursor == len(self._source)
         return cu
 
+    def visit_statements(self, node: ast.Module, start: int, end: int, offset: int) -> \
+            Tuple[List[JRightPadded[Statement]], int]:
+        """
+        Maps the top-level statements `node.body[start:end]`, the first of which is preceded by the source
+        starting at `offset`, and returns them along with the offset just past the last one.
+        """
+        self._type_mapping.resolve_types(node)
+        self._cursor = offset
+        return [self.__pad_statement(stmt) for stmt in node.body[start:end]], self._cursor
+
+    def visit_eof(self, offset: int) -> Space:
+        self._cursor = offset
+        return self.__whitespace()
+
     def visit_Name(self, node):
         return j.Identifier(
             random_id(),
@@ -1744,16 +1787,17 @@ class ParserVisitor(ast.NodeVisitor):
         )
 
     def visit_SetComp(self, node):
-        return py.ComprehensionExpression(
-            random_id(),
-            self.__source_before('{'),
-            Markers.EMPTY,
-            py.ComprehensionExpression.Kind.SET,
-            self.__convert(node.elt),
-            cast(List[py.ComprehensionExpression.Clause], [self.__convert(g) for g in node.generators]),
-            self.__source_before('}'),
-            self._type_mapping.type(node)
-        )
+        with self._type_mapping.scope(node):
+            return py.ComprehensionExpression(
+                random_id(),
+                self.__source_before('{'),
+                Markers.EMPTY,
+                py.ComprehensionExpression.Kind.SET,
+                self.__convert(node.elt),
+                cast(List[py.ComprehensionExpression.Clause], [self.__convert(g) for g in node.generators]),
+                self.__source_before('}'),
+                self._type_mapping.type(node)
+            )
 
     def visit_Slice(self, node):
         prefix = self.__whitespace()
@@ -1971,12 +2015,15 @@ class ParserVisitor(ast.NodeVisitor):
         result = self.__parse_expr(node, mapping or self.visit, recursion, save_cursor, prefix)
 
         save_cursor_2 = self._cursor
+        if not self._parentheses_stack:
+            # with no parentheses open there is nothing to close, and the cursor would be reset to here anyway
+            return result
         suffix = self.__whitespace()
 
         # Process closing parentheses if any
         while self._is_closing_paren(save_cursor):
             self._cursor += 1
-            transformer, save_cursor, _, _, _ = self._parentheses_stack.pop()
+            transformer, save_cursor, _, _, _, _ = self._parentheses_stack.pop()
             result = transformer(result, suffix)
             save_cursor_2 = self._cursor
             suffix = self.__whitespace()
@@ -2000,6 +2047,7 @@ class ParserVisitor(ast.NodeVisitor):
         return recursion(node)
 
     def __push_parentheses(self, node, prefix: Space, save_cursor):
+        opening = self._cursor
         self._cursor += 1
         expr_prefix = self.__whitespace()
         handler = (
@@ -2021,7 +2069,8 @@ class ParserVisitor(ast.NodeVisitor):
             save_cursor,
             self._cursor,
             node,
-            prefix
+            prefix,
+            opening
         )
         self._parentheses_stack.append(handler)
         return handler
@@ -2035,7 +2084,18 @@ class ParserVisitor(ast.NodeVisitor):
 
         stack_cursor = self._parentheses_stack[-1][2]
         slice_content = self._source[stack_cursor:save_cursor]
-        return stack_cursor == save_cursor or slice_content.isspace() or slice_content == '('
+        if not (stack_cursor == save_cursor or slice_content.isspace() or slice_content == '('):
+            return False
+
+        if lexical_index := self.__lexical_index():
+            return lexical_index.matching_bracket(self._parentheses_stack[-1][5]) in (-1, self._cursor)
+        return True
+
+    def __lexical_index(self) -> Optional[LexicalIndex]:
+        if not self._lexical_index_built:
+            self._lexical_index = LexicalIndex.build(self._tokens)
+            self._lexical_index_built = True
+        return self._lexical_index
 
     def __convert_name(self, name: str, name_type: Optional[JavaType] = None) -> NameTree:
         def ident_or_field(parts: List[str]) -> NameTree:
@@ -2078,13 +2138,48 @@ class ParserVisitor(ast.NodeVisitor):
             random_id(),
             prefix,
             Markers.EMPTY,
-            JRightPadded(False, Space.EMPTY, Markers.EMPTY),
+            _NOT_STATIC,
             statements,
             Space.EMPTY
         )
 
+    def __convert_body(self, statements: Sequence[ast.stmt]) -> Union[j.Block, Deferred[j.Block]]:
+        """
+        Maps the body of a function or class, which in lazy mode is deferred until it is first used, provided that
+        nothing but whitespace or a comment follows its last statement on the same line.
+        """
+        if not self._lazy:
+            return self.__convert_block(statements)
+        last = statements[-1]
+        end = self.__offset(last.end_lineno, last.end_col_offset)
+        line_end = self._source.find('\n', end)
+        rest = self._source[end:line_end if line_end != -1 else len(self._source)].lstrip(' \t\f')
+        if rest and rest[0] not in '#\r':
+            return self.__convert_block(statements)
+        # the deferred body holds on to the source and the type mapping, but not to this visitor or its tokens
+        block = Deferred(partial(ParserVisitor.__materialize_block, self._source, self._cursor, end,
+                                 self._tokens.row_of(self._cursor), statements, self._type_mapping,
+                                 self._type_mapping.current_scope, TypeTable.current(), id_generator()))
+        self._cursor = end
+        return block
+
+    @staticmethod
+    def __materialize_block(source: str, start: int, end: int, row: int, statements: Sequence[ast.stmt],
+                            type_mapping: PythonTypeMapping, scope: Scope, type_table: TypeTable,
+                            ids: IdGenerator) -> j.Block:
+        # the source is cut off after the last statement, so that whitespace following it is left to the prefix
+        # of the next statement, which was mapped when the body was deferred, and only the body is tokenized
+        source = source[:end]
+        visitor = ParserVisitor(source, lazy=True, type_mapping=type_mapping, tokens=TokenTable(source, start, row))
+        visitor._cursor = start
+        # the types and ids of the body are those of the parse the body was deferred by
+        with type_table.activate(), use_id_generator(ids), type_mapping.scope(scope):
+            return visitor.__convert_block(statements)
+
     def __pad_statement(self, stmt: ast.stmt) -> JRightPadded[Statement]:
+        self._type_mapping.enter_statement(stmt)
         statement = self.__convert_statement(stmt)
+        self._type_mapping.exit_statement(stmt)
         # use whitespace until end of line as padding; what follows will be the prefix of next element
         save_cursor = self._cursor
         padding = self.__whitespace('\n')
@@ -2162,13 +2257,23 @@ class ParserVisitor(ast.NodeVisitor):
             self._cursor += len(tok)
         return tok
 
+    def __offset(self, lineno: int, col_offset: int) -> int:
+        """Converts the position of an `ast` node into an offset into the source."""
+        line_start = self._tokens.offset_of((lineno, 0))
+        if self._ascii:
+            return line_start + col_offset
+        line_end = self._source.find('\n', line_start)
+        line = self._source[line_start:line_end if line_end != -1 else len(self._source)]
+        # `ast` column offsets count UTF-8 bytes
+        return line_start + len(line.encode('utf-8')[:col_offset].decode('utf-8', 'replace'))
+
     def __whitespace(self, stop: Optional[str] = None) -> Space:
         space, self._cursor = self.__format(self._source, self._cursor, stop)
         return space
 
     def __format(self, source: str, offset: int, stop: Optional[str] = None) -> Tuple[Space, int]:
         prefix = None
-        whitespace = []
+        whitespace_start = offset
         comments: List[Comment] = []
         source_len = len(source)
         while offset < source_len:
@@ -2176,36 +2281,34 @@ class ParserVisitor(ast.NodeVisitor):
             if stop is not None and char == stop:
                 break
             if char.isspace() or char == '\\':
-                whitespace.append(char)
+                offset += 1
             elif char == '#':
                 if comments:
-                    comments[-1] = comments[-1].with_suffix(''.join(whitespace))
+                    comments[-1] = comments[-1].with_suffix(source[whitespace_start:offset])
                 else:
-                    prefix = ''.join(whitespace)
-                whitespace = []
-                comment = []
-                offset += 1
-                while offset < source_len and source[offset] not in ['\r', '\n']:
-                    comment.append(source[offset])
+                    prefix = source[whitespace_start:offset]
+                comment_start = offset + 1
+                offset = comment_start
+                while offset < source_len and source[offset] not in '\r\n':
                     offset += 1
-                comments.append(PyComment(''.join(comment), '',
+                comments.append(PyComment(source[comment_start:offset], '',
                                           False, Markers.EMPTY))
-                continue
+                whitespace_start = offset
             else:
                 break
-            if offset < source_len:
-                offset += 1
-
-        if not whitespace and not comments:
-            return Space.EMPTY, offset
 
         if not comments:
-            prefix = ''.join(whitespace)
-        elif whitespace:
-            comments[-1] = comments[-1].with_suffix(''.join(whitespace))
+            return Space.build(comments, source[whitespace_start:offset]), offset
+        if whitespace_start < offset:
+            comments[-1] = comments[-1].with_suffix(source[whitespace_start:offset])
         return Space(comments, prefix), offset
 
     def __position_of_next(self, until_delim: str, stop: Optional[str] = None) -> int:
+        lexical_index = self.__lexical_index()
+        if lexical_index and lexical_index.covers(until_delim) and (stop is None or lexical_index.covers(stop)):
+            # a miss is final, as the index holds every occurrence outside of comments and strings
+            return lexical_index.position_of_next(until_delim, self._cursor, stop)
+
         in_single_line_comment = False
 
         delim_index = self._cursor
@@ -0,0 +1,111 @@
+import copyreg
+import gc
+import io
+import pickle
+from typing import Any, Dict
+from uuid import UUID, SafeUUID
+
+from rewrite import Markers, random_id
+from rewrite.java import Space, JavaType, TypeTable
+
+
+def dumps(tree: Any) -> bytes:
+    """
+    Pickles an LST so that it can be handed to another process or written to disk.
+
+    The shared `Space.EMPTY` and `Markers.EMPTY` instances are restored as the very same objects
+    on load and comment-free spaces are interned again, as are classes, parameterized types and
+    methods, in the `TypeTable.current()` table of the loading context. The lazily created `padding`
+    helpers are not part of the pickled state.
+    """
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = _dispatch_table
+    pickler.dump(tree)
+    return buffer.getvalue()
+
+
+def loads(data: bytes, fresh_ids: bool = False) -> Any:
+    """
+    Loads a tree pickled by `dumps`. With `fresh_ids`, every id is replaced by a new one, which
+    makes the result a copy that can live alongside the original.
+    """
+    # loading allocates a large number of container objects at once, which would otherwise trigger
+    # repeated full collections that do not free anything
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _FreshIdUnpickler(io.BytesIO(data)).load() if fresh_ids else pickle.loads(data)
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class _FreshIdUnpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str) -> Any:
+        if module == __name__ and name == '_uuid':
+            return _fresh_uuid
+        return super().find_class(module, name)
+
+
+def _empty_space() -> Space:
+    return Space.EMPTY
+
+
+def _space(whitespace: str) -> Space:
+    return Space.build([], whitespace)
+
+
+def _empty_markers() -> Markers:
+    return Markers.EMPTY
+
+
+def _uuid(value: int) -> UUID:
+    # bypasses `UUID.__setstate__`, which dominates the time spent loading a tree
+    uuid = object.__new__(UUID)
+    object.__setattr__(uuid, 'int', value)
+    object.__setattr__(uuid, 'is_safe', SafeUUID.unknown)
+    return uuid
+
+
+def _fresh_uuid(_: int) -> UUID:
+    # an id shared by several objects is loaded only once, so it remains shared in the copy
+    return random_id()
+
+
+def _java_type(cls: type, state: Dict[str, Any]) -> Any:
+    type_ = object.__new__(cls)
+    type_.__dict__.update(state)
+    return TypeTable.current().intern(type_)
+
+
+def _reduce_space(space: Space):
+    if space is Space.EMPTY:
+        return _empty_space, ()
+    if not space.comments and space._whitespace is not None:
+        return _space, (space.whitespace,)
+    return space.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+
+
+def _reduce_markers(markers: Markers):
+    return (_empty_markers, ()) if markers is Markers.EMPTY else markers.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+
+
+def _reduce_uuid(uuid: UUID):
+    return _uuid, (uuid.int,)
+
+
+def _reduce_java_type(type_: Any):
+    if TypeTable.refers_back(type_):
+        # the types referring back to `type_`, like its methods, must refer to the very instance that is loaded, so
+        # it is created before them and not interned, as when it is received from a remote peer
+        return type_.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+    return _java_type, (type(type_), vars(type_))
+
+
+_dispatch_table = copyreg.dispatch_table.copy()
+_dispatch_table[Space] = _reduce_space
+_dispatch_table[Markers] = _reduce_markers
+_dispatch_table[UUID] = _reduce_uuid
+for _type in (JavaType.Class, JavaType.Parameterized, JavaType.Method):
+    _dispatch_table[_type] = _reduce_java_type
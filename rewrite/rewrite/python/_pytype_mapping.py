@@ -0,0 +1,77 @@
+import ast
+from typing import Optional
+
+from pytype import config
+from pytype.pytd.pytd import CallableType, GenericType, ClassType, UnionType, NothingType, TypeParameter
+from pytype.tools.annotate_ast import annotate_ast
+from pytype.tools.annotate_ast.annotate_ast import AnnotateAstVisitor, PytypeError
+
+from ..java import JavaType, TypeTable
+
+_UNKNOWN = JavaType.Unknown()
+
+
+def infer_types(source: str):
+    pytype_options = config.Options.create(python_version='3.12', check=False, precise_return=True,
+                                           output_debug=False)
+    try:
+        return annotate_ast.infer_types(source, pytype_options)
+    except PytypeError:
+        return None
+
+
+def resolve_types(source_with_types, node) -> None:
+    MyAnnotateAstVisitor(source_with_types, ast).visit(node)
+
+
+def map_type(type, node) -> Optional[JavaType]:
+    if isinstance(type, ClassType):
+        table = TypeTable.current()
+        if (result := table.get(type.name)) and (getattr(result, '_interfaces', None) or not type.cls.bases):
+            return result
+        return table.class_type(type.name, interfaces=[map_type(i, node) for i in type.cls.bases])
+    elif isinstance(type, CallableType):
+        if isinstance(node, ast.Name):
+            name = node.id
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            name = node.func.attr
+        else:
+            name = ''
+        return TypeTable.current().method(None, name)
+    elif isinstance(type, GenericType):
+        return TypeTable.current().parameterized(map_type(type.base_type, node),
+                                                 [map_type(t, node) for t in type.parameters])
+    elif isinstance(type, NothingType):
+        return _UNKNOWN
+    return None
+
+
+def get_type_string(typ):
+    if typ is None:
+        return "None"
+    elif isinstance(typ, ClassType):
+        return typ.name
+    elif isinstance(typ, GenericType):
+        base = get_type_string(typ.base_type)
+        params = [get_type_string(p) for p in typ.parameters]
+        return f"{base}[{', '.join(params)}]"
+    elif isinstance(typ, CallableType):
+        args = [get_type_string(a) for a in typ.args]
+        ret = get_type_string(typ.ret)
+        return f"[{', '.join(args)}] -> {ret}"
+    elif isinstance(typ, UnionType):
+        types = [get_type_string(t) for t in typ.type_list]
+        return '|'.join(types)
+    elif isinstance(typ, TypeParameter):
+        types = [get_type_string(t) for t in typ.constraints]
+        return f"{typ.full_name}{[{', '.join(types)}] if types else ''}"
+    elif hasattr(typ, "name"):
+        return typ.name
+    else:
+        return str(typ)
+
+
+class MyAnnotateAstVisitor(AnnotateAstVisitor):
+    # TODO check if we really should have this
+    def visit_Call(self, node):
+        self._maybe_annotate(node)
@@ -0,0 +1,535 @@
+"""
+Compiles typeshed and other stub directories into a symbol index that `PythonTypeMapping` resolves the classes,
+functions and methods of imported modules from, without analyzing any stubs while parsing.
+
+    python -m rewrite.python._build_stub_index index.bin [--typeshed DIR] [STUBS ...]
+"""
+import ast
+import builtins
+import hashlib
+import importlib.util
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Iterable, Set, NamedTuple, Union
+
+from ._type_attribution import module_name
+from ..java import JavaType, TypeTable
+
+MODULE, CLASS, FUNCTION, VARIABLE, ALIAS, TYPE_ALIAS, TYPE_VARIABLE = 'm', 'c', 'f', 'v', 'a', 'y', 't'
+
+_MAGIC = b'RWSTUB01'
+_HEADER = struct.Struct('<8sI')
+_OFFSET = struct.Struct('<I')
+_KEY = struct.Struct('<H')
+_VALUE = struct.Struct('<I')
+_SEPARATOR = '\x1f'
+PRIMITIVES = {
+    'builtins.str': JavaType.Primitive.String,
+    'builtins.bool': JavaType.Primitive.Boolean,
+    'builtins.int': JavaType.Primitive.Int,
+    'builtins.float': JavaType.Primitive.Double,
+    'builtins.None': JavaType.Primitive.None_,
+}
+_UNKNOWN = JavaType.Unknown()
+_STRINGS = {'typing.LiteralString', 'typing_extensions.LiteralString', 'typing.AnyStr'}
+_ANY = {'typing.Any', 'typing_extensions.Any', 'builtins.object'}
+_UNIONS = {'typing.Union', 'typing_extensions.Union'}
+_OPTIONALS = {'typing.Optional', 'typing_extensions.Optional'}
+_WRAPPERS = {'typing.Annotated', 'typing_extensions.Annotated', 'typing.ClassVar', 'typing.Final',
+             'typing_extensions.Final', 'typing.Required', 'typing.NotRequired', 'typing_extensions.Required',
+             'typing_extensions.NotRequired'}
+_TYPE_ALIASES = {'typing.TypeAlias', 'typing_extensions.TypeAlias'}
+_TYPE_VARIABLES = {'TypeVar', 'ParamSpec', 'TypeVarTuple'}
+# the deprecated aliases that typing.pyi declares as `_Alias()`
+_TYPING_ALIASES = {
+    'typing.List': 'builtins.list',
+    'typing.Dict': 'builtins.dict',
+    'typing.Set': 'builtins.set',
+    'typing.FrozenSet': 'builtins.frozenset',
+    'typing.Tuple': 'builtins.tuple',
+    'typing.Type': 'builtins.type',
+    'typing.DefaultDict': 'collections.defaultdict',
+    'typing.OrderedDict': 'collections.OrderedDict',
+    'typing.Counter': 'collections.Counter',
+    'typing.Deque': 'collections.deque',
+    'typing.ChainMap': 'collections.ChainMap',
+}
+
+
+class Symbol(NamedTuple):
+    name: str
+    """The fully qualified name of the symbol where it is defined, after following re-exports."""
+    kind: str
+    fields: Tuple[str, ...]
+    """The base classes of a class, the return and parameter types of a function or the type of a variable."""
+
+
+class StubIndex:
+    """
+    Classes, functions, methods and variables of the modules described by stubs, with the types of their
+    parameters and return values, by fully qualified name.
+
+    The index is one file of sorted records that is memory-mapped and binary searched, so that opening it costs
+    next to nothing and worker processes share its pages. An instance pickles as the path of the file.
+    """
+
+    _path: Path
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._data: Optional[mmap.mmap] = None
+        self._count = 0
+        self._digest: Optional[str] = None
+        self._symbols: Dict[str, Optional[Symbol]] = {}
+        self._types: Dict[str, Optional[JavaType]] = {}
+
+    def __getstate__(self):
+        return self._path
+
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.__open()).hexdigest()
+        return self._digest
+
+    def __len__(self) -> int:
+        self.__open()
+        return self._count
+
+    def symbol(self, name: str) -> Optional[Symbol]:
+        """The symbol with the fully qualified name `name`, also where that refers to a re-export."""
+        if name in self._symbols:
+            return self._symbols[name]
+        self._symbols[name] = result = self.__resolve(name)
+        return result
+
+    def __resolve(self, name: str) -> Optional[Symbol]:
+        for _ in range(16):
+            found = self.__find(name)
+            if found is None:
+                # a member of a re-exported module or class
+                parent, dot, member = name.rpartition('.')
+                resolved = self.symbol(parent) if dot else None
+                if resolved is None or resolved.name == parent:
+                    return None
+                name = f"{resolved.name}.{member}"
+                continue
+            kind, fields = found
+            if kind != ALIAS:
+                return Symbol(name, kind, fields)
+            name = fields[0]
+        return None
+
+    def member(self, class_name: str, name: str) -> Optional[Symbol]:
+        """The member `name` of the class `class_name` or of one of its base classes."""
+        pending, seen = [class_name], set()
+        while pending:
+            current = pending.pop(0)
+            if current in seen:
+                continue
+            seen.add(current)
+            if (found := self.symbol(f"{current}.{name}")) is not None:
+                return found
+            cls = self.symbol(current)
+            if cls is not None and cls.kind == CLASS:
+                pending.extend(base.partition('[')[0] for base in cls.fields)
+        return None
+
+    def method(self, function: Symbol, declaring_type: Optional[JavaType.FullyQualified]) -> JavaType.Method:
+        return_type, *parameters = function.fields
+        names = [p.partition(':')[0] for p in parameters]
+        return TypeTable.current().method(
+            declaring_type,
+            function.name.rpartition('.')[2],
+            self.type(return_type),
+            names,
+            [self.type(p.partition(':')[2]) or _UNKNOWN for p in parameters]
+        )
+
+    def type(self, annotation: str) -> Optional[JavaType]:
+        """Maps a type recorded in the index, such as `builtins.list[builtins.str]`, to a `JavaType`."""
+        if annotation in self._types:
+            return self._types[annotation]
+        self._types[annotation] = None  # guards against recursive type aliases
+        try:
+            result = self.__type(ast.parse(annotation, mode='eval').body) if annotation else None
+        except (SyntaxError, RecursionError):
+            result = None
+        self._types[annotation] = result
+        return result
+
+    def __type(self, node: ast.expr) -> Optional[JavaType]:
+        if isinstance(node, ast.Constant):
+            return JavaType.Primitive.None_ if node.value is None else None
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.BitOr):
+            return self.__union([node.left, node.right])
+        if isinstance(node, ast.Subscript):
+            base = ast.unparse(node.value)
+            elements = node.slice.elts if isinstance(node.slice, ast.Tuple) else [node.slice]
+            if base in _OPTIONALS or base in _WRAPPERS:
+                return self.__type(elements[0])
+            if base in _UNIONS:
+                return self.__union(elements)
+            base_type = self.__type(node.value)
+            if not isinstance(base_type, JavaType.FullyQualified):
+                return base_type
+            parameters = [self.__type(e) for e in elements]
+            if any(p is None for p in parameters):
+                return base_type
+            return TypeTable.current().parameterized(base_type, parameters)
+        if not isinstance(node, (ast.Name, ast.Attribute)):
+            return None
+        name = ast.unparse(node)
+        if name in _STRINGS:
+            return JavaType.Primitive.String
+        if name in _ANY:
+            return None
+        found = self.symbol(name)
+        if found is None:
+            return instance_type(name) if name.startswith('builtins.') else None
+        if found.kind == CLASS:
+            return instance_type(found.name)
+        if found.kind == TYPE_ALIAS:
+            return self.type(found.fields[0])
+        return None
+
+    def __union(self, elements: List[ast.expr]) -> Optional[JavaType]:
+        types = [t for t in (self.__type(e) for e in elements) if t is not JavaType.Primitive.None_]
+        return types[0] if len(types) == 1 else None
+
+    def __open(self) -> mmap.mmap:
+        if self._data is None:
+            with open(self._path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, self._count = _HEADER.unpack_from(data, 0)
+            if magic != _MAGIC:
+                raise ValueError(f"{self._path} is not a stub index")
+            self._data = data
+        return self._data
+
+    def __find(self, name: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        data = self.__open()
+        key = name.encode()
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset, = _OFFSET.unpack_from(data, _HEADER.size + middle * _OFFSET.size)
+            length, = _KEY.unpack_from(data, offset)
+            start = offset + _KEY.size
+            candidate = data[start:start + length]
+            if candidate < key:
+                low = middle + 1
+            elif candidate > key:
+                high = middle
+            else:
+                value_length, = _VALUE.unpack_from(data, start + length)
+                start += length + _VALUE.size
+                kind, *fields = data[start:start + value_length].decode().split(_SEPARATOR)
+                return kind, tuple(fields)
+        return None
+
+    @classmethod
+    def build(cls, output: Path, roots: Iterable[Path]) -> 'StubIndex':
+        """
+        Compiles the `.pyi` stubs found in the `roots` directories, such as typeshed's `stdlib` and the
+        directories of its third-party `stubs`, into an index at `output`. Where several roots describe the same
+        module, the first one wins. Conditions on `sys.version_info` and `sys.platform` are evaluated for the
+        running interpreter.
+        """
+        modules: Dict[str, _StubModule] = {}
+        for root in roots:
+            root = Path(root)
+            for path in sorted(root.rglob('*.pyi')):
+                name = module_name(path.relative_to(root))
+                if name in modules or not name:
+                    continue
+                try:
+                    tree = ast.parse(path.read_text('utf-8'))
+                except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+                    continue
+                modules[name] = _StubModule(name, path.stem == '__init__', tree)
+
+        records: Dict[str, str] = {}
+        for module in modules.values():
+            module.index(records)
+        for module in modules.values():
+            for imported in module.stars:
+                for name in _exported(modules, imported, set()):
+                    records.setdefault(f"{module.name}.{name}", _SEPARATOR.join((ALIAS, f"{imported}.{name}")))
+
+        _write(Path(output), records)
+        return cls(output)
+
+
+def instance_type(fully_qualified_name: str) -> JavaType:
+    """The type of the instances of a class, which is a primitive for `str`, `bool`, `int` and `float`."""
+    return PRIMITIVES.get(fully_qualified_name) or TypeTable.current().class_type(fully_qualified_name)
+
+
+def typeshed_roots(typeshed: Optional[Path] = None) -> List[Path]:
+    """The stub roots of a typeshed checkout, by default the one bundled with pytype if that is installed."""
+    if typeshed is None:
+        spec = importlib.util.find_spec('pytype')
+        if spec is None or not spec.submodule_search_locations:
+            return []
+        typeshed = Path(spec.submodule_search_locations[0]) / 'typeshed'
+    stubs = typeshed / 'stubs'
+    return [typeshed / 'stdlib'] + (sorted(p for p in stubs.iterdir() if p.is_dir()) if stubs.is_dir() else [])
+
+
+class _StubModule:
+    def __init__(self, name: str, package: bool, tree: ast.Module):
+        self.name = name
+        self.package = package
+        self.body = _active(tree.body)
+        self.imports: Dict[str, str] = {}
+        self.reexports: Dict[str, str] = {}
+        self.stars: List[str] = []
+        self.all: Optional[List[str]] = None
+        self.defined: Set[str] = set()
+        for stmt in self.body:
+            if isinstance(stmt, ast.Import):
+                for alias in stmt.names:
+                    if alias.asname:
+                        self.imports[alias.asname] = alias.name
+                    else:
+                        root = alias.name.partition('.')[0]
+                        self.imports[root] = root
+            elif isinstance(stmt, ast.ImportFrom):
+                base = self.__import_base(stmt)
+                for alias in stmt.names:
+                    if alias.name == '*':
+                        self.stars.append(base)
+                    elif alias.name != '__all__':
+                        local = alias.asname or alias.name
+                        self.imports[local] = f"{base}.{alias.name}" if base else alias.name
+                        if alias.asname == alias.name or stmt.level and self.package:
+                            self.reexports[local] = self.imports[local]
+            elif isinstance(stmt, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.defined.add(stmt.name)
+            elif isinstance(stmt, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+                targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        if target.id == '__all__':
+                            self.__collect_all(stmt)
+                        else:
+                            self.defined.add(target.id)
+
+    def index(self, records: Dict[str, str]) -> None:
+        records[self.name] = MODULE
+        reexports = dict(self.reexports)
+        reexports.update((name, self.imports[name]) for name in self.all or [] if name in self.imports)
+        for local, target in reexports.items():
+            if local not in self.defined and target != f"{self.name}.{local}":
+                records[f"{self.name}.{local}"] = _SEPARATOR.join((ALIAS, target))
+        self.__index_body(self.body, self.name, None, records)
+
+    def __index_body(self, body: List[ast.stmt], prefix: str, cls: Optional[str], records: Dict[str, str]):
+        functions: Dict[str, List[Union[ast.FunctionDef, ast.AsyncFunctionDef]]] = {}
+        for stmt in body:
+            if isinstance(stmt, ast.ClassDef):
+                name = f"{prefix}.{stmt.name}"
+                records[name] = _SEPARATOR.join([CLASS] + [self.__qualified(b, name) for b in stmt.bases])
+                self.__index_body(_active(stmt.body), name, name, records)
+            elif isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                functions.setdefault(stmt.name, []).append(stmt)
+            elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+                annotation = self.__qualified(stmt.annotation, cls)
+                if annotation in _TYPE_ALIASES and stmt.value is not None:
+                    records[f"{prefix}.{stmt.target.id}"] = _SEPARATOR.join(
+                        (TYPE_ALIAS, self.__qualified(stmt.value, cls)))
+                else:
+                    records[f"{prefix}.{stmt.target.id}"] = _SEPARATOR.join((VARIABLE, annotation))
+            elif isinstance(stmt, ast.Assign) and len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name):
+                self.__index_assignment(f"{prefix}.{stmt.targets[0].id}", stmt.value, cls, records)
+            elif sys.version_info >= (3, 12) and isinstance(stmt, ast.TypeAlias):
+                records[f"{prefix}.{stmt.name.id}"] = _SEPARATOR.join((TYPE_ALIAS, self.__qualified(stmt.value, cls)))
+        for name, overloads in functions.items():
+            # the first overload describes the most common use, such as `str` rather than `bytes` arguments
+            function = overloads[0]
+            decorators = {ast.unparse(d) for d in function.decorator_list}
+            returns = self.__qualified(function.returns, cls) if function.returns else ''
+            if 'property' in decorators or 'functools.cached_property' in decorators:
+                records[f"{prefix}.{name}"] = _SEPARATOR.join((VARIABLE, returns))
+                continue
+            arguments = function.args
+            positional = arguments.posonlyargs + arguments.args
+            if cls and 'staticmethod' not in decorators:
+                positional = positional[1:]  # the receiver, `self` or `cls`
+            parameters = [f"{a.arg}:{self.__qualified(a.annotation, cls) if a.annotation else ''}"
+                          for a in positional + [arguments.vararg] + arguments.kwonlyargs + [arguments.kwarg] if a]
+            records[f"{prefix}.{name}"] = _SEPARATOR.join([FUNCTION, returns] + parameters)
+
+    def __index_assignment(self, name: str, value: ast.expr, cls: Optional[str], records: Dict[str, str]):
+        if isinstance(value, ast.Call) and isinstance(value.func, (ast.Name, ast.Attribute)):
+            called = ast.unparse(value.func).rpartition('.')[2]
+            if called in _TYPE_VARIABLES:
+                records[name] = TYPE_VARIABLE
+            elif called == '_Alias' and name in _TYPING_ALIASES:
+                records[name] = _SEPARATOR.join((ALIAS, _TYPING_ALIASES[name]))
+            elif called == 'NewType' and len(value.args) == 2:
+                records[name] = _SEPARATOR.join((TYPE_ALIAS, self.__qualified(value.args[1], cls)))
+            else:
+                records[name] = _SEPARATOR.join((VARIABLE, ''))
+        elif isinstance(value, (ast.Name, ast.Attribute)):
+            target = self.__qualified(value, cls)
+            if target != name:
+                records[name] = _SEPARATOR.join((ALIAS, target))
+        elif isinstance(value, (ast.Subscript, ast.BinOp)):
+            records[name] = _SEPARATOR.join((TYPE_ALIAS, self.__qualified(value, cls)))
+        else:
+            records[name] = _SEPARATOR.join((VARIABLE, ''))
+
+    def __qualified(self, node: ast.expr, cls: Optional[str]) -> str:
+        """The source of an annotation with all the names in it fully qualified."""
+        module = self
+
+        class Qualify(ast.NodeTransformer):
+            def visit_Name(self, name: ast.Name):
+                if name.id == 'Self' and cls:
+                    return ast.Name(cls)
+                return ast.Name(module.qualify(name.id))
+
+            def visit_Attribute(self, attribute: ast.Attribute):
+                root = attribute
+                while isinstance(root, ast.Attribute):
+                    root = root.value
+                if isinstance(root, ast.Name):
+                    dotted = ast.unparse(attribute)
+                    first, _, rest = dotted.partition('.')
+                    return ast.Name(f"{module.qualify(first)}.{rest}")
+                return self.generic_visit(attribute)
+
+            def visit_Constant(self, constant: ast.Constant):
+                # forward references
+                if isinstance(constant.value, str):
+                    try:
+                        return self.visit(ast.parse(constant.value, mode='eval').body)
+                    except SyntaxError:
+                        pass
+                return constant
+
+        try:
+            return ast.unparse(Qualify().visit(node)).replace(_SEPARATOR, '')
+        except (RecursionError, ValueError):
+            return ''
+
+    def qualify(self, name: str) -> str:
+        if name in self.imports:
+            return self.imports[name]
+        if name in self.defined or self.name == 'builtins':
+            return f"{self.name}.{name}"
+        if hasattr(builtins, name):
+            return f"builtins.{name}"
+        return f"{self.name}.{name}"
+
+    def __import_base(self, node: ast.ImportFrom) -> str:
+        if not node.level:
+            return node.module or ''
+        package = self.name.split('.') if self.package else self.name.split('.')[:-1]
+        package = package[:max(len(package) - node.level + 1, 0)] + ([node.module] if node.module else [])
+        return '.'.join(package)
+
+    def __collect_all(self, stmt: Union[ast.Assign, ast.AnnAssign, ast.AugAssign]) -> None:
+        if isinstance(stmt.value, (ast.List, ast.Tuple)):
+            names = [e.value for e in stmt.value.elts if isinstance(e, ast.Constant) and isinstance(e.value, str)]
+            self.all = (self.all or []) + names if isinstance(stmt, ast.AugAssign) else names
+
+
+def _exported(modules: Dict[str, _StubModule], name: str, seen: Set[str]) -> List[str]:
+    """The names that `from name import *` binds."""
+    module = modules.get(name)
+    if module is None or name in seen:
+        return []
+    seen.add(name)
+    if module.all is not None:
+        return module.all
+    names = [n for n in module.defined | module.reexports.keys() if not n.startswith('_')]
+    for imported in module.stars:
+        names.extend(_exported(modules, imported, seen))
+    return names
+
+
+def _active(statements: List[ast.stmt]) -> List[ast.stmt]:
+    """The statements that apply to the running interpreter, with `if sys...` blocks resolved."""
+    active = []
+    for stmt in statements:
+        if isinstance(stmt, ast.If):
+            condition = _condition(stmt.test)
+            if condition is None:
+                # the statements of the first branch take precedence
+                active.extend(_active(stmt.orelse))
+                active.extend(_active(stmt.body))
+            else:
+                active.extend(_active(stmt.body if condition else stmt.orelse))
+        else:
+            active.append(stmt)
+    return active
+
+
+def _condition(test: ast.expr) -> Optional[bool]:
+    if isinstance(test, ast.BoolOp):
+        values = [_condition(v) for v in test.values]
+        if None in values:
+            return None
+        return all(values) if isinstance(test.op, ast.And) else any(values)
+    if isinstance(test, ast.UnaryOp) and isinstance(test.op, ast.Not):
+        value = _condition(test.operand)
+        return None if value is None else not value
+    if isinstance(test, ast.Call) and isinstance(test.func, ast.Attribute) and test.func.attr == 'startswith' and \
+            ast.unparse(test.func.value) == 'sys.platform' and len(test.args) == 1 and \
+            isinstance(test.args[0], ast.Constant):
+        return sys.platform.startswith(test.args[0].value)
+    if not isinstance(test, ast.Compare) or len(test.ops) != 1:
+        return None
+    left, op, right = ast.unparse(test.left), test.ops[0], test.comparators[0]
+    try:
+        value = ast.literal_eval(right)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+    if left == 'sys.platform':
+        actual = sys.platform
+    elif left.startswith('sys.version_info') and isinstance(value, tuple):
+        actual = sys.version_info[:len(value)]
+    else:
+        return None
+    comparisons = {ast.Eq: actual == value, ast.NotEq: actual != value}
+    if isinstance(value, tuple):
+        comparisons.update({ast.Lt: actual < value, ast.LtE: actual <= value, ast.Gt: actual > value,
+                            ast.GtE: actual >= value})
+    return comparisons.get(type(op))
+
+
+def _write(output: Path, records: Dict[str, str]) -> None:
+    keys = sorted(records, key=lambda k: k.encode())
+    offsets, entries, position = [], [], _HEADER.size + len(keys) * _OFFSET.size
+    for key in keys:
+        encoded_key, value = key.encode(), records[key].encode()
+        entry = _KEY.pack(len(encoded_key)) + encoded_key + _VALUE.pack(len(value)) + value
+        offsets.append(position)
+        entries.append(entry)
+        position += len(entry)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=output.parent, prefix='.', suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(keys)))
+        f.write(b''.join(_OFFSET.pack(o) for o in offsets))
+        f.write(b''.join(entries))
+    # `mkstemp` creates the file readable by its owner only, rather than as the umask allows
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(tmp, 0o666 & ~umask)
+    os.replace(tmp, output)
+
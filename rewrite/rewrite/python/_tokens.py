@@ -0,0 +1,151 @@
+import io
+import token
+from bisect import bisect_left, bisect_right
+from tokenize import generate_tokens, TokenInfo, TokenError
+from typing import List, Iterator, Dict, Optional, Tuple
+
+from more_itertools import peekable
+
+
+class TokenTable:
+    """
+    Tokenizes a module once and lets the parser seek into the token stream by source offset.
+
+    Tokens are produced lazily and memoized, so a parser that only ever moves forward through
+    the source pays for a single pass of the tokenizer. Only the source from `start` on, which is on
+    line `row`, is tokenized, such as the body of a function that is mapped by itself.
+    """
+
+    _source: str
+    _row: int
+    _column: int
+    _line_starts: List[int]
+    _tokens: List[TokenInfo]
+    _offsets: List[int]
+
+    def __init__(self, source: str, start: int = 0, row: int = 1):
+        self._source = source
+        self._row = row
+        line_start = source.rfind('\n', 0, start) + 1
+        self._column = start - line_start
+        self._line_starts = [line_start]
+        index = source.find('\n', start)
+        while index != -1:
+            self._line_starts.append(index + 1)
+            index = source.find('\n', index + 1)
+        self._tokens = []
+        self._offsets = []
+        self._generator = generate_tokens(io.StringIO(source[start:] if start else source).readline)
+
+    def offset_of(self, position: tuple) -> int:
+        """Converts a `(row, col)` position, with a row of at least `row`, into an absolute offset into the source."""
+        row, col = position
+        if row - self._row >= len(self._line_starts):
+            return len(self._source)
+        return self._line_starts[row - self._row] + col
+
+    def row_of(self, offset: int) -> int:
+        """The row of the line that `offset`, at or after `start`, is on."""
+        return self._row + bisect_right(self._line_starts, offset) - 1
+
+    def seek(self, offset: int) -> int:
+        """Returns the index of the first token starting at or after `offset`."""
+        while (not self._offsets or self._offsets[-1] < offset) and self.__fill():
+            pass
+        return bisect_left(self._offsets, offset)
+
+    def tokens_from(self, offset: int) -> peekable:
+        return peekable(self.__iter_from(self.seek(offset)))
+
+    def all(self) -> Iterator[Tuple[TokenInfo, int]]:
+        """Yields every token of the module together with its absolute start offset."""
+        for index, tok in enumerate(self.__iter_from(0)):
+            yield tok, self._offsets[index]
+
+    def __iter_from(self, index: int) -> Iterator[TokenInfo]:
+        while index < len(self._tokens) or self.__fill():
+            yield self._tokens[index]
+            index += 1
+
+    def __fill(self) -> bool:
+        if self._generator is None:
+            return False
+        tok = next(self._generator, None)
+        if tok is None:
+            self._generator = None
+            return False
+        self._tokens.append(tok)
+        row, col = tok.start
+        # the tokenizer counts rows and the columns of the first one from `start`
+        self._offsets.append(self.offset_of((row + self._row - 1, col + self._column if row == 1 else col)))
+        return True
+
+
+_OPENING_BRACKETS = {'(', '[', '{'}
+_CLOSING_BRACKETS = {')', ']', '}'}
+
+
+class LexicalIndex:
+    """
+    Offsets of every operator, keyword and name token of a module, keyed by the token text.
+
+    Because the index is built from the token stream, delimiters appearing inside comments or
+    string literals are never reported. The index also pairs up matching brackets.
+    """
+
+    _positions: Dict[str, List[int]]
+    _brackets: Dict[int, int]
+
+    def __init__(self, tokens: TokenTable):
+        self._positions = {}
+        self._brackets = {}
+        open_brackets: List[int] = []
+        for tok, offset in tokens.all():
+            if tok.type not in (token.OP, token.NAME):
+                continue
+            positions = self._positions.get(tok.string)
+            if positions is None:
+                self._positions[tok.string] = [offset]
+            else:
+                positions.append(offset)
+            if tok.string in _OPENING_BRACKETS:
+                open_brackets.append(offset)
+            elif tok.string in _CLOSING_BRACKETS and open_brackets:
+                opening = open_brackets.pop()
+                self._brackets[opening] = offset
+                self._brackets[offset] = opening
+        for positions in self._positions.values():
+            positions.sort()
+
+    @classmethod
+    def build(cls, tokens: TokenTable) -> Optional['LexicalIndex']:
+        """Builds the index, or returns `None` when the module cannot be tokenized in full."""
+        try:
+            return cls(tokens)
+        except (SyntaxError, TokenError):
+            return None
+
+    @staticmethod
+    def covers(delim: str) -> bool:
+        """Whether `delim` is a single operator, keyword or name token, which are the tokens the index holds."""
+        return delim in token.EXACT_TOKEN_TYPES or delim.isidentifier()
+
+    def position_of_next(self, delim: str, offset: int, stop: Optional[str] = None) -> int:
+        """
+        Returns the offset of the first `delim` token at or after `offset`, or -1 if there is none
+        or if a `stop` token comes first.
+        """
+        positions = self._positions.get(delim)
+        if not positions:
+            return -1
+        index = bisect_left(positions, offset)
+        if index == len(positions):
+            return -1
+        position = positions[index]
+        if stop is not None and -1 < self.position_of_next(stop, offset) < position:
+            return -1
+        return position
+
+    def matching_bracket(self, offset: int) -> int:
+        """Returns the offset of the bracket matching the one at `offset`, or -1 if there is no bracket there."""
+        return self._brackets.get(offset, -1)
@@ -0,0 +1,257 @@
+import ast
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import Dict, Optional, Set, Iterable, Tuple
+
+from ..java import JavaType, TypeTable
+
+
+def module_name(path: Path, relative_to: Optional[Path] = None) -> str:
+    """The name under which the module at `path` is imported, such as `pkg.mod` for `pkg/mod.py`."""
+    if relative_to is not None and path.is_absolute():
+        try:
+            path = path.relative_to(relative_to)
+        except ValueError:
+            pass
+    parts = list(path.with_suffix('').parts)
+    if parts and parts[-1] == '__init__':
+        parts.pop()
+    return '.'.join(part for part in parts if part not in ('/', '\\'))
+
+
+class ProjectTypes:
+    """
+    The stubs that pytype inferred for the modules of a project, from which `PythonTypeMapping` attaches types
+    to the trees of these modules. Only the names of the stubs in the cache directory are held, so an instance
+    is cheap to hand to worker processes; the stubs are read and parsed when first needed.
+    """
+
+    _directory: Path
+    _keys: Dict[str, Optional[str]]
+    _packages: Set[str]
+
+    def __init__(self, directory: Path, keys: Dict[str, Optional[str]], packages: Set[str]):
+        self._directory = directory
+        self._keys = keys
+        self._packages = packages
+        self._symbols: Dict[str, Dict[str, ast.stmt]] = {}
+        self._aliases: Dict[str, Dict[str, str]] = {}
+
+    def __getstate__(self):
+        return self._directory, self._keys, self._packages
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __contains__(self, module: str) -> bool:
+        return module in self._keys
+
+    def is_package(self, module: str) -> bool:
+        return module in self._packages
+
+    def key(self, module: str) -> Optional[str]:
+        """The key of the stub of `module`, which changes whenever the module or one of its dependencies does."""
+        return self._keys.get(module)
+
+    def symbols(self, module: str) -> Dict[str, ast.stmt]:
+        """The top-level definitions of the stub of `module`, by name."""
+        symbols = self._symbols.get(module)
+        if symbols is None:
+            symbols = {}
+            aliases = self._aliases[module] = {}
+            key = self._keys.get(module)
+            if key is not None:
+                try:
+                    stub = ast.parse(_stub_path(self._directory, key).read_text('utf-8'))
+                except (OSError, SyntaxError):
+                    stub = ast.Module([], [])
+                for stmt in stub.body:
+                    if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                        symbols[stmt.name] = stmt
+                    elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name):
+                        symbols[stmt.target.id] = stmt
+                    elif isinstance(stmt, ast.Import):
+                        aliases.update((alias.asname, alias.name) for alias in stmt.names if alias.asname)
+                    elif isinstance(stmt, ast.ImportFrom) and stmt.module:
+                        aliases.update((alias.asname or alias.name, f"{stmt.module}.{alias.name}")
+                                       for alias in stmt.names)
+            self._symbols[module] = symbols
+        return symbols
+
+    def qualify(self, module: str, name: str) -> str:
+        """Qualifies a dotted name used in the stub of `module` with the module it was imported from."""
+        self.symbols(module)
+        first, dot, rest = name.partition('.')
+        qualified = self._aliases[module].get(first)
+        return f"{qualified}{dot}{rest}" if qualified else name
+
+    @staticmethod
+    def class_type(fully_qualified_name: str) -> JavaType.Class:
+        return TypeTable.current().class_type(fully_qualified_name)
+
+
+class TypeAttribution:
+    """
+    Runs pytype over all modules of a project in dependency order, so that the stubs of the project modules a
+    module imports are available when it is analyzed. Modules whose dependencies are all done are analyzed
+    concurrently in up to `parallelism` processes.
+
+    The inferred stubs are cached in `directory`, keyed by the source of a module and the keys of the stubs of
+    the project modules it imports, so that unchanged modules are not analyzed again.
+    """
+
+    _directory: Path
+    _parallelism: int
+
+    def __init__(self, directory: Path, parallelism: int = 1):
+        self._directory = Path(directory)
+        self._parallelism = parallelism
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    @property
+    def parallelism(self) -> int:
+        return self._parallelism
+
+    def attribute(self, sources: Iterable[Tuple[Path, str]], relative_to: Optional[Path] = None) -> ProjectTypes:
+        """Infers the stubs for the modules with the given paths and source texts."""
+        texts: Dict[str, str] = {}
+        packages: Set[str] = set()
+        for path, text in sources:
+            name = module_name(path, relative_to)
+            texts[name] = text
+            if path.stem == '__init__':
+                packages.add(name)
+        dependencies = {name: _dependencies(name, text, texts.keys(), name in packages)
+                        for name, text in texts.items()}
+
+        keys: Dict[str, Optional[str]] = {}
+        remaining = set(texts)
+        in_flight: Dict[Future, Tuple[str, str]] = {}
+        stubs = Path(tempfile.mkdtemp(prefix='stubs-'))
+        executor = ProcessPoolExecutor(self._parallelism) if self._parallelism > 1 else None
+        try:
+            while remaining or in_flight:
+                ready = sorted(name for name in remaining if dependencies[name] <= keys.keys())
+                if not ready and not in_flight:
+                    # a dependency cycle; its unfinished modules are unknown to the module analyzed first
+                    ready = [min(remaining, key=lambda name: (len(dependencies[name] - keys.keys()), name))]
+                for name in ready:
+                    remaining.discard(name)
+                    key = self.__key(name, texts[name], [keys.get(d) for d in sorted(dependencies[name])])
+                    if _stub_path(self._directory, key).exists():
+                        self.__done(name, key, name in packages, stubs, keys)
+                    elif executor is None:
+                        self.__store(key, _infer_stub(name, texts[name], str(stubs)))
+                        self.__done(name, key, name in packages, stubs, keys)
+                    else:
+                        in_flight[executor.submit(_infer_stub, name, texts[name], str(stubs))] = (name, key)
+                if in_flight:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        name, key = in_flight.pop(future)
+                        self.__store(key, future.result())
+                        self.__done(name, key, name in packages, stubs, keys)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            shutil.rmtree(stubs, ignore_errors=True)
+        return ProjectTypes(self._directory, keys, packages)
+
+    @staticmethod
+    def __key(name: str, text: str, dependency_keys: Iterable[Optional[str]]) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"{_pytype_version()} {sys.version_info.major}.{sys.version_info.minor} {name}\n".encode())
+        digest.update(text.encode('utf-8', 'surrogatepass'))
+        for key in dependency_keys:
+            digest.update(f"\n{key}".encode())
+        return digest.hexdigest()
+
+    def __store(self, key: str, stub: Optional[str]) -> None:
+        # a module pytype fails on gets an empty stub, so that it is not analyzed again
+        path = _stub_path(self._directory, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(stub or '')
+            os.replace(tmp, path)
+        except OSError as e:
+            logging.error(f"Could not cache the inferred types of {path}: {str(e)}")
+
+    def __done(self, name: str, key: str, package: bool, stubs: Path, keys: Dict[str, Optional[str]]) -> None:
+        """Makes the stub of a finished module visible to pytype for the modules that import it."""
+        path = _stub_path(self._directory, key)
+        keys[name] = key if path.exists() else None
+        if keys[name] is None:
+            return
+        parts = name.split('.')
+        target = stubs.joinpath(*parts, '__init__.pyi') if package else stubs.joinpath(*parts).with_suffix('.pyi')
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(path, target)
+        for parent in target.parents:
+            if parent == stubs:
+                break
+            init = parent / '__init__.pyi'
+            if not init.exists():
+                init.touch()
+
+
+def _stub_path(directory: Path, key: str) -> Path:
+    return directory / key[:2] / f"{key}.pyi"
+
+
+def _dependencies(name: str, text: str, modules: Iterable[str], package: bool) -> Set[str]:
+    """The modules among `modules` that the module `name` imports."""
+    modules = set(modules)
+    try:
+        tree = ast.parse(text)
+    except SyntaxError:
+        return set()
+    imported = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                parts = alias.name.split('.')
+                imported.update('.'.join(parts[:i + 1]) for i in range(len(parts)))
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = name.split('.') if package else name.split('.')[:-1]
+                base = base[:len(base) - node.level + 1] + ([node.module] if node.module else [])
+                module = '.'.join(base)
+            else:
+                module = node.module
+            imported.add(module)
+            imported.update(f"{module}.{alias.name}" for alias in node.names)
+    imported.discard(name)
+    return imported & modules
+
+
+_version: Optional[str] = None
+
+
+def _pytype_version() -> str:
+    global _version
+    if _version is None:
+        from pytype import io
+        _version = io.get_pytype_version()
+    return _version
+
+
+def _infer_stub(name: str, text: str, pythonpath: str) -> Optional[str]:
+    from pytype import config, io
+    options = config.Options.create(python_version=f"{sys.version_info.major}.{sys.version_info.minor}",
+                                    module_name=name, pythonpath=pythonpath)
+    try:
+        return io.generate_pyi(text, options)[1]
+    except Exception as e:
+        logging.error(f"Could not infer the types of {name}: {str(e)}")
+        return None
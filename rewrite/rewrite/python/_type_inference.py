@@ -0,0 +1,468 @@
+import ast
+import builtins
+from contextlib import contextmanager
+from typing import Optional, Dict, Union, NamedTuple, List, Iterator
+
+from ._stub_index import StubIndex, Symbol, CLASS, FUNCTION, VARIABLE, TYPE_ALIAS, PRIMITIVES, instance_type
+from ..java import JavaType, TypeTable
+
+_BUILTIN_RETURNS = {
+    'all': 'builtins.bool',
+    'any': 'builtins.bool',
+    'ascii': 'builtins.str',
+    'bin': 'builtins.str',
+    'callable': 'builtins.bool',
+    'chr': 'builtins.str',
+    'delattr': 'builtins.None',
+    'dir': 'builtins.list',
+    'format': 'builtins.str',
+    'globals': 'builtins.dict',
+    'hasattr': 'builtins.bool',
+    'hash': 'builtins.int',
+    'hex': 'builtins.str',
+    'id': 'builtins.int',
+    'input': 'builtins.str',
+    'isinstance': 'builtins.bool',
+    'issubclass': 'builtins.bool',
+    'len': 'builtins.int',
+    'locals': 'builtins.dict',
+    'oct': 'builtins.str',
+    'ord': 'builtins.int',
+    'print': 'builtins.None',
+    'repr': 'builtins.str',
+    'setattr': 'builtins.None',
+    'sorted': 'builtins.list',
+    'vars': 'builtins.dict',
+}
+_DISPLAYS = {
+    ast.List: 'builtins.list',
+    ast.ListComp: 'builtins.list',
+    ast.Tuple: 'builtins.tuple',
+    ast.Dict: 'builtins.dict',
+    ast.DictComp: 'builtins.dict',
+    ast.Set: 'builtins.set',
+    ast.SetComp: 'builtins.set',
+}
+_NUMBERS = (JavaType.Primitive.Int, JavaType.Primitive.Double)
+
+
+def literal_type(value) -> JavaType:
+    if isinstance(value, str):
+        return JavaType.Primitive.String
+    elif isinstance(value, bool):
+        return JavaType.Primitive.Boolean
+    elif isinstance(value, int):
+        return JavaType.Primitive.Int
+    elif isinstance(value, float):
+        return JavaType.Primitive.Double
+    else:
+        return JavaType.Primitive.None_
+
+
+class _Symbol(NamedTuple):
+    """A module, class or function that a name refers to, rather than a value of some type."""
+    name: str
+    kind: Optional[str]  # 'module', 'class' or None where it is not known which
+
+
+_Binding = Union[JavaType, _Symbol, None]
+
+
+class Scope:
+    __slots__ = ('parent', 'kind', 'name', 'names')
+
+    def __init__(self, parent: Optional['Scope'], kind: str, name: str):
+        self.parent = parent
+        self.kind = kind
+        self.name = name
+        self.names: Dict[str, _Binding] = {}
+
+    def lookup(self, name: str) -> _Binding:
+        scope = self.binding(name)
+        if scope is not None:
+            return scope.names[name]
+        if hasattr(builtins, name):
+            return _Symbol(f"builtins.{name}", 'class' if isinstance(getattr(builtins, name), type) else None)
+        return None
+
+    def binding(self, name: str) -> Optional['Scope']:
+        """The scope `name` is bound in, as seen from this scope."""
+        scope = self
+        while scope is not None:
+            if name in scope.names:
+                return scope
+            # the names of a class body are not visible to the functions nested in it
+            scope = scope.parent
+            while scope is not None and scope.kind == 'class':
+                scope = scope.parent
+        return None
+
+
+class LocalTypes:
+    """
+    Infers types from the module itself, without pytype: literals, calls to builtins, constructors of the
+    classes defined in the module, annotated parameters and variables, and the names bound by `import`
+    statements. With a `StubIndex`, the signatures of the classes and functions of the standard library and of
+    stubbed third-party packages, including the classes they define, are known as well.
+
+    Names are bound as the parser visitor reaches the statements binding them, so the type of a name is that of
+    its latest assignment in source order. The top-level definitions and imports of the module, and the methods of
+    a class, are known up front, so that they can be referred to before they are defined.
+    """
+
+    def __init__(self, module: Optional[str] = None, index: Optional[StubIndex] = None, package: bool = False):
+        self._module = module
+        self._package = package
+        self._index = index
+        self._scope = Scope(None, 'module', module or '')
+        self._declared: Optional[ast.Module] = None
+        self._targets: Dict[int, _Binding] = {}
+        self._annotations: Dict[int, ast.expr] = {}
+        self._definitions: Dict[int, JavaType] = {}
+        self._members: Dict[str, Dict[str, _Binding]] = {}
+        self._memo: Dict[int, Optional[JavaType]] = {}
+
+    @property
+    def scope(self) -> Scope:
+        return self._scope
+
+    def declare_module(self, node: ast.Module) -> None:
+        if self._declared is node:
+            return
+        self._declared = node
+        self.__declare(node.body)
+
+    @contextmanager
+    def enter(self, node: Union[ast.AST, Scope]) -> Iterator[Scope]:
+        """Enters the scope of a function, class, lambda or comprehension, or resumes a scope entered before."""
+        outer = self._scope
+        if isinstance(node, Scope):
+            self._scope = node
+        elif isinstance(node, ast.ClassDef):
+            self._scope = Scope(outer, 'class', self.__qualify(node.name))
+            self._members[self._scope.name] = self._scope.names
+            self.__declare(node.body)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+            self._scope = Scope(outer, 'function', self.__qualify(getattr(node, 'name', '<lambda>')))
+            self.__bind_arguments(node, outer)
+        else:
+            self._scope = Scope(outer, 'comprehension', outer.name)
+            for generator in node.generators:
+                self.__bind_names(generator.target, None)
+        try:
+            yield self._scope
+        finally:
+            self._scope = outer
+
+    def enter_statement(self, node: ast.stmt) -> None:
+        if isinstance(node, ast.Assign):
+            value = self.__value(node.value)
+            for target in node.targets:
+                self.__declare_target(target, value)
+        elif isinstance(node, ast.AnnAssign):
+            self._annotations[id(node.annotation)] = node.annotation
+            self.__declare_target(node.target, self.__annotation_type(node.annotation))
+        elif isinstance(node, (ast.For, ast.AsyncFor)):
+            self.__bind_names(node.target, None)
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            for item in node.items:
+                if item.optional_vars is not None:
+                    self.__bind_names(item.optional_vars, None)
+        elif isinstance(node, ast.Try):
+            for handler in node.handlers:
+                if handler.name:
+                    self._scope.names[handler.name] = self.__instance_type(self.__resolve(handler.type)) \
+                        if isinstance(handler.type, (ast.Name, ast.Attribute)) else None
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            self.__declare([node])
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.returns is not None:
+                self._annotations[id(node.returns)] = node.returns
+
+    def exit_statement(self, node: ast.stmt) -> None:
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            for target in node.targets if isinstance(node, ast.Assign) else [node.target]:
+                if isinstance(target, ast.Name) and id(target) in self._targets:
+                    self._scope.names[target.id] = self._targets.pop(id(target))
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            self.__declare([node])
+        elif isinstance(node, ast.Delete):
+            for target in node.targets:
+                self.__bind_names(target, None)
+
+    def binds_locally(self, node: ast.Name) -> bool:
+        """Whether the name is bound in a function, class or comprehension, shadowing any binding of the module."""
+        if id(node) in self._targets:
+            return self._scope.kind != 'module'
+        scope = self._scope.binding(node.id)
+        return scope is not None and scope.kind != 'module'
+
+    def type(self, node) -> Optional[JavaType]:
+        if id(node) in self._annotations:
+            return self.__annotation_type(node)
+        elif isinstance(node, ast.Name):
+            if id(node) in self._targets:
+                return self.__type_of(self._targets[id(node)])
+            return self.__type_of(self._scope.lookup(node.id))
+        elif isinstance(node, ast.arg):
+            return self.__type_of(self._scope.names.get(node.arg))
+        elif isinstance(node, ast.AnnAssign):
+            return self.__annotation_type(node.annotation)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return self._definitions.get(id(node))
+        elif isinstance(node, ast.Call):
+            return self.method_invocation_type(node)
+        return self.__type_of(self.__value(node))
+
+    def method_invocation_type(self, node: ast.Call) -> Optional[JavaType.Method]:
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            receiver = self.__value(func.value)
+            if isinstance(receiver, _Symbol) and receiver.kind != 'class':
+                return self.__symbol_method(_Symbol(f"{receiver.name}.{func.attr}", None))
+            declaring = self.__class_of(receiver)
+            if declaring is None:
+                return None
+            member = self._members.get(declaring._fully_qualified_name, {}).get(func.attr)
+            if isinstance(member, JavaType.Method):
+                return member
+            if self._index is not None and \
+                    (indexed := self._index.member(declaring._fully_qualified_name, func.attr)) is not None and \
+                    indexed.kind == FUNCTION:
+                return self._index.method(indexed, declaring)
+            return TypeTable.current().method(declaring, func.attr)
+        callee = self.__value(func)
+        if isinstance(callee, JavaType.Method):
+            return callee
+        elif isinstance(callee, _Symbol):
+            return self.__symbol_method(callee)
+        return None
+
+    def __symbol_method(self, symbol: _Symbol) -> Optional[JavaType.Method]:
+        module, _, name = symbol.name.rpartition('.')
+        indexed = self.__indexed(symbol)
+        if indexed is not None:
+            if indexed.kind == FUNCTION:
+                return self._index.method(indexed, TypeTable.current().class_type(module) if module else None)
+            elif indexed.kind == CLASS:
+                return TypeTable.current().method(TypeTable.current().class_type(indexed.name),
+                                                  indexed.name.rpartition('.')[2], instance_type(indexed.name))
+            return None
+        if symbol.kind == 'class':
+            return TypeTable.current().method(TypeTable.current().class_type(symbol.name), name,
+                                              instance_type(symbol.name))
+        if symbol.kind == 'module' or not module:
+            return None
+        return_type = _BUILTIN_RETURNS.get(name) if module == 'builtins' else None
+        return TypeTable.current().method(TypeTable.current().class_type(module), name,
+                                          instance_type(return_type) if return_type else None)
+
+    def __declare(self, statements: List[ast.stmt]) -> None:
+        """Binds the names defined by the given statements of the current scope, classes and imports first."""
+        for stmt in statements:
+            if isinstance(stmt, ast.ClassDef):
+                symbol = _Symbol(self.__qualify(stmt.name), 'class')
+                self._scope.names[stmt.name] = symbol
+                self._definitions[id(stmt)] = TypeTable.current().class_type(symbol.name)
+            elif isinstance(stmt, ast.Import):
+                for alias in stmt.names:
+                    if alias.asname:
+                        self._scope.names[alias.asname] = _Symbol(alias.name, 'module')
+                    else:
+                        root = alias.name.partition('.')[0]
+                        self._scope.names[root] = _Symbol(root, 'module')
+            elif isinstance(stmt, ast.ImportFrom):
+                module = self.__import_base(stmt)
+                for alias in stmt.names:
+                    if alias.name != '*':
+                        self._scope.names[alias.asname or alias.name] = _Symbol(
+                            f"{module}.{alias.name}" if module else alias.name, None)
+        for stmt in statements:
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self._scope.names[stmt.name] = self._definitions[id(stmt)] = self.__function_type(stmt)
+
+    def __import_base(self, node: ast.ImportFrom) -> str:
+        if not node.level:
+            return node.module or ''
+        package = (self._module.split('.') if self._package else self._module.split('.')[:-1]) if self._module else []
+        package = package[:max(len(package) - node.level + 1, 0)] + ([node.module] if node.module else [])
+        return '.'.join(package)
+
+    def __function_type(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> JavaType.Method:
+        arguments = node.args
+        if self._scope.kind == 'class':
+            declaring = TypeTable.current().class_type(self._scope.name)
+        else:
+            declaring = TypeTable.current().class_type(self._module) if self._module else None
+        return TypeTable.current().method(
+            declaring,
+            node.name,
+            self.__annotation_type(node.returns),
+            [a.arg for a in arguments.posonlyargs + arguments.args + arguments.kwonlyargs]
+        )
+
+    def __bind_arguments(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda], outer: Scope):
+        arguments = node.args
+        positional = arguments.posonlyargs + arguments.args
+        for arg in positional + arguments.kwonlyargs:
+            if arg.annotation is not None:
+                self._annotations[id(arg.annotation)] = arg.annotation
+            # annotations are evaluated in the enclosing scope
+            self._scope.names[arg.arg] = self.__annotation_type(arg.annotation, outer)
+        if arguments.vararg:
+            self._scope.names[arguments.vararg.arg] = instance_type('builtins.tuple')
+        if arguments.kwarg:
+            self._scope.names[arguments.kwarg.arg] = instance_type('builtins.dict')
+        if outer.kind == 'class' and positional and not isinstance(node, ast.Lambda):
+            decorators = {d.id for d in node.decorator_list if isinstance(d, ast.Name)}
+            if 'classmethod' in decorators:
+                self._scope.names[positional[0].arg] = _Symbol(outer.name, 'class')
+            elif 'staticmethod' not in decorators:
+                self._scope.names[positional[0].arg] = TypeTable.current().class_type(outer.name)
+
+    def __declare_target(self, target: ast.expr, value: _Binding) -> None:
+        if isinstance(target, ast.Name):
+            self._targets[id(target)] = value
+        elif isinstance(target, (ast.Tuple, ast.List, ast.Starred)):
+            self.__bind_names(target, None)
+
+    def __bind_names(self, target: ast.expr, value: _Binding) -> None:
+        if isinstance(target, ast.Name):
+            self._scope.names[target.id] = value
+        elif isinstance(target, (ast.Tuple, ast.List)):
+            for element in target.elts:
+                self.__bind_names(element, None)
+        elif isinstance(target, ast.Starred):
+            self.__bind_names(target.value, None)
+
+    def __qualify(self, name: str) -> str:
+        scope = self._scope
+        if scope.kind == 'function':
+            return f"{scope.name}.<locals>.{name}"
+        return f"{scope.name}.{name}" if scope.name else name
+
+    def __resolve(self, node: ast.expr) -> _Binding:
+        if isinstance(node, ast.Name):
+            return self._scope.lookup(node.id)
+        elif isinstance(node, ast.Attribute):
+            base = self.__resolve(node.value)
+            if isinstance(base, _Symbol) and base.kind != 'class':
+                return _Symbol(f"{base.name}.{node.attr}", None)
+        return None
+
+    def __value(self, node: ast.expr) -> _Binding:
+        """The type of the value of an expression, or the symbol it refers to."""
+        if isinstance(node, (ast.Name, ast.Attribute)):
+            resolved = self.__resolve(node)
+            if isinstance(resolved, _Symbol) and (indexed := self.__indexed(resolved)) is not None and \
+                    indexed.kind == VARIABLE:
+                return self._index.type(indexed.fields[0])
+            return resolved
+        elif isinstance(node, ast.Constant):
+            return literal_type(node.value)
+        elif isinstance(node, ast.JoinedStr):
+            return JavaType.Primitive.String
+        elif type(node) in _DISPLAYS:
+            return instance_type(_DISPLAYS[type(node)])
+        elif isinstance(node, ast.Call):
+            method = self.method_invocation_type(node)
+            return method.return_type if method else None
+        elif isinstance(node, ast.Compare) or isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return JavaType.Primitive.Boolean
+        elif isinstance(node, (ast.BinOp, ast.IfExp)):
+            key = id(node)
+            if key not in self._memo:
+                self._memo[key] = self.__combined_type(node)
+            return self._memo[key]
+        return None
+
+    def __combined_type(self, node: Union[ast.BinOp, ast.IfExp]) -> Optional[JavaType]:
+        if isinstance(node, ast.IfExp):
+            body, orelse = self.__type_of(self.__value(node.body)), self.__type_of(self.__value(node.orelse))
+            return body if body is orelse else None
+        left, right = self.__type_of(self.__value(node.left)), self.__type_of(self.__value(node.right))
+        if left in _NUMBERS and right in _NUMBERS:
+            if isinstance(node.op, ast.Div) or JavaType.Primitive.Double in (left, right):
+                return JavaType.Primitive.Double
+            return JavaType.Primitive.Int
+        if left is JavaType.Primitive.String and (right is JavaType.Primitive.String or isinstance(node.op, ast.Mod)):
+            return JavaType.Primitive.String
+        return None
+
+    def __annotation_type(self, annotation: Optional[ast.expr], scope: Optional[Scope] = None) -> Optional[JavaType]:
+        if annotation is None:
+            return None
+        if scope is not None and scope is not self._scope:
+            current, self._scope = self._scope, scope
+            try:
+                return self.__annotation_type(annotation)
+            finally:
+                self._scope = current
+        if isinstance(annotation, ast.Constant):
+            if annotation.value is None:
+                return JavaType.Primitive.None_
+            if isinstance(annotation.value, str):
+                try:
+                    return self.__annotation_type(ast.parse(annotation.value, mode='eval').body)
+                except SyntaxError:
+                    return None
+            return None
+        if isinstance(annotation, ast.BinOp) and isinstance(annotation.op, ast.BitOr):
+            # `X | None`
+            left, right = self.__annotation_type(annotation.left), self.__annotation_type(annotation.right)
+            return right if left is JavaType.Primitive.None_ else left if right is JavaType.Primitive.None_ else None
+        if isinstance(annotation, ast.Subscript):
+            base = self.__resolve(annotation.value)
+            if isinstance(base, _Symbol) and base.name == 'typing.Optional':
+                return self.__annotation_type(annotation.slice)
+            base_type = self.__instance_type(base)
+            if not isinstance(base_type, JavaType.FullyQualified):
+                return base_type
+            elements = annotation.slice.elts if isinstance(annotation.slice, ast.Tuple) else [annotation.slice]
+            parameters = [self.__annotation_type(e) for e in elements]
+            if any(p is None for p in parameters):
+                return base_type
+            return TypeTable.current().parameterized(base_type, parameters)
+        return self.__instance_type(self.__resolve(annotation))
+
+    def __instance_type(self, binding: _Binding) -> Optional[JavaType]:
+        """The type of the instances of the class that `binding` refers to."""
+        if isinstance(binding, _Symbol) and binding.kind != 'module':
+            indexed = self.__indexed(binding)
+            if indexed is None:
+                return instance_type(binding.name)
+            elif indexed.kind == CLASS:
+                return instance_type(indexed.name)
+            elif indexed.kind == TYPE_ALIAS:
+                return self._index.type(indexed.fields[0])
+        return None
+
+    def __type_of(self, binding: _Binding) -> Optional[JavaType]:
+        if isinstance(binding, _Symbol) and (indexed := self.__indexed(binding)) is not None:
+            if indexed.kind == CLASS:
+                return TypeTable.current().class_type(indexed.name)
+            elif indexed.kind == FUNCTION:
+                return self.__symbol_method(binding)
+            return None
+        elif isinstance(binding, _Symbol):
+            if binding.kind == 'class':
+                return TypeTable.current().class_type(binding.name)
+            if binding.kind is None and binding.name.startswith('builtins.'):
+                return self.__symbol_method(binding)
+            return None
+        return binding
+
+    def __indexed(self, symbol: _Symbol) -> Optional[Symbol]:
+        return self._index.symbol(symbol.name) if self._index is not None else None
+
+    @staticmethod
+    def __class_of(binding: _Binding) -> Optional[JavaType.Class]:
+        if isinstance(binding, _Symbol):
+            return TypeTable.current().class_type(binding.name) if binding.kind == 'class' else None
+        if isinstance(binding, JavaType.Parameterized):
+            return binding._type
+        if isinstance(binding, JavaType.Class):
+            return binding
+        for name, primitive in PRIMITIVES.items():
+            if binding is primitive and name != 'builtins.None':
+                return TypeTable.current().class_type(name)
+        return None
@@ -56,3 +56,60 @@ class Quoted(Marker):
         DOUBLE = 1
         TRIPLE_SINGLE = 2
         TRIPLE_DOUBLE = 3
+
+
+@dataclass(frozen=True, eq=False)
+class ParseBudgetExceeded(Marker):
+    """Marks a `ParseError` for a source file that exceeded its time or size budget."""
+
+    _id: UUID
+
+    @property
+    def id(self) -> UUID:
+        return self._id
+
+    def with_id(self, id_: UUID) -> ParseBudgetExceeded:
+        return self if id_ is self._id else replace(self, _id=id_)
+
+    _budget: Budget
+
+    @property
+    def budget(self) -> Budget:
+        return self._budget
+
+    def with_budget(self, budget: Budget) -> ParseBudgetExceeded:
+        return self if budget is self._budget else replace(self, _budget=budget)
+
+    _limit: float
+
+    @property
+    def limit(self) -> float:
+        """The exceeded limit, in seconds or characters."""
+        return self._limit
+
+    def with_limit(self, limit: float) -> ParseBudgetExceeded:
+        return self if limit is self._limit else replace(self, _limit=limit)
+
+    _elapsed: float
+
+    @property
+    def elapsed(self) -> float:
+        """The seconds spent on the source file before it was abandoned."""
+        return self._elapsed
+
+    def with_elapsed(self, elapsed: float) -> ParseBudgetExceeded:
+        return self if elapsed is self._elapsed else replace(self, _elapsed=elapsed)
+
+    _size: int
+
+    @property
+    def size(self) -> int:
+        """The length of the source text in characters."""
+        return self._size
+
+    def with_size(self, size: int) -> ParseBudgetExceeded:
+        return self if size is self._size else replace(self, _size=size)
+
+    class Budget(Enum):
+        TIME = 0
+        SIZE = 1
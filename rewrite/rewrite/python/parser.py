@@ -1,36 +1,291 @@
 import ast
+import io
 import logging
-from dataclasses import dataclass
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field, replace
+from functools import partial
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Iterable, Optional, ClassVar, Any, Dict, Deque, Callable, Tuple, Union, List, Iterator, \
+    ContextManager
 
-from rewrite import Parser, ParserInput, ExecutionContext, SourceFile, ParseError, NamedStyles, Markers, Tree, random_id
-from rewrite.parser import require_print_equals_input, ParserBuilder
-from ._parser_visitor import ParserVisitor
+from rewrite import Parser, ParserInput, ExecutionContext, InMemoryExecutionContext, SourceFile, ParseError, \
+    NamedStyles, Markers, Tree, random_id, PrintEqualsInputMode
+from rewrite.parser import require_print_equals_input, print_equals_input_mode, ParserBuilder
+from rewrite.java import TypeTable
+from rewrite.utils import id_generator, use_id_generator, IdGenerator
+from . import _pickling, _incremental
+from ._lst_cache import LstCache
+from .markers import ParseBudgetExceeded
+from ._parser_visitor import ParserVisitor, ParseTimeout
+from ._stub_index import StubIndex
+from ._type_attribution import TypeAttribution, ProjectTypes, module_name
+from .type_mapping import PythonTypeMapping
 from .tree import CompilationUnit
 
-logging.basicConfig(level=logging.ERROR)
+
+@dataclass(frozen=True)
+class ParseTiming:
+    path: Path
+    size: int
+    seconds: float
 
 
 @dataclass(frozen=True)
 class PythonParser(Parser):
+    PARALLELISM: ClassVar[str] = "org.openrewrite.python.parser.parallelism"
+    SLOWEST_FILES: ClassVar[str] = "org.openrewrite.python.parser.slowestFiles"
+    """The `ParseTiming` of the slowest source files parsed in a run, slowest first."""
+    SLOWEST_FILES_COUNT: ClassVar[int] = 10
+    DEDUPLICATED: ClassVar[str] = "org.openrewrite.python.parser.deduplicated"
+    """The number of source files whose tree was copied from that of an identical source file of the same run."""
+
     _styles: Optional[Iterable[NamedStyles]]
+    _parallelism: Optional[int] = None
+    _cache: Optional[LstCache] = None
+    _max_seconds: Optional[float] = None
+    _max_size: Optional[int] = None
+    _lazy: bool = False
+    _type_attribution: Optional[TypeAttribution] = None
+    _types: Optional[ProjectTypes] = None
+    _stub_index: Optional[StubIndex] = None
+    _id_generator: Optional[IdGenerator] = None
+    # the types of the trees parsed by this parser, which are not shared with other parsers
+    _type_table: TypeTable = field(default_factory=TypeTable, compare=False, repr=False)
 
     def parse_inputs(self, sources: Iterable[ParserInput], relative_to: Optional[Path],
                      ctx: ExecutionContext) -> Iterable[SourceFile]:
         accepted = (source for source in sources if self.accept(source.path))
+        if self._type_attribution is not None:
+            yield from self.__parse_attributed(list(accepted), relative_to, ctx)
+            return
+        parallelism = self._parallelism if self._parallelism is not None else ctx.get_message(self.PARALLELISM, 1)
+        if parallelism > 1:
+            yield from self.__parse_parallel(accepted, relative_to, ctx, parallelism)
+            return
+        duplicates = _Duplicates(self.__activate)
         for source in accepted:
+            start = time.monotonic()
+            size = 0
             try:
-                source_str = source.source().read()
-                tree = ast.parse(source_str, source.path)
-                cu = ParserVisitor(source_str).visit(tree).with_source_path(source.path)
-                cu = cu.with_markers(Markers.build(random_id(), self._styles)) if self._styles else cu
-                cu = require_print_equals_input(self, cu, source, relative_to, ctx)
+                source_str = source.text(self.get_charset(ctx))
+                size = len(source_str)
+                if self._max_size is not None and size > self._max_size:
+                    raise _BudgetExceeded(ParseBudgetExceeded.Budget.SIZE, self._max_size,
+                                          f"{size} characters exceed the budget of {self._max_size}")
+                fingerprint = self.__fingerprint(source, self.get_charset(ctx), relative_to)
+                cu = duplicates.copy(fingerprint, source.path, ctx)
+                if cu is None:
+                    cu = self.__parse(source, source_str, relative_to, ctx, start)
+                    if isinstance(cu, CompilationUnit):
+                        duplicates.remember(fingerprint, cu)
+            except (_BudgetExceeded, ParseTimeout) as e:
+                logging.error(f"Parsing {source.path} exceeded its budget: {str(e)}")
+                budget, limit = (e.budget, e.limit) if isinstance(e, _BudgetExceeded) else \
+                    (ParseBudgetExceeded.Budget.TIME, self._max_seconds)
+                cu = ParseError.build(self, source, relative_to, ctx, e)
+                cu = cu.with_markers(cu.markers.with_markers(cu.markers.markers + [
+                    ParseBudgetExceeded(random_id(), budget, limit, time.monotonic() - start, size)]))
             except Exception as e:
                 logging.error(f"An error was encountered while parsing {source.path}: {str(e)}", exc_info=True)
                 cu = ParseError.build(self, source, relative_to, ctx, e)
+            _record_timing(ctx, ParseTiming(source.path, size, time.monotonic() - start))
+            source.forget_text()
             yield cu
 
+    def __parse(self, source: ParserInput, source_str: str, relative_to: Optional[Path], ctx: ExecutionContext,
+                start: float) -> SourceFile:
+        with self.__activate():
+            key = self.__cache_key(source, source_str, relative_to, ctx)
+            cu = self.__from_cache(key, source)
+            if cu is None:
+                deadline = start + self._max_seconds if self._max_seconds is not None else None
+                tree = ast.parse(source_str, source.path)
+                _check_deadline(deadline, "parsing with ast")
+                type_mapping = self.__type_mapping(source_str, self.__module(source, relative_to))
+                cu = ParserVisitor(source_str, deadline, self._lazy, type_mapping).visit(tree) \
+                    .with_source_path(source.path)
+                _check_deadline(deadline, "mapping")
+                cu = require_print_equals_input(self, cu, source, relative_to, ctx)
+                _check_deadline(deadline, "the print idempotence check")
+                if key and isinstance(cu, CompilationUnit):
+                    self._cache.put(key, cu)
+            return cu.with_markers(Markers.build(random_id(), self._styles)) if self._styles else cu
+
+    @contextmanager
+    def __activate(self) -> Iterator[None]:
+        """Makes new trees take their types from the type table and their ids from the id generator of this parser."""
+        with self._type_table.activate(), use_id_generator(self._id_generator):
+            yield
+
+    def __parse_attributed(self, sources: List[ParserInput], relative_to: Optional[Path],
+                           ctx: ExecutionContext) -> Iterable[SourceFile]:
+        """Infers the types of all modules of the project up front, before parsing them with these types."""
+        charset = self.get_charset(ctx)
+
+        def readable() -> Iterable[Tuple[Path, str]]:
+            for source in sources:
+                try:
+                    yield source.path, source.text(charset)
+                except Exception:
+                    # left to become a `ParseError` when it is parsed
+                    pass
+
+        try:
+            types: Optional[ProjectTypes] = self._type_attribution.attribute(readable(), relative_to)
+        except BrokenProcessPool as e:
+            logging.error(f"Inferring the types of the project failed, parsing it without them: {str(e)}")
+            types = None
+        yield from replace(self, _type_attribution=None, _types=types).parse_inputs(sources, relative_to, ctx)
+
+    def __type_mapping(self, source_str: str, module: Optional[str]) -> Optional[PythonTypeMapping]:
+        return PythonTypeMapping(source_str, self._types, module, self._stub_index) \
+            if self._types or self._stub_index else None
+
+    def __module(self, source: ParserInput, relative_to: Optional[Path]) -> Optional[str]:
+        """The name of the module of `source` when there are project types, which depend on it."""
+        return module_name(source.path, relative_to) if self._types else None
+
+    def __fingerprint(self, source: ParserInput, charset: Optional[str], relative_to: Optional[Path]) -> bytes:
+        """Identifies the sources that parse to the same tree, which with project types includes their module."""
+        digest = source.digest(charset)
+        module = self.__module(source, relative_to)
+        return digest if module is None else digest + module.encode('utf-8', 'surrogatepass')
+
+    def __cache_key(self, source: ParserInput, source_str: str, relative_to: Optional[Path],
+                    ctx: ExecutionContext) -> Optional[str]:
+        if not self._cache:
+            return None
+        # a tree cached without the print idempotence check must not be served to a run that requires it
+        mode = print_equals_input_mode(ctx)
+        variant = f" {mode.name}"
+        if mode == PrintEqualsInputMode.SAMPLED:
+            variant += f" {ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_SAMPLE_RATE, 10)}"
+        if self._stub_index:
+            variant += f" {self._stub_index.digest}"
+        module = self.__module(source, relative_to)
+        if module is not None:
+            variant += f" {module} {self._types.key(module)}"
+        return self._cache.key(source_str, variant)
+
+    def __from_cache(self, key: Optional[str], source: ParserInput) -> Optional[CompilationUnit]:
+        if not key:
+            return None
+        with self.__activate():
+            cached = self._cache.get(key)
+        return cached.with_source_path(source.path) if cached else None
+
+    def __parse_parallel(self, sources: Iterable[ParserInput], relative_to: Optional[Path], ctx: ExecutionContext,
+                         parallelism: int) -> Iterable[SourceFile]:
+        """
+        Fans the inputs out to a pool of worker processes, yielding the results in input order.
+
+        At most `2 * parallelism` inputs are read and in flight at any time, so memory use does not
+        grow with the number of inputs. Should a worker die, the inputs in flight in its pool become a
+        `ParseError` and the remaining inputs go to a new pool.
+        """
+        # the workers create ids with the generator of the run, so that all ids of its trees are created alike
+        serial = replace(self, _parallelism=1,
+                         _id_generator=self._id_generator if self._id_generator is not None else id_generator())
+        messages = {key: value for key in (ExecutionContext.REQUIRE_PRINT_EQUALS_INPUT, ExecutionContext.CHARSET,
+                                           ExecutionContext.PRINT_EQUALS_INPUT_MODE,
+                                           ExecutionContext.PRINT_EQUALS_INPUT_SAMPLE_RATE)
+                    if (value := ctx.get_message(key)) is not None}
+        charset = self.get_charset(ctx)
+        in_flight: Deque[Callable[[], SourceFile]] = deque()
+        duplicates = _Duplicates(self.__activate)
+
+        def new_executor() -> ProcessPoolExecutor:
+            # the parser and the run are sent to each worker once, rather than with every input
+            return ProcessPoolExecutor(parallelism, initializer=_init_worker, initargs=(serial, relative_to, messages))
+
+        executor = new_executor()
+
+        def submit(source: ParserInput) -> 'Future[Tuple[bytes, bool, int, ParseTiming]]':
+            nonlocal executor
+            try:
+                return executor.submit(_parse_in_worker, source)
+            except BrokenProcessPool:
+                executor.shutdown(wait=False)
+                executor = new_executor()
+                return executor.submit(_parse_in_worker, source)
+
+        def duplicate(fingerprint: bytes, source: ParserInput) -> SourceFile:
+            cu = duplicates.copy(fingerprint, source.path, ctx)
+            # should the original not have parsed, the duplicate is parsed by itself
+            return cu if cu is not None else self.__worker_result(submit(source), source, relative_to, ctx)
+
+        try:
+            for source in sources:
+                try:
+                    content = source.text(charset)
+                    fingerprint = self.__fingerprint(source, charset, relative_to)
+                except Exception as e:
+                    logging.error(f"An error was encountered while parsing {source.path}: {str(e)}", exc_info=True)
+                    in_flight.append(partial(ParseError.build, self, source, relative_to, ctx, e))
+                else:
+                    source.forget_text()
+                    key = self.__cache_key(source, content, relative_to, ctx)
+                    buffered = ParserInput(source.path, source.file_attributes, source.synthetic,
+                                           partial(io.StringIO, content))
+                    if duplicates.contains(fingerprint):
+                        in_flight.append(partial(duplicate, fingerprint, buffered))
+                    elif cached := self.__from_cache(key, source):
+                        cu = cached.with_markers(Markers.build(random_id(), self._styles)) if self._styles else cached
+                        in_flight.append(lambda cu=cu: cu)
+                    else:
+                        future = submit(buffered)
+                        in_flight.append(lambda future=future, source=buffered:
+                                         self.__worker_result(future, source, relative_to, ctx))
+                        duplicates.remember(fingerprint, partial(_parsed_tree, future))
+                if len(in_flight) >= 2 * parallelism:
+                    yield in_flight.popleft()()
+            while in_flight:
+                yield in_flight.popleft()()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __worker_result(self, future: 'Future[Tuple[bytes, bool, int, ParseTiming]]', source: ParserInput,
+                        relative_to: Optional[Path], ctx: ExecutionContext) -> SourceFile:
+        try:
+            data, _, verified, timing = future.result()
+        except BrokenProcessPool as e:
+            logging.error(f"The worker parsing {source.path} terminated abruptly: {str(e)}")
+            return ParseError.build(self, source, relative_to, ctx, e)
+        _record_timing(ctx, timing)
+        if verified:
+            ctx.put_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED,
+                            ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED, 0) + verified)
+        with self.__activate():
+            return _pickling.loads(data)
+
+    def reparse(self, cu: CompilationUnit, source: str, ctx: Optional[ExecutionContext] = None) -> SourceFile:
+        """
+        Parses `source`, an edited version of the text of `cu`, reusing the trees of all top-level
+        statements whose text did not change. Reused statements keep their ids, as does `cu`.
+
+        :param cu: the compilation unit to update
+        :param source: the edited source text
+        :param ctx: the execution context to use should a full parse be necessary
+        """
+        try:
+            module = module_name(cu.source_path, None) if self._types else None
+            with self.__activate():
+                reparsed = _incremental.reparse(cu, source, self.__type_mapping(source, module))
+        except Exception:
+            logging.warning(f"Could not reparse {cu.source_path} incrementally, parsing it in full", exc_info=True)
+            reparsed = None
+        if reparsed is not None:
+            return reparsed
+        source_input = ParserInput(cu.source_path, cu.file_attributes, False, partial(io.StringIO, source))
+        parsed = next(iter(replace(self, _parallelism=1, _cache=None).parse_inputs(
+            [source_input], None, ctx or InMemoryExecutionContext())))
+        return parsed.with_id(cu.id) if isinstance(parsed, CompilationUnit) else parsed
+
     def accept(self, path: Path) -> bool:
         return path.suffix == '.py'
 
@@ -38,15 +293,182 @@ class PythonParser(Parser):
         return prefix / 'source.py'
 
 
+class _BudgetExceeded(Exception):
+    def __init__(self, budget: ParseBudgetExceeded.Budget, limit: float, message: str):
+        super().__init__(message)
+        self.budget = budget
+        self.limit = limit
+
+
+class _Duplicates:
+    """
+    The trees of the distinct sources of a run, keyed by a fingerprint of their text, from which the trees
+    of identical sources are copied with fresh ids rather than parsed again. Only compilation units are
+    remembered, so sources that fail to parse are parsed again.
+
+    Trees are only weakly referenced until a first duplicate turns up, so remembering them does not
+    keep every tree of a run in memory.
+    """
+
+    _trees: Dict[bytes, Union['weakref.ReferenceType[SourceFile]', bytes, Callable[[], Optional[bytes]]]]
+
+    def __init__(self, activate: Callable[[], ContextManager[None]]):
+        self._trees = {}
+        self._activate = activate
+
+    def contains(self, fingerprint: bytes) -> bool:
+        return fingerprint in self._trees
+
+    def remember(self, fingerprint: bytes, tree: Union[SourceFile, Callable[[], Optional[bytes]]]) -> None:
+        """Remembers either a tree or a function producing the pickled tree, or `None` if it did not parse."""
+        self._trees[fingerprint] = weakref.ref(tree) if isinstance(tree, SourceFile) else tree
+
+    def copy(self, fingerprint: bytes, path: Path, ctx: ExecutionContext) -> Optional[SourceFile]:
+        entry = self._trees.get(fingerprint)
+        if entry is None:
+            return None
+        if isinstance(entry, weakref.ReferenceType):
+            tree = entry()
+            if tree is None:
+                del self._trees[fingerprint]
+                return None
+            entry = _pickling.dumps(tree)
+        elif not isinstance(entry, bytes):
+            entry = entry()
+            if entry is None:
+                del self._trees[fingerprint]
+                return None
+        self._trees[fingerprint] = entry
+        ctx.put_message(PythonParser.DEDUPLICATED, ctx.get_message(PythonParser.DEDUPLICATED, 0) + 1)
+        with self._activate():
+            return _pickling.loads(entry, fresh_ids=True).with_source_path(path)
+
+
+def _parsed_tree(future: 'Future[Tuple[bytes, bool, int, ParseTiming]]') -> Optional[bytes]:
+    """The pickled tree that a worker parsed, or `None` if it did not parse a compilation unit."""
+    try:
+        data, parsed, _, _ = future.result()
+    except BrokenProcessPool:
+        return None
+    return data if parsed else None
+
+
+def _check_deadline(deadline: Optional[float], step: str) -> None:
+    """Raises a `ParseTimeout` when `step` of parsing a source completed only after the `deadline`."""
+    if deadline is not None and time.monotonic() > deadline:
+        raise ParseTimeout(f"{step} did not complete before the deadline")
+
+
+def _record_timing(ctx: ExecutionContext, timing: ParseTiming) -> None:
+    slowest = ctx.get_message(PythonParser.SLOWEST_FILES)
+    if slowest is None:
+        slowest = []
+        ctx.put_message(PythonParser.SLOWEST_FILES, slowest)
+    if len(slowest) < PythonParser.SLOWEST_FILES_COUNT or timing.seconds > slowest[-1].seconds:
+        slowest.append(timing)
+        slowest.sort(key=lambda t: t.seconds, reverse=True)
+        del slowest[PythonParser.SLOWEST_FILES_COUNT:]
+
+
+_worker_run: Optional[Tuple[PythonParser, Optional[Path], Dict[str, Any]]] = None
+
+
+def _init_worker(parser: PythonParser, relative_to: Optional[Path], messages: Dict[str, Any]) -> None:
+    global _worker_run
+    _worker_run = parser, relative_to, messages
+
+
+def _parse_in_worker(source: ParserInput) -> Tuple[bytes, bool, int, ParseTiming]:
+    parser, relative_to, messages = _worker_run
+    ctx = InMemoryExecutionContext()
+    for key, value in messages.items():
+        ctx.put_message(key, value)
+    verified = ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED, 0)
+    start = time.monotonic()
+    parsed = next(iter(parser.parse_inputs([source], relative_to, ctx)))
+    timing = ParseTiming(source.path, len(source.text()), time.monotonic() - start)
+    verified = ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED, 0) - verified
+    return _pickling.dumps(parsed), isinstance(parsed, CompilationUnit), verified, timing
+
+
 class PythonParserBuilder(ParserBuilder):
     def __init__(self):
         super().__init__(CompilationUnit)
         self._dsl_name = 'python'
         self._styles = None
+        self._parallelism = None
+        self._cache = None
+        self._max_seconds = None
+        self._max_size = None
+        self._lazy = False
+        self._type_attribution = None
+        self._stub_index = None
+        self._id_generator = None
 
     def styles(self, *styles: NamedStyles):
         self._styles = styles
         return self
 
+    def parallelism(self, parallelism: int):
+        """
+        Parse inputs in `parallelism` worker processes. Results are still produced in input order.
+        When not set, the `PythonParser.PARALLELISM` message of the `ExecutionContext` is used.
+        """
+        self._parallelism = parallelism
+        return self
+
+    def cache(self, directory: Path, max_size: int = 1 << 30):
+        """
+        Reuse the trees of previously parsed, unchanged sources from a cache in `directory`, which
+        may be shared by concurrent runs. Least recently used entries are evicted once the cache
+        exceeds `max_size` bytes.
+        """
+        self._cache = LstCache(directory, max_size)
+        return self
+
+    def budget(self, max_seconds: Optional[float] = None, max_size: Optional[int] = None):
+        """
+        Give up on source files that take longer than `max_seconds` to parse or that are longer than
+        `max_size` characters. Such files become a `ParseError` with a `ParseBudgetExceeded` marker.
+        """
+        self._max_seconds = max_seconds
+        self._max_size = max_size
+        return self
+
+    def lazy(self, lazy: bool = True):
+        """
+        Map the bodies of functions and classes only once a visitor descends into them or the tree is printed,
+        which saves time and memory for analyses that only look at imports, decorators and signatures. As the
+        print idempotence check prints the whole tree, this pays off with `PrintEqualsInputMode.OFF` or
+        `PrintEqualsInputMode.SAMPLED`.
+        """
+        self._lazy = lazy
+        return self
+
+    def type_attribution(self, directory: Path, parallelism: int = 1):
+        """
+        Before parsing, infer the types of all inputs with pytype, treating them as the modules of one project,
+        and attach these types to the trees. The inferred stubs are cached in `directory`.
+        """
+        self._type_attribution = TypeAttribution(directory, parallelism)
+        return self
+
+    def stub_index(self, path: Path):
+        """
+        Attach the types of the classes and functions of imported libraries from the stub index at `path`, as
+        built with `python -m rewrite.python._build_stub_index`. The index is memory-mapped and shared by all inputs.
+        """
+        self._stub_index = StubIndex(path)
+        return self
+
+    def id_generator(self, generator: IdGenerator):
+        """
+        Create the ids of the trees and markers of the parsed inputs with `generator`, such as a
+        `SequentialIdGenerator`, rather than with the generator `random_id` uses when parsing starts.
+        """
+        self._id_generator = generator
+        return self
+
     def build(self) -> Parser:
-        return PythonParser(self._styles)
+        return PythonParser(self._styles, self._parallelism, self._cache, self._max_seconds, self._max_size,
+                            self._lazy, self._type_attribution, None, self._stub_index, self._id_generator)
@@ -56,7 +56,7 @@ def receive_space(space: Optional[Space], _: Optional[str], ctx: ReceiverContext
         space = space.with_comments(ctx.receive_nodes(space.comments, receive_comment))
         space = space.with_whitespace(ctx.receive_value(space.whitespace, str))
     else:
-        space = Space(
+        space = Space.build(
             ctx.receive_nodes(None, receive_comment),
             ctx.receive_value(None, str)
         )
@@ -445,7 +445,7 @@ class PythonSender(Sender):
             ctx.send_node(class_declaration, attrgetter('_extends'), PythonSender.send_left_padded)
             ctx.send_node(class_declaration, attrgetter('_implements'), PythonSender.send_container)
             ctx.send_node(class_declaration, attrgetter('_permits'), PythonSender.send_container)
-            ctx.send_node(class_declaration, attrgetter('_body'), ctx.send_tree)
+            ctx.send_node(class_declaration, attrgetter('body'), ctx.send_tree)
             ctx.send_typed_value(class_declaration, attrgetter('_type'))
             return class_declaration
 
@@ -665,7 +665,7 @@ class PythonSender(Sender):
             ctx.send_node(method_declaration, attrgetter('_name'), self.send_method_identifier_with_annotations)
             ctx.send_node(method_declaration, attrgetter('_parameters'), PythonSender.send_container)
             ctx.send_node(method_declaration, attrgetter('_throws'), PythonSender.send_container)
-            ctx.send_node(method_declaration, attrgetter('_body'), ctx.send_tree)
+            ctx.send_node(method_declaration, attrgetter('body'), ctx.send_tree)
             ctx.send_node(method_declaration, attrgetter('_default_value'), PythonSender.send_left_padded)
             ctx.send_typed_value(method_declaration, attrgetter('_method_type'))
             return method_declaration
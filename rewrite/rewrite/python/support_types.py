@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import replace, dataclass
+from dataclasses import dataclass
 from enum import Enum, auto
 from typing import TypeVar, Any, Optional, TYPE_CHECKING
 
 from rewrite import TreeVisitor, Markers
+from rewrite.utils import replace
 from rewrite.java.tree import J
 from ..java import Comment
 
@@ -15,6 +16,8 @@ P = TypeVar('P')
 
 
 class Py(J):
+    __slots__ = ()
+
     def accept(self, v: TreeVisitor[Any, P], p: P) -> Optional[Any]:
         from .visitor import PythonVisitor
         return self.accept_python(v.adapt(Py, PythonVisitor), p)
@@ -168,6 +171,8 @@ class PyContainer:
 
 @dataclass(frozen=True)
 class PyComment(Comment):
+    __slots__ = ('_aligned_to_indent',)
+
     _aligned_to_indent: bool
 
     @property
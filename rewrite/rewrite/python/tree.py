@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import weakref
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, replace
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, TYPE_CHECKING
 from uuid import UUID
@@ -13,11 +12,14 @@ if TYPE_CHECKING:
 from . import extensions
 from .support_types import *
 from rewrite import Checksum, FileAttributes, SourceFile, Tree, TreeVisitor, Markers, Cursor, PrintOutputCapture, PrinterFactory
+from rewrite.utils import replace
 from rewrite.java import *
 
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Async(Py, Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_statement')
+
     _id: UUID
 
     @property
@@ -60,6 +62,8 @@ class Async(Py, Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Await(Py, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_expression', '_type')
+
     _id: UUID
 
     @property
@@ -111,6 +115,8 @@ class Await(Py, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Binary(Py, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_left', '_operator', '_negation', '_right', '_type')
+
     _id: UUID
 
     @property
@@ -195,6 +201,8 @@ class Binary(Py, Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Binary
 
         @property
@@ -204,21 +212,9 @@ class Binary(Py, Expression, TypedTree):
         def with_operator(self, operator: JLeftPadded[Binary.Type]) -> Binary:
             return self._t if self._t._operator is operator else replace(self._t, _operator=operator)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Binary.PaddingHelper
-        if self._padding is None:
-            p = Binary.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Binary.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Binary.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_python_binary(self, p)
@@ -226,6 +222,8 @@ class Binary(Py, Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ChainedAssignment(Py, Statement, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_variables', '_assignment', '_type')
+
     _id: UUID
 
     @property
@@ -282,6 +280,8 @@ class ChainedAssignment(Py, Statement, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: ChainedAssignment
 
         @property
@@ -291,21 +291,9 @@ class ChainedAssignment(Py, Statement, TypedTree):
         def with_variables(self, variables: List[JRightPadded[Expression]]) -> ChainedAssignment:
             return self._t if self._t._variables is variables else replace(self._t, _variables=variables)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: ChainedAssignment.PaddingHelper
-        if self._padding is None:
-            p = ChainedAssignment.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = ChainedAssignment.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return ChainedAssignment.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_chained_assignment(self, p)
@@ -313,6 +301,8 @@ class ChainedAssignment(Py, Statement, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ExceptionType(Py, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_type', '_exception_group', '_expression')
+
     _id: UUID
 
     @property
@@ -373,6 +363,8 @@ class ExceptionType(Py, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ForLoop(Py, Loop):
+    __slots__ = ('_id', '_prefix', '_markers', '_target', '_iterable', '_body')
+
     _id: UUID
 
     @property
@@ -429,6 +421,8 @@ class ForLoop(Py, Loop):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: ForLoop
 
         @property
@@ -445,21 +439,9 @@ class ForLoop(Py, Loop):
         def with_body(self, body: JRightPadded[Statement]) -> ForLoop:
             return self._t if self._t._body is body else replace(self._t, _body=body)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: ForLoop.PaddingHelper
-        if self._padding is None:
-            p = ForLoop.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = ForLoop.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return ForLoop.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_python_for_loop(self, p)
@@ -467,6 +449,8 @@ class ForLoop(Py, Loop):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class LiteralType(Py, Expression, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_literal', '_type')
+
     _id: UUID
 
     @property
@@ -518,6 +502,8 @@ class LiteralType(Py, Expression, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class TypeHint(Py, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_type_tree', '_type')
+
     _id: UUID
 
     @property
@@ -569,6 +555,11 @@ class TypeHint(Py, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class CompilationUnit(Py, JavaSourceFile, SourceFile):
+    __slots__ = (
+        '_id', '_prefix', '_markers', '_source_path', '_file_attributes', '_charset_name', '_charset_bom_marked',
+        '_checksum', '_imports', '_statements', '_eof'
+    )
+
     _id: UUID
 
     @property
@@ -670,6 +661,8 @@ class CompilationUnit(Py, JavaSourceFile, SourceFile):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: CompilationUnit
 
         @property
@@ -686,21 +679,9 @@ class CompilationUnit(Py, JavaSourceFile, SourceFile):
         def with_statements(self, statements: List[JRightPadded[Statement]]) -> CompilationUnit:
             return self._t if self._t._statements is statements else replace(self._t, _statements=statements)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: CompilationUnit.PaddingHelper
-        if self._padding is None:
-            p = CompilationUnit.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = CompilationUnit.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return CompilationUnit.PaddingHelper(self)
 
     def printer(self, cursor: Cursor) -> TreeVisitor[Tree, PrintOutputCapture[P]]:
         if factory := PrinterFactory.current():
@@ -714,6 +695,8 @@ class CompilationUnit(Py, JavaSourceFile, SourceFile):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ExpressionStatement(Py, Expression, Statement):
+    __slots__ = ('_id', '_expression')
+
     _id: UUID
 
     @property
@@ -752,6 +735,8 @@ class ExpressionStatement(Py, Expression, Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ExpressionTypeTree(Py, Expression, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_reference')
+
     _id: UUID
 
     @property
@@ -794,6 +779,8 @@ class ExpressionTypeTree(Py, Expression, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class StatementExpression(Py, Expression, Statement):
+    __slots__ = ('_id', '_statement')
+
     _id: UUID
 
     @property
@@ -832,6 +819,8 @@ class StatementExpression(Py, Expression, Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class MultiImport(Py, Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_from', '_parenthesized', '_names')
+
     _id: UUID
 
     @property
@@ -888,6 +877,8 @@ class MultiImport(Py, Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: MultiImport
 
         @property
@@ -904,21 +895,9 @@ class MultiImport(Py, Statement):
         def with_names(self, names: JContainer[Import]) -> MultiImport:
             return self._t if self._t._names is names else replace(self._t, _names=names)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: MultiImport.PaddingHelper
-        if self._padding is None:
-            p = MultiImport.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = MultiImport.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return MultiImport.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_multi_import(self, p)
@@ -926,6 +905,8 @@ class MultiImport(Py, Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class KeyValue(Py, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_key', '_value', '_type')
+
     _id: UUID
 
     @property
@@ -982,6 +963,8 @@ class KeyValue(Py, Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: KeyValue
 
         @property
@@ -991,21 +974,9 @@ class KeyValue(Py, Expression, TypedTree):
         def with_key(self, key: JRightPadded[Expression]) -> KeyValue:
             return self._t if self._t._key is key else replace(self._t, _key=key)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: KeyValue.PaddingHelper
-        if self._padding is None:
-            p = KeyValue.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = KeyValue.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return KeyValue.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_key_value(self, p)
@@ -1013,6 +984,8 @@ class KeyValue(Py, Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class DictLiteral(Py, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_elements', '_type')
+
     _id: UUID
 
     @property
@@ -1060,6 +1033,8 @@ class DictLiteral(Py, Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: DictLiteral
 
         @property
@@ -1069,21 +1044,9 @@ class DictLiteral(Py, Expression, TypedTree):
         def with_elements(self, elements: JContainer[Expression]) -> DictLiteral:
             return self._t if self._t._elements is elements else replace(self._t, _elements=elements)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: DictLiteral.PaddingHelper
-        if self._padding is None:
-            p = DictLiteral.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = DictLiteral.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return DictLiteral.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_dict_literal(self, p)
@@ -1091,6 +1054,8 @@ class DictLiteral(Py, Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class CollectionLiteral(Py, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_kind', '_elements', '_type')
+
     class Kind(Enum):
         LIST = 0
         SET = 1
@@ -1152,6 +1117,8 @@ class CollectionLiteral(Py, Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: CollectionLiteral
 
         @property
@@ -1161,21 +1128,9 @@ class CollectionLiteral(Py, Expression, TypedTree):
         def with_elements(self, elements: JContainer[Expression]) -> CollectionLiteral:
             return self._t if self._t._elements is elements else replace(self._t, _elements=elements)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: CollectionLiteral.PaddingHelper
-        if self._padding is None:
-            p = CollectionLiteral.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = CollectionLiteral.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return CollectionLiteral.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_collection_literal(self, p)
@@ -1183,6 +1138,8 @@ class CollectionLiteral(Py, Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class FormattedString(Py, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_delimiter', '_parts')
+
     _id: UUID
 
     @property
@@ -1231,6 +1188,8 @@ class FormattedString(Py, Expression, TypedTree):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Value(Py, Expression, TypedTree):
+        __slots__ = ('_id', '_prefix', '_markers', '_expression', '_debug', '_conversion', '_format')
+
         class Conversion(Enum):
             STR = 0
             REPR = 1
@@ -1301,6 +1260,8 @@ class FormattedString(Py, Expression, TypedTree):
 
         @dataclass
         class PaddingHelper:
+            __slots__ = ('_t',)
+
             _t: FormattedString.Value
 
             @property
@@ -1317,21 +1278,9 @@ class FormattedString(Py, Expression, TypedTree):
             def with_debug(self, debug: Optional[JRightPadded[bool]]) -> FormattedString.Value:
                 return self._t if self._t._debug is debug else replace(self._t, _debug=debug)
 
-        _padding: weakref.ReferenceType[PaddingHelper] = None
-
         @property
         def padding(self) -> PaddingHelper:
-            p: FormattedString.Value.PaddingHelper
-            if self._padding is None:
-                p = FormattedString.Value.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-            else:
-                p = self._padding()
-                # noinspection PyProtectedMember
-                if p is None or p._t != self:
-                    p = FormattedString.Value.PaddingHelper(self)
-                    object.__setattr__(self, '_padding', weakref.ref(p))
-            return p
+            return FormattedString.Value.PaddingHelper(self)
 
         def accept_python(self, v: PythonVisitor[P], p: P) -> J:
             return v.visit_formatted_string_value(self, p)
@@ -1342,6 +1291,8 @@ class FormattedString(Py, Expression, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Pass(Py, Statement):
+    __slots__ = ('_id', '_prefix', '_markers')
+
     _id: UUID
 
     @property
@@ -1375,6 +1326,8 @@ class Pass(Py, Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class TrailingElseWrapper(Py, Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_statement', '_else_block')
+
     _id: UUID
 
     @property
@@ -1422,6 +1375,8 @@ class TrailingElseWrapper(Py, Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: TrailingElseWrapper
 
         @property
@@ -1431,21 +1386,9 @@ class TrailingElseWrapper(Py, Statement):
         def with_else_block(self, else_block: JLeftPadded[Block]) -> TrailingElseWrapper:
             return self._t if self._t._else_block is else_block else replace(self._t, _else_block=else_block)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: TrailingElseWrapper.PaddingHelper
-        if self._padding is None:
-            p = TrailingElseWrapper.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = TrailingElseWrapper.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return TrailingElseWrapper.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_trailing_else_wrapper(self, p)
@@ -1453,6 +1396,8 @@ class TrailingElseWrapper(Py, Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ComprehensionExpression(Py, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_kind', '_result', '_clauses', '_suffix', '_type')
+
     class Kind(Enum):
         LIST = 0
         SET = 1
@@ -1534,6 +1479,8 @@ class ComprehensionExpression(Py, Expression):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Condition(Py):
+        __slots__ = ('_id', '_prefix', '_markers', '_expression')
+
         _id: UUID
 
         @property
@@ -1576,6 +1523,8 @@ class ComprehensionExpression(Py, Expression):
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Clause(Py):
+        __slots__ = ('_id', '_prefix', '_markers', '_async', '_iterator_variable', '_iterated_list', '_conditions')
+
         _id: UUID
 
         @property
@@ -1641,6 +1590,8 @@ class ComprehensionExpression(Py, Expression):
 
         @dataclass
         class PaddingHelper:
+            __slots__ = ('_t',)
+
             _t: ComprehensionExpression.Clause
 
             @property
@@ -1657,21 +1608,9 @@ class ComprehensionExpression(Py, Expression):
             def with_iterated_list(self, iterated_list: JLeftPadded[Expression]) -> ComprehensionExpression.Clause:
                 return self._t if self._t._iterated_list is iterated_list else replace(self._t, _iterated_list=iterated_list)
 
-        _padding: weakref.ReferenceType[PaddingHelper] = None
-
         @property
         def padding(self) -> PaddingHelper:
-            p: ComprehensionExpression.Clause.PaddingHelper
-            if self._padding is None:
-                p = ComprehensionExpression.Clause.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-            else:
-                p = self._padding()
-                # noinspection PyProtectedMember
-                if p is None or p._t != self:
-                    p = ComprehensionExpression.Clause.PaddingHelper(self)
-                    object.__setattr__(self, '_padding', weakref.ref(p))
-            return p
+            return ComprehensionExpression.Clause.PaddingHelper(self)
 
         def accept_python(self, v: PythonVisitor[P], p: P) -> J:
             return v.visit_comprehension_clause(self, p)
@@ -1682,6 +1621,8 @@ class ComprehensionExpression(Py, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class TypeAlias(Py, Statement, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_name', '_value', '_type')
+
     _id: UUID
 
     @property
@@ -1738,6 +1679,8 @@ class TypeAlias(Py, Statement, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: TypeAlias
 
         @property
@@ -1747,21 +1690,9 @@ class TypeAlias(Py, Statement, TypedTree):
         def with_value(self, value: JLeftPadded[J]) -> TypeAlias:
             return self._t if self._t._value is value else replace(self._t, _value=value)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: TypeAlias.PaddingHelper
-        if self._padding is None:
-            p = TypeAlias.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = TypeAlias.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return TypeAlias.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_type_alias(self, p)
@@ -1769,6 +1700,8 @@ class TypeAlias(Py, Statement, TypedTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class YieldFrom(Py, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_expression', '_type')
+
     _id: UUID
 
     @property
@@ -1820,6 +1753,8 @@ class YieldFrom(Py, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class UnionType(Py, Expression, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_types', '_type')
+
     _id: UUID
 
     @property
@@ -1867,6 +1802,8 @@ class UnionType(Py, Expression, TypeTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: UnionType
 
         @property
@@ -1876,21 +1813,9 @@ class UnionType(Py, Expression, TypeTree):
         def with_types(self, types: List[JRightPadded[Expression]]) -> UnionType:
             return self._t if self._t._types is types else replace(self._t, _types=types)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: UnionType.PaddingHelper
-        if self._padding is None:
-            p = UnionType.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = UnionType.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return UnionType.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_union_type(self, p)
@@ -1898,6 +1823,8 @@ class UnionType(Py, Expression, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class VariableScope(Py, Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_kind', '_names')
+
     class Kind(Enum):
         GLOBAL = 0
         NONLOCAL = 1
@@ -1949,6 +1876,8 @@ class VariableScope(Py, Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: VariableScope
 
         @property
@@ -1958,21 +1887,9 @@ class VariableScope(Py, Statement):
         def with_names(self, names: List[JRightPadded[Identifier]]) -> VariableScope:
             return self._t if self._t._names is names else replace(self._t, _names=names)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: VariableScope.PaddingHelper
-        if self._padding is None:
-            p = VariableScope.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = VariableScope.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return VariableScope.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_variable_scope(self, p)
@@ -1980,6 +1897,8 @@ class VariableScope(Py, Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Del(Py, Statement):
+    __slots__ = ('_id', '_prefix', '_markers', '_targets')
+
     _id: UUID
 
     @property
@@ -2018,6 +1937,8 @@ class Del(Py, Statement):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Del
 
         @property
@@ -2027,21 +1948,9 @@ class Del(Py, Statement):
         def with_targets(self, targets: List[JRightPadded[Expression]]) -> Del:
             return self._t if self._t._targets is targets else replace(self._t, _targets=targets)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Del.PaddingHelper
-        if self._padding is None:
-            p = Del.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Del.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Del.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_del(self, p)
@@ -2049,6 +1958,8 @@ class Del(Py, Statement):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class SpecialParameter(Py, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_kind', '_type_hint', '_type')
+
     class Kind(Enum):
         KWARGS = 0
         ARGS = 1
@@ -2113,6 +2024,8 @@ class SpecialParameter(Py, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Star(Py, Expression, TypeTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_kind', '_expression', '_type')
+
     class Kind(Enum):
         LIST = 0
         DICT = 1
@@ -2177,6 +2090,8 @@ class Star(Py, Expression, TypeTree):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class NamedArgument(Py, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_name', '_value', '_type')
+
     _id: UUID
 
     @property
@@ -2233,6 +2148,8 @@ class NamedArgument(Py, Expression):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: NamedArgument
 
         @property
@@ -2242,21 +2159,9 @@ class NamedArgument(Py, Expression):
         def with_value(self, value: JLeftPadded[Expression]) -> NamedArgument:
             return self._t if self._t._value is value else replace(self._t, _value=value)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: NamedArgument.PaddingHelper
-        if self._padding is None:
-            p = NamedArgument.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = NamedArgument.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return NamedArgument.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_named_argument(self, p)
@@ -2264,6 +2169,8 @@ class NamedArgument(Py, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class TypeHintedExpression(Py, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_expression', '_type_hint', '_type')
+
     _id: UUID
 
     @property
@@ -2324,6 +2231,8 @@ class TypeHintedExpression(Py, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class ErrorFrom(Py, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_error', '_from', '_type')
+
     _id: UUID
 
     @property
@@ -2380,6 +2289,8 @@ class ErrorFrom(Py, Expression):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: ErrorFrom
 
         @property
@@ -2389,21 +2300,9 @@ class ErrorFrom(Py, Expression):
         def with_from(self, from_: JLeftPadded[Expression]) -> ErrorFrom:
             return self._t if self._t._from is from_ else replace(self._t, _from=from_)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: ErrorFrom.PaddingHelper
-        if self._padding is None:
-            p = ErrorFrom.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = ErrorFrom.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return ErrorFrom.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_error_from(self, p)
@@ -2411,6 +2310,8 @@ class ErrorFrom(Py, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class MatchCase(Py, Expression):
+    __slots__ = ('_id', '_prefix', '_markers', '_pattern', '_guard', '_type')
+
     _id: UUID
 
     @property
@@ -2467,6 +2368,8 @@ class MatchCase(Py, Expression):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: MatchCase
 
         @property
@@ -2476,25 +2379,15 @@ class MatchCase(Py, Expression):
         def with_guard(self, guard: Optional[JLeftPadded[Expression]]) -> MatchCase:
             return self._t if self._t._guard is guard else replace(self._t, _guard=guard)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: MatchCase.PaddingHelper
-        if self._padding is None:
-            p = MatchCase.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = MatchCase.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return MatchCase.PaddingHelper(self)
 
     # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
     @dataclass(frozen=True, eq=False)
     class Pattern(Py, Expression):
+        __slots__ = ('_id', '_prefix', '_markers', '_kind', '_children', '_type')
+
         class Kind(Enum):
             AS = 0
             CAPTURE = 1
@@ -2569,6 +2462,8 @@ class MatchCase(Py, Expression):
 
         @dataclass
         class PaddingHelper:
+            __slots__ = ('_t',)
+
             _t: MatchCase.Pattern
 
             @property
@@ -2578,21 +2473,9 @@ class MatchCase(Py, Expression):
             def with_children(self, children: JContainer[Expression]) -> MatchCase.Pattern:
                 return self._t if self._t._children is children else replace(self._t, _children=children)
 
-        _padding: weakref.ReferenceType[PaddingHelper] = None
-
         @property
         def padding(self) -> PaddingHelper:
-            p: MatchCase.Pattern.PaddingHelper
-            if self._padding is None:
-                p = MatchCase.Pattern.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-            else:
-                p = self._padding()
-                # noinspection PyProtectedMember
-                if p is None or p._t != self:
-                    p = MatchCase.Pattern.PaddingHelper(self)
-                    object.__setattr__(self, '_padding', weakref.ref(p))
-            return p
+            return MatchCase.Pattern.PaddingHelper(self)
 
         def accept_python(self, v: PythonVisitor[P], p: P) -> J:
             return v.visit_match_case_pattern(self, p)
@@ -2603,6 +2486,8 @@ class MatchCase(Py, Expression):
 # noinspection PyShadowingBuiltins,PyShadowingNames,DuplicatedCode
 @dataclass(frozen=True, eq=False)
 class Slice(Py, Expression, TypedTree):
+    __slots__ = ('_id', '_prefix', '_markers', '_start', '_stop', '_step')
+
     _id: UUID
 
     @property
@@ -2659,6 +2544,8 @@ class Slice(Py, Expression, TypedTree):
 
     @dataclass
     class PaddingHelper:
+        __slots__ = ('_t',)
+
         _t: Slice
 
         @property
@@ -2682,21 +2569,9 @@ class Slice(Py, Expression, TypedTree):
         def with_step(self, step: Optional[JRightPadded[Expression]]) -> Slice:
             return self._t if self._t._step is step else replace(self._t, _step=step)
 
-    _padding: weakref.ReferenceType[PaddingHelper] = None
-
     @property
     def padding(self) -> PaddingHelper:
-        p: Slice.PaddingHelper
-        if self._padding is None:
-            p = Slice.PaddingHelper(self)
-            object.__setattr__(self, '_padding', weakref.ref(p))
-        else:
-            p = self._padding()
-            # noinspection PyProtectedMember
-            if p is None or p._t != self:
-                p = Slice.PaddingHelper(self)
-                object.__setattr__(self, '_padding', weakref.ref(p))
-        return p
+        return Slice.PaddingHelper(self)
 
     def accept_python(self, v: PythonVisitor[P], p: P) -> J:
         return v.visit_slice(self, p)
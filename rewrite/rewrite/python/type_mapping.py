@@ -1,107 +1,172 @@
 import ast
-from typing import Optional
+from contextlib import AbstractContextManager
+from typing import Optional, Dict, Tuple, Union
 
-from pytype import config
-from pytype.pytd.pytd import CallableType, GenericType, ClassType, UnionType, NothingType, TypeParameter
-from pytype.tools.annotate_ast.annotate_ast import AnnotateAstVisitor, PytypeError, infer_types
+from ._stub_index import StubIndex
+from ._type_attribution import ProjectTypes
+from ._type_inference import LocalTypes, Scope, literal_type
+from ..java import JavaType, TypeTable
 
-from ..java import JavaType
+_BUILTIN_TYPES = {
+    'str': JavaType.Primitive.String,
+    'bool': JavaType.Primitive.Boolean,
+    'int': JavaType.Primitive.Int,
+    'float': JavaType.Primitive.Double,
+    'None': JavaType.Primitive.None_,
+}
 
 
 class PythonTypeMapping:
     __enabled = False
-    __cache: dict[str, JavaType] = {}
 
-    def __init__(self, source: str):
-        pytype_options = config.Options.create(python_version='3.12', check=False, precise_return=True,
-                                               output_debug=False)
-        try:
-            self._source_with_types = infer_types(source, pytype_options) if self.__enabled else None
-        except PytypeError:
-            self._source_with_types = None
+    def __init__(self, source: str, types: Optional[ProjectTypes] = None, module: Optional[str] = None,
+                 index: Optional[StubIndex] = None):
+        """
+        :param source: the source text of the module
+        :param types: the inferred stubs of the project the module belongs to, from which calls and references
+            to the functions and classes of the project are typed
+        :param module: the name of the module within the project
+        :param index: the stub index from which the classes and functions of imported modules are typed
+        """
+        self._types = types
+        self._module = module
+        self._bindings: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._local = LocalTypes(module, index, types is not None and module is not None and types.is_package(module))
+        self._source_with_types = _pytype().infer_types(source) if self.__enabled else None
 
     def resolve_types(self, node):
         if self._source_with_types:
-            type_visitor = MyAnnotateAstVisitor(self._source_with_types, ast)
-            type_visitor.visit(node)
+            _pytype().resolve_types(self._source_with_types, node)
+        if isinstance(node, ast.Module):
+            self._local.declare_module(node)
+            if self._types is not None:
+                self.__bind_names(node)
+
+    def scope(self, node: Union[ast.AST, Scope]) -> AbstractContextManager:
+        """Enters the scope of a function, class, lambda or comprehension while mapping it."""
+        return self._local.enter(node)
+
+    @property
+    def current_scope(self) -> Scope:
+        return self._local.scope
+
+    def enter_statement(self, node: ast.stmt) -> None:
+        self._local.enter_statement(node)
+
+    def exit_statement(self, node: ast.stmt) -> None:
+        self._local.exit_statement(node)
 
     def type(self, node) -> Optional[JavaType]:
-        if hasattr(node, 'resolved_annotation') and (result := self.__cache.get(node.resolved_annotation)):
+        if hasattr(node, 'resolved_annotation') and (result := TypeTable.current().get(node.resolved_annotation)):
             return result
         if isinstance(node, ast.Constant):
-            if isinstance(node.value, str):
-                return JavaType.Primitive.String
-            elif isinstance(node.value, bool):
-                return JavaType.Primitive.Boolean
-            elif isinstance(node.value, int):
-                return JavaType.Primitive.Int
-            elif isinstance(node.value, float):
-                return JavaType.Primitive.Double
-            else:
-                return JavaType.Primitive.None_
+            return literal_type(node.value)
         elif isinstance(node, ast.Call):
             return self.method_invocation_type(node)
         elif self.__enabled and hasattr(node, 'resolved_type'):
-            return self.__map_type(node.resolved_type, node)
-        return None
+            return _pytype().map_type(node.resolved_type, node)
+        elif self._bindings and isinstance(node, ast.Name) and node.id in self._bindings and \
+                not self._local.binds_locally(node) and \
+                (result := self.__symbol_type(*self._bindings[node.id])) is not None:
+            return result
+        return self._local.type(node)
 
     def method_invocation_type(self, node) -> Optional[JavaType.Method]:
-        return self.__map_type(node.func.resolved_type, node) if self.__enabled else None
-
-    def __map_type(self, type, node):
-        signature = get_type_string(type)
-        result = self.__cache.get(signature)
-        if result:
+        if self.__enabled:
+            return _pytype().map_type(getattr(node.func, 'resolved_type', None), node)
+        if self._bindings and (result := self.__project_method_type(node.func)) is not None:
             return result
+        return self._local.method_invocation_type(node)
+
+    def __bind_names(self, node: ast.Module) -> None:
+        """Binds the names of the module to the project modules and the definitions in their stubs they refer to."""
+        if self._module in self._types:
+            self._bindings.update((name, (self._module, name)) for name in self._types.symbols(self._module))
+        for stmt in node.body:
+            if isinstance(stmt, ast.Import):
+                for alias in stmt.names:
+                    if alias.name in self._types:
+                        self._bindings[alias.asname or alias.name] = (alias.name, None)
+            elif isinstance(stmt, ast.ImportFrom):
+                if stmt.level:
+                    package = self._module.split('.') if self._types.is_package(self._module) else \
+                        self._module.split('.')[:-1]
+                    package = package[:len(package) - stmt.level + 1] + ([stmt.module] if stmt.module else [])
+                    module = '.'.join(package)
+                else:
+                    module = stmt.module
+                for alias in stmt.names:
+                    if f"{module}.{alias.name}" in self._types:
+                        self._bindings[alias.asname or alias.name] = (f"{module}.{alias.name}", None)
+                    elif module in self._types:
+                        self._bindings[alias.asname or alias.name] = (module, alias.name)
+
+    def __project_method_type(self, func: ast.expr) -> Optional[JavaType.Method]:
+        if isinstance(func, ast.Name) and not self._local.binds_locally(func):
+            binding = self._bindings.get(func.id)
+        elif isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and \
+                not self._local.binds_locally(func.value) and \
+                (module := self._bindings.get(func.value.id)) and module[1] is None:
+            binding = (module[0], func.attr)
+        else:
+            binding = None
+        if binding is None or binding[1] is None:
+            return None
+        module, name = binding
+        symbol = self._types.symbols(module).get(name)
+        if isinstance(symbol, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return self.__function_type(symbol, module)
+        elif isinstance(symbol, ast.ClassDef):
+            return TypeTable.current().method(self._types.class_type(f"{module}.{name}"), name,
+                                              self._types.class_type(f"{module}.{name}"))
+        return None
+
+    def __function_type(self, function: ast.FunctionDef, module: str) -> JavaType.Method:
+        arguments = function.args
+        return TypeTable.current().method(
+            self._types.class_type(module),
+            function.name,
+            self.__annotation_type(function.returns, module),
+            [a.arg for a in arguments.posonlyargs + arguments.args + arguments.kwonlyargs]
+        )
+
+    def __symbol_type(self, module: str, name: Optional[str]) -> Optional[JavaType]:
+        if name is None:
+            return None
+        symbol = self._types.symbols(module).get(name)
+        if isinstance(symbol, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            return self.__function_type(symbol, module)
+        elif isinstance(symbol, ast.ClassDef):
+            return self._types.class_type(f"{module}.{name}")
+        elif isinstance(symbol, ast.AnnAssign):
+            return self.__annotation_type(symbol.annotation, module)
+        return None
+
+    def __annotation_type(self, annotation: Optional[ast.expr], module: str) -> Optional[JavaType]:
+        if annotation is None:
+            return None
+        if isinstance(annotation, ast.Constant) and annotation.value is None:
+            return JavaType.Primitive.None_
+        if isinstance(annotation, ast.Subscript):
+            annotation = annotation.value
+        if isinstance(annotation, ast.Name):
+            if annotation.id in _BUILTIN_TYPES:
+                return _BUILTIN_TYPES[annotation.id]
+            if isinstance(self._types.symbols(module).get(annotation.id), ast.ClassDef):
+                return self._types.class_type(f"{module}.{annotation.id}")
+            return self._types.class_type(self._types.qualify(module, annotation.id))
+        if isinstance(annotation, ast.Attribute):
+            return self._types.class_type(self._types.qualify(module, ast.unparse(annotation)))
+        return None
+
+
+def _pytype():
+    # pytype takes a long time to import and is only needed when it is enabled
+    from . import _pytype_mapping
+    return _pytype_mapping
+
 
-        if isinstance(type, ClassType):
-            self.__cache[signature] = (result := JavaType.Class())
-            result._kind = JavaType.FullyQualified.Kind.Class
-            result._fully_qualified_name = type.name
-            result._interfaces = [self.__map_type(i, node) for i in type.cls.bases]
-        elif isinstance(type, CallableType):
-            if isinstance(node, ast.Name):
-                name = node.id
-            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
-                name = node.func.attr
-            else:
-                name = ''
-            return JavaType.Method(_name=name)
-        elif isinstance(type, GenericType):
-            self.__cache[signature] = (result := JavaType.Parameterized)
-            result._type = self.__map_type(type.base_type, node)
-            result._type_parameters = [self.__map_type(t, node) for t in type.parameters]
-        elif isinstance(type, NothingType):
-            self.__cache[signature] = (result := JavaType.Unknown())
-        return result
-
-
-def get_type_string(typ):
-    if typ is None:
-        return "None"
-    elif isinstance(typ, ClassType):
-        return typ.name
-    elif isinstance(typ, GenericType):
-        base = get_type_string(typ.base_type)
-        params = [get_type_string(p) for p in typ.parameters]
-        return f"{base}[{', '.join(params)}]"
-    elif isinstance(typ, CallableType):
-        args = [get_type_string(a) for a in typ.args]
-        ret = get_type_string(typ.ret)
-        return f"[{', '.join(args)}] -> {ret}"
-    elif isinstance(typ, UnionType):
-        types = [get_type_string(t) for t in typ.type_list]
-        return '|'.join(types)
-    elif isinstance(typ, TypeParameter):
-        types = [get_type_string(t) for t in typ.constraints]
-        return f"{typ.full_name}{[{', '.join(types)}] if types else ''}"
-    elif hasattr(typ, "name"):
-        return typ.name
-    else:
-        return str(typ)
-
-
-class MyAnnotateAstVisitor(AnnotateAstVisitor):
-    # TODO check if we really should have this
-    def visit_Call(self, node):
-        self._maybe_annotate(node)
+def __getattr__(name: str):
+    if name in ('get_type_string', 'MyAnnotateAstVisitor'):
+        return getattr(_pytype(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import threading
 from abc import ABC, abstractmethod
@@ -10,6 +11,7 @@ from typing import Optional, Any, TypeVar, cast, TYPE_CHECKING, Generic, ClassVa
 from uuid import UUID
 
 from .markers import Markers
+from .utils import frozen_state, set_frozen_state
 from .style import NamedStyles, Style
 
 if TYPE_CHECKING:
@@ -22,6 +24,10 @@ P = TypeVar('P')
 
 
 class Tree(ABC):
+    __slots__ = ()
+    __getstate__ = frozen_state
+    __setstate__ = set_frozen_state
+
     @property
     @abstractmethod
     def id(self) -> UUID:
@@ -84,6 +90,8 @@ class PrinterFactory(ABC):
 S = TypeVar('S', bound=Style)
 
 class SourceFile(Tree):
+    __slots__ = ('__weakref__',)
+
     @property
     @abstractmethod
     def charset_name(self) -> Optional[str]:
@@ -111,9 +119,17 @@ class SourceFile(Tree):
         from .visitor import Cursor
         return self.print(Cursor(None, Cursor.ROOT_VALUE), PrintOutputCapture(0))
 
+    def print_digest(self) -> bytes:
+        """A digest of the printed source file, computed without building the printed text."""
+        from .visitor import Cursor
+        cursor = Cursor(None, Cursor.ROOT_VALUE)
+        capture = DigestOutputCapture(0)
+        self.printer(cursor).visit(self, capture, cursor)
+        return capture.digest()
+
     def print_equals_input(self, input: 'ParserInput', ctx: ExecutionContext) -> bool:
         printed = self.print_all()
-        return printed == input.source().read()
+        return printed == input.text(ctx.get_message(ctx.CHARSET, 'utf-8'))
 
     def get_style(self, style: Type[S]) -> Optional[S]:
         return NamedStyles.merge(style, self.markers.find_all(NamedStyles))
@@ -197,6 +213,39 @@ class PrintOutputCapture(Generic[P]):
         return self._marker_printer
 
 
+def text_digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+
+class DigestOutputCapture(PrintOutputCapture[P]):
+    """Hashes the printed output in chunks instead of accumulating all of it."""
+
+    _CHUNK_SIZE: ClassVar[int] = 1024
+
+    def __init__(self, p: P, marker_printer: Optional['PrintOutputCapture.MarkerPrinter'] = None):
+        super().__init__(p, marker_printer)
+        self._hash = hashlib.blake2b(digest_size=16)
+
+    def append(self, text: Optional[str] = None) -> 'PrintOutputCapture[P]':
+        if text:
+            self._out.append(text)
+            if len(self._out) >= self._CHUNK_SIZE:
+                self.__flush()
+        return self
+
+    def clone(self) -> 'PrintOutputCapture[P]':
+        return DigestOutputCapture(self._context, self._marker_printer)
+
+    def digest(self) -> bytes:
+        """The digest of everything printed so far, equal to `text_digest()` of the printed text."""
+        self.__flush()
+        return self._hash.copy().digest()
+
+    def __flush(self) -> None:
+        self._hash.update(''.join(self._out).encode('utf-8', 'surrogatepass'))
+        self._out.clear()
+
+
 @dataclass
 class _DefaultMarkerPrinter(PrintOutputCapture.MarkerPrinter):
     def before_syntax(self, marker: 'Marker', cursor: 'Cursor', comment_wrapper: Callable[[str], str]) -> str:
@@ -0,0 +1,92 @@
+"""
+Measures how long it takes to transform LSTs when a large fraction of their nodes change, so that the cost of
+the copy-on-write `with_*` methods of different commits can be compared.
+
+    python tests/benchmark/format_benchmark.py --output after.json --baseline before.json
+
+The sources of the synthetic corpus of `parser_benchmark.py` are stripped of the spaces around `=`, `,` and `+`,
+and `AutoFormatVisitor` is run over each tree. The `with_prefix` phase copies every node of the trees with a new
+prefix. The minimum over `--repeat` runs is reported per phase.
+"""
+import argparse
+import ast
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from rewrite import InMemoryExecutionContext
+from rewrite.java import J, Space
+from rewrite.python import PythonVisitor
+from rewrite.python._parser_visitor import ParserVisitor
+from rewrite.python.format.auto_format import AutoFormatVisitor
+
+sys.path.insert(0, str(Path(__file__).parent))
+from parser_benchmark import large_module, deep_nesting, comment_heavy, commit  # noqa: E402
+
+CORPUS = (large_module, deep_nesting, comment_heavy)
+
+
+class PrefixVisitor(PythonVisitor[int]):
+    def visit(self, tree, p, parent=None):
+        tree = super().visit(tree, p, parent)
+        return tree.with_prefix(Space.SINGLE_SPACE if tree.prefix is Space.EMPTY else Space.EMPTY) \
+            if isinstance(tree, J) else tree
+
+
+def generate_corpus(scale: int, seed: int) -> List[str]:
+    rnd = random.Random(seed)
+    return [generate(rnd, scale).replace(' = ', '=').replace(', ', ',').replace(' + ', '+') for generate in CORPUS]
+
+
+def measure(trees: list, repeat: int) -> Dict[str, float]:
+    phases = {
+        'auto_format': lambda cu: AutoFormatVisitor().visit(cu, InMemoryExecutionContext()),
+        'with_prefix': lambda cu: PrefixVisitor().visit(cu, 0),
+    }
+    best = {}
+    for phase, transform in phases.items():
+        best[phase] = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for cu in trees:
+                transform(cu)
+            best[phase] = min(best[phase], time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', type=int, default=30, help='size of the generated source files')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help='runs per phase, the fastest counts')
+    parser.add_argument('--output', type=Path, help='file to write the JSON results to')
+    parser.add_argument('--baseline', type=Path, help='JSON results of an earlier run to compare to')
+    args = parser.parse_args()
+
+    trees = [ParserVisitor(source).visit(ast.parse(source)) for source in generate_corpus(args.scale, args.seed)]
+    report = {
+        'commit': commit(),
+        'python': platform.python_version(),
+        'scale': args.scale,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'phases': measure(trees, args.repeat),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())['phases']
+        for phase, after in report['phases'].items():
+            before = baseline[phase]
+            print(f'{phase:>16}: {before:8.3f}s -> {after:8.3f}s ({(after - before) / before:+.1%})', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures how long it takes a fresh interpreter to import the packages of the production code path, and checks
+that no test-only or optional heavy dependency is imported along the way.
+
+    python tests/benchmark/import_benchmark.py --budget 0.5
+
+Each module is imported in `--repeat` new interpreters and the fastest run counts. The script exits with a
+non-zero status if a module takes longer than `--budget` seconds or loads one of the deferred dependencies.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+MODULES = ('rewrite', 'rewrite.python', 'rewrite.java.remote.register')
+DEFERRED = ('pytest', '_pytest', 'pytype', 'libcst')
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'deferred': [m for m in {deferred!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str, repeat: int) -> dict:
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', _PROBE.format(module=module, deferred=DEFERRED)],
+                                capture_output=True, text=True, check=True, cwd=Path(__file__).parents[2])
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {'seconds': min(r['seconds'] for r in runs), 'deferred': runs[0]['deferred']}
+
+
+def violations(results: Dict[str, dict], budget: float) -> List[str]:
+    problems = []
+    for module, result in results.items():
+        if result['seconds'] > budget:
+            problems.append(f"importing {module} took {result['seconds']:.3f}s, more than {budget:.3f}s")
+        if result['deferred']:
+            problems.append(f"importing {module} also imported {', '.join(result['deferred'])}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5, help='interpreters per module, the fastest counts')
+    parser.add_argument('--budget', type=float, default=1.0, help='seconds that importing a module may take')
+    parser.add_argument('--output', type=Path, help='file to write the JSON results to')
+    args = parser.parse_args()
+
+    results = {module: measure(module, args.repeat) for module in MODULES}
+    output = json.dumps({'python': sys.version.split()[0], 'budget': args.budget, 'results': results}, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+    problems = violations(results, args.budget)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
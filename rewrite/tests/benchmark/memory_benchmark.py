@@ -0,0 +1,123 @@
+"""
+Measures how much memory the LSTs of a corpus of Python source files take while they are all held at once, so
+that the memory footprint of different commits can be compared.
+
+    python tests/benchmark/memory_benchmark.py --output after.json --baseline before.json
+
+The corpus defaults to the standard library of the running interpreter. Every file is parsed with
+`ParserVisitor` and kept, and the memory allocated by the trees is measured with `tracemalloc` once the
+source texts and `ast` trees are released. The number of objects reachable from the trees is counted per type.
+"""
+import argparse
+import ast
+import gc
+import json
+import platform
+import subprocess
+import sys
+import sysconfig
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from rewrite import Markers
+from rewrite.java import Space
+from rewrite.python._parser_visitor import ParserVisitor
+
+
+def corpus(directory: Path, limit: Optional[int]) -> List[Path]:
+    paths = []
+    for path in sorted(directory.rglob('*.py')):
+        if 'test' in path.parts or 'site-packages' in path.parts:
+            continue
+        try:
+            ast.parse(path.read_text('utf-8'))
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+            continue
+        paths.append(path)
+        if limit is not None and len(paths) >= limit:
+            break
+    return paths
+
+
+def parse(paths: List[Path]) -> list:
+    trees = []
+    for path in paths:
+        source = path.read_text('utf-8')
+        try:
+            trees.append(ParserVisitor(source).visit(ast.parse(source)))
+        except Exception as e:
+            print(f'{path}: {e!r}', file=sys.stderr)
+    return trees
+
+
+def count_objects(trees: list) -> Counter:
+    """The number of objects reachable from the trees by type, where shared objects count once."""
+    seen = {id(Space.EMPTY), id(Markers.EMPTY)}
+    counts: Counter = Counter()
+    stack = list(trees)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, (str, int, float, bool, bytes, type(None))):
+            continue
+        seen.add(id(obj))
+        counts[type(obj).__name__] += 1
+        stack.extend(gc.get_referents(obj))
+    return counts
+
+
+def commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(paths: List[Path]) -> Dict[str, object]:
+    gc.collect()
+    tracemalloc.start()
+    trees = parse(paths)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    counts = count_objects(trees)
+    return {
+        'files': len(paths),
+        'parsed': len(trees),
+        'bytes': sum(p.stat().st_size for p in paths),
+        'tree_mb': size / 1e6,
+        'objects': sum(counts.values()),
+        'top_types': dict(counts.most_common(15)),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('directory', type=Path, nargs='?', default=Path(sysconfig.get_paths()['stdlib']),
+                        help='directory with the Python sources to parse')
+    parser.add_argument('--limit', type=int, help='maximum number of files to parse')
+    parser.add_argument('--output', type=Path, help='file to write the JSON results to')
+    parser.add_argument('--baseline', type=Path, help='JSON results of an earlier run to compare to')
+    args = parser.parse_args()
+
+    report = {
+        'commit': commit(),
+        'python': platform.python_version(),
+        'directory': str(args.directory),
+        **measure(corpus(args.directory, args.limit)),
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+    if args.baseline:
+        before = json.loads(args.baseline.read_text())['tree_mb']
+        after = report['tree_mb']
+        print(f'tree memory: {before:.1f}MB -> {after:.1f}MB ({(after - before) / before:+.1%})', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+Measures the throughput of the Python parser over a synthetic corpus that is generated deterministically,
+so that the results of different commits can be compared.
+
+    python tests/benchmark/parser_benchmark.py --output after.json --baseline before.json
+
+Every source file is taken through the phases of `PythonParser`: `ast.parse`, mapping with `ParserVisitor`
+and the print idempotence check. The minimum over `--repeat` runs is reported per phase and per kind of
+source file, together with the peak resident memory of the process.
+
+With `--parallelism`, all source files are also parsed by a `PythonParser` with that many worker processes
+and by one without, together with the time it takes to pickle and unpickle their trees, which is what the
+round trip to the workers adds to parsing.
+"""
+import argparse
+import ast
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from io import StringIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from rewrite import InMemoryExecutionContext, ParserInput
+from rewrite.python import PythonParserBuilder
+from rewrite.python import _pickling
+from rewrite.python._parser_visitor import ParserVisitor
+
+PHASES = ('ast_parse', 'parser_visitor', 'print_idempotence')
+
+
+def large_module(rnd: random.Random, size: int) -> str:
+    lines = ['import os', 'import sys', 'from typing import List, Optional', '', '']
+    for i in range(size):
+        lines += [
+            f'class Widget{i}:',
+            f'    """Widget number {i}."""',
+            '',
+            f'    def __init__(self, name: str, count: int = {rnd.randint(0, 100)}) -> None:',
+            '        self.name = name',
+            '        self.count = count',
+            '',
+            '    def render(self, items: List[int]) -> Optional[str]:',
+            '        total = 0',
+            '        for item in items:',
+            '            if item % 2 == 0 and item > self.count:',
+            '                total += item * 2',
+            '            elif item < 0:',
+            '                continue',
+            '            else:',
+            '                total -= 1',
+            '        try:',
+            '            return os.path.join(self.name, str(total))',
+            '        except (TypeError, ValueError) as e:',
+            '            print(e, file=sys.stderr)',
+            '            return None',
+            '',
+            '',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def deep_nesting(rnd: random.Random, size: int) -> str:
+    lines = []
+    for i in range(size):
+        depth = rnd.randint(4, 12)
+        expr = 'x'
+        for d in range(depth):
+            expr = f'({expr} + {d}) * y{d % 3}' if d % 2 else f'[{expr}, {{"k{d}": (z{d},)}}]'
+        lines.append(f'v{i} = {expr}')
+        body = []
+        for d in range(depth):
+            body.append('    ' * d + f'if a{d} > {d}:' if d % 2 else '    ' * d + f'for i{d} in range({d}):')
+        body.append('    ' * depth + f'f(g(h({i}, (1, (2, (3, [4, [5]]))))))')
+        lines += [f'def f{i}():'] + ['    ' + b for b in body] + ['']
+    return '\n'.join(lines) + '\n'
+
+
+def string_heavy(rnd: random.Random, size: int) -> str:
+    quotes = ["'{}'", '"{}"', "'''{}'''", '"""{}"""', "r'{}'"]
+    lines = []
+    for i in range(size):
+        text = [rnd.choice(quotes).format(f'text {i} with \\t escapes and ünïcödé {j}') for j in range(3)]
+        data = ['b' + rnd.choice(quotes).format(f'bytes {i} \\x00 {j}') for j in range(2)]
+        lines.append(f's{i} = ' + ' '.join(text))
+        lines.append(f'b{i} = ' + ' '.join(data))
+        lines.append(f'd{i} = {{"key{i}": "value", \'other\': """multi\nline {i}"""}}')
+    return '\n'.join(lines) + '\n'
+
+
+def fstring_heavy(rnd: random.Random, size: int) -> str:
+    lines = []
+    for i in range(size):
+        width = rnd.randint(1, 20)
+        lines += [
+            f'a{i} = f"{{name!r}} has {{count:>{width}}} items"',
+            f"b{i} = f'{{value:{{width}}.{{precision}}f}} and {{obj.attr[{i}]}}'",
+            f'c{i} = f"""nested {{f\'{{inner}}\'}} and {{x + y = }} {{d["k"]!s:^{width}}}"""',
+            f'd{i} = f"{{a}}" f"{{b}}" "plain" f"{{c!a}}"',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+def comment_heavy(rnd: random.Random, size: int) -> str:
+    lines = ['# module header', '# ' + '-' * 70, '']
+    for i in range(size):
+        lines += [
+            f'# comment before function {i}',
+            f'def f{i}(a,  # first argument',
+            '       b):  # second argument',
+            '    # body comment',
+            f'    x = [1,  # one',
+            '         2,  # two',
+            '         ]  # closing',
+            '    return (a +  # plus',
+            '            b)  # done',
+            '',
+            '',
+        ]
+    return '\n'.join(lines) + '\n'
+
+
+CORPUS: Dict[str, Callable[[random.Random, int], str]] = {
+    'large': large_module,
+    'deep_nesting': deep_nesting,
+    'string_heavy': string_heavy,
+    'fstring_heavy': fstring_heavy,
+    'comment_heavy': comment_heavy,
+}
+
+
+def generate_corpus(scale: int, seed: int) -> Dict[str, List[str]]:
+    rnd = random.Random(seed)
+    return {kind: [generate(rnd, scale * (i + 1)) for i in range(4)] for kind, generate in CORPUS.items()}
+
+
+def measure(sources: List[str]) -> Dict[str, float]:
+    times = dict.fromkeys(PHASES, 0.0)
+    for source in sources:
+        start = time.perf_counter()
+        tree = ast.parse(source)
+        parsed = time.perf_counter()
+        cu = ParserVisitor(source).visit(tree)
+        mapped = time.perf_counter()
+        if cu.print_all() != source:
+            raise AssertionError('a benchmark source is not print idempotent')
+        times['ast_parse'] += parsed - start
+        times['parser_visitor'] += mapped - parsed
+        times['print_idempotence'] += time.perf_counter() - mapped
+    return times
+
+
+def run(corpus: Dict[str, List[str]], repeat: int) -> Dict[str, dict]:
+    results = {}
+    for kind, sources in corpus.items():
+        best = dict.fromkeys(PHASES, float('inf'))
+        for _ in range(repeat):
+            for phase, seconds in measure(sources).items():
+                best[phase] = min(best[phase], seconds)
+        results[kind] = summarize(sources, best)
+    return results
+
+
+def measure_round_trip(sources: List[str], parallelism: int, repeat: int) -> dict:
+    inputs = [ParserInput(Path(f'm{i}.py'), None, True, lambda s=s: StringIO(s)) for i, s in enumerate(sources)]
+
+    def parse(parallelism: int) -> Tuple[float, list]:
+        start = time.perf_counter()
+        trees = list(PythonParserBuilder().parallelism(parallelism).build().parse_inputs(
+            inputs, None, InMemoryExecutionContext()))
+        return time.perf_counter() - start, trees
+
+    parallel = min(parse(parallelism)[0] for _ in range(repeat))
+    serial, trees = min((parse(1) for _ in range(repeat)), key=lambda result: result[0])
+    round_trip = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for tree in trees:
+            _pickling.loads(_pickling.dumps(tree))
+        round_trip = min(round_trip, time.perf_counter() - start)
+    return {
+        'parallelism': parallelism,
+        'files': len(sources),
+        'seconds': parallel,
+        'serial_seconds': serial,
+        'round_trip_seconds': round_trip,
+        'speedup': serial / parallel,
+    }
+
+
+def summarize(sources: List[str], phases: Dict[str, float]) -> dict:
+    total = sum(phases.values())
+    size = sum(len(s.encode('utf-8')) for s in sources)
+    return {
+        'files': len(sources),
+        'bytes': size,
+        'seconds': total,
+        'files_per_second': len(sources) / total,
+        'mb_per_second': size / total / 1e6,
+        'phases': phases,
+    }
+
+
+def peak_memory_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> List[Tuple[str, float, float]]:
+    rows = []
+    for kind, result in results['results'].items():
+        before = baseline.get('results', {}).get(kind)
+        if before:
+            rows.append((kind, before['seconds'], result['seconds']))
+    rows.append(('total', baseline['total']['seconds'], results['total']['seconds']))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', type=int, default=20, help='size of the generated source files')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='runs per kind of source file, the fastest counts')
+    parser.add_argument('--output', type=Path, help='file to write the JSON results to')
+    parser.add_argument('--baseline', type=Path, help='JSON results of an earlier run to compare to')
+    parser.add_argument('--parallelism', type=int, help='also parse all source files with this many workers')
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.scale, args.seed)
+    results = run(corpus, args.repeat)
+    all_sources = [s for sources in corpus.values() for s in sources]
+    phases = {phase: sum(r['phases'][phase] for r in results.values()) for phase in PHASES}
+    report = {
+        'commit': commit(),
+        'python': platform.python_version(),
+        'scale': args.scale,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'results': results,
+        'total': summarize(all_sources, phases),
+        'peak_memory_mb': peak_memory_mb(),
+    }
+    if args.parallelism:
+        report['parallel'] = measure_round_trip(all_sources, args.parallelism, args.repeat)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    else:
+        print(output)
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        for kind, before, after in compare(report, baseline):
+            print(f'{kind:>16}: {before:8.3f}s -> {after:8.3f}s ({(after - before) / before:+.1%})', file=sys.stderr)
+        if 'parallel' in report and 'parallel' in baseline:
+            before, after = baseline['parallel']['seconds'], report['parallel']['seconds']
+            print(f'{"parallel":>16}: {before:8.3f}s -> {after:8.3f}s ({(after - before) / before:+.1%})',
+                  file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+import subprocess
+import sys
+
+
+def test_optional_dependencies_are_not_imported():
+    probe = "import sys, rewrite.python; print(' '.join(m for m in ('pytest', 'pytype') if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ''
@@ -0,0 +1,61 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from rewrite import InMemoryExecutionContext, ParserInput, ParseError
+from rewrite.python import PythonParserBuilder, PythonParser, CompilationUnit
+
+
+@pytest.mark.parametrize('parallelism', [1, 2])
+def test_identical_sources_are_parsed_once(parallelism):
+    # language=python
+    vendored = "import os\n\n\ndef f(a):\n    return os.path.join(a, 'x')\n"
+    sources = [vendored, "x = 1\n", vendored, vendored]
+    inputs = [ParserInput(Path(f"pkg{i}/util.py"), None, True, lambda s=s: StringIO(s)) for i, s in enumerate(sources)]
+    ctx = InMemoryExecutionContext()
+    ctx.put_message(PythonParser.DEDUPLICATED, 0)
+
+    parsed = list(PythonParserBuilder().parallelism(parallelism).build().parse_inputs(inputs, None, ctx))
+
+    assert ctx.get_message(PythonParser.DEDUPLICATED) == 2
+    assert all(isinstance(cu, CompilationUnit) for cu in parsed)
+    assert [cu.print_all() for cu in parsed] == sources
+    assert [cu.source_path for cu in parsed] == [i.path for i in inputs]
+    first, copy = parsed[0], parsed[2]
+    assert copy.id != first.id
+    assert copy.statements[1].id != first.statements[1].id
+
+
+@pytest.mark.parametrize('parallelism', [1, 2])
+def test_sources_that_do_not_parse_are_not_deduplicated(parallelism):
+    sources = ["x = (\n", "x = (\n"]
+    inputs = [ParserInput(Path(f"pkg{i}/util.py"), None, True, lambda s=s: StringIO(s)) for i, s in enumerate(sources)]
+    ctx = InMemoryExecutionContext()
+    ctx.put_message(PythonParser.DEDUPLICATED, 0)
+
+    parsed = list(PythonParserBuilder().parallelism(parallelism).build().parse_inputs(inputs, None, ctx))
+
+    assert ctx.get_message(PythonParser.DEDUPLICATED) == 0
+    assert all(isinstance(cu, ParseError) for cu in parsed)
+    assert [cu.source_path for cu in parsed] == [i.path for i in inputs]
+
+
+def test_identical_sources_of_different_modules_keep_their_types(tmp_path):
+    # language=python
+    app = "from .dep import make\n\nw = make()\n"
+    root = tmp_path / 'src'
+    for package, cls in (('a', 'Apple'), ('b', 'Banana')):
+        (root / package).mkdir(parents=True)
+        (root / package / 'dep.py').write_text(f"class {cls}:\n    pass\n\n\ndef make():\n    return {cls}()\n")
+        (root / package / 'app.py').write_text(app)
+    ctx = InMemoryExecutionContext()
+    ctx.put_message(PythonParser.DEDUPLICATED, 0)
+
+    parser = PythonParserBuilder().type_attribution(tmp_path / 'cache').build()
+    parsed = {cu.source_path.relative_to(root).as_posix(): cu
+              for cu in parser.parse(sorted(root.rglob('*.py')), root, ctx)}
+
+    assert ctx.get_message(PythonParser.DEDUPLICATED) == 0
+    assert [parsed[f"{package}/app.py"].statements[1].assignment.method_type.return_type._fully_qualified_name
+            for package in ('a', 'b')] == ['a.dep.Apple', 'b.dep.Banana']
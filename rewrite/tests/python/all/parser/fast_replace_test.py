@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+
+import pytest
+
+from rewrite import Markers
+from rewrite.java import tree as j, Space
+from rewrite.python.parser import PythonParserBuilder
+from rewrite.utils import replace, list_map
+
+
+def invocation() -> j.MethodInvocation:
+    cu = next(iter(PythonParserBuilder().build().parse_strings("os.path.join(a, b)\n")))
+    return cu.statements[0]
+
+
+def test_replace_one_field():
+    original = invocation()
+    copy = original.with_prefix(Space.SINGLE_SPACE)
+
+    assert type(copy) is j.MethodInvocation
+    assert copy.prefix is Space.SINGLE_SPACE and original.prefix is Space.EMPTY
+    assert copy.id == original.id and copy.padding.arguments is original.padding.arguments
+    assert copy.name is original.name and copy.method_type is original.method_type
+
+
+def test_replace_several_fields():
+    original = invocation()
+    copy = replace(original, _prefix=Space.SINGLE_SPACE, _markers=Markers.EMPTY)
+
+    assert (copy.prefix, copy.markers, copy.name) == (Space.SINGLE_SPACE, Markers.EMPTY, original.name)
+    with pytest.raises(TypeError):
+        replace(original, _prefix=Space.SINGLE_SPACE, _missing=None)
+
+
+def test_replace_dataclass_without_slots():
+    @dataclass(frozen=True)
+    class Point:
+        x: int
+        y: int
+
+        def __post_init__(self):
+            assert self.x >= 0
+
+    assert replace(Point(1, 2), y=3) == Point(1, 3)
+    with pytest.raises(AssertionError):
+        replace(Point(1, 2), x=-1)
+
+
+def test_list_map_with_and_without_index():
+    for _ in range(2):
+        assert list_map(lambda x: x + 1, [1, 2]) == [2, 3]
+        assert list_map(lambda x, i: x + i, [1, 2]) == [1, 3]
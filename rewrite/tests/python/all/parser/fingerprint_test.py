@@ -0,0 +1,90 @@
+import ast
+from uuid import UUID
+
+from rewrite import Marker, random_id
+from rewrite.java import tree as j, Space, TreeFingerprinter
+from rewrite.python import CompilationUnit
+from rewrite.python._parser_visitor import ParserVisitor
+
+# language=python
+SOURCE = """import os
+
+
+def first(a, b=1):
+    # add them
+    return os.path.join(a, str(b))
+
+
+def second(a, b=1):
+    # add them
+    return os.path.join(a, str(b))
+"""
+
+
+def parse(source: str = SOURCE, lazy: bool = False) -> CompilationUnit:
+    return ParserVisitor(source, lazy=lazy).visit(ast.parse(source))
+
+
+def test_same_source_has_same_fingerprint():
+    fingerprinter = TreeFingerprinter()
+    cu = parse()
+
+    assert fingerprinter.fingerprint(cu) == fingerprinter.fingerprint(parse())
+    assert fingerprinter.fingerprint(cu) == fingerprinter.fingerprint(parse(lazy=True))
+    first, second = cu.statements[1], cu.statements[2]
+    assert fingerprinter.fingerprint(first.body) == fingerprinter.fingerprint(second.body)
+    assert fingerprinter.fingerprint(first) != fingerprinter.fingerprint(second)
+
+
+def test_whitespace_and_comments_count():
+    fingerprinter = TreeFingerprinter()
+    original = fingerprinter.fingerprint(parse())
+
+    assert fingerprinter.fingerprint(parse(SOURCE.replace('(a, b', '(a,  b', 1))) != original
+    assert fingerprinter.fingerprint(parse(SOURCE.replace('# add', '# sum', 1))) != original
+
+
+def test_ids_and_types_do_not_count():
+    fingerprinter = TreeFingerprinter()
+    cu = parse()
+    invocation = cu.statements[1].body.statements[0].expression
+    block = cu.statements[1].body
+
+    assert isinstance(invocation, j.MethodInvocation)
+    assert fingerprinter.fingerprint(invocation.with_method_type(None)) == fingerprinter.fingerprint(invocation)
+    assert fingerprinter.fingerprint(block.with_id(cu.id)) == fingerprinter.fingerprint(block)
+
+
+def test_unchanged_subtrees_are_reused():
+    fingerprinter = TreeFingerprinter()
+    cu = parse()
+    fingerprinter.fingerprint(cu)
+    cached = len(fingerprinter)
+
+    statement = cu.statements[2]
+    edited = cu.with_statements(cu.statements[:2] + [statement.with_prefix(Space.SINGLE_SPACE)])
+    assert fingerprinter.fingerprint(edited) != fingerprinter.fingerprint(cu)
+    assert len(fingerprinter) == cached + 2
+
+
+class Opaque(Marker):
+    def __init__(self, id: UUID):
+        self._id = id
+
+    @property
+    def id(self) -> UUID:
+        return self._id
+
+    def with_id(self, id: UUID) -> Marker:
+        return Opaque(id)
+
+
+def test_markers_that_are_not_dataclasses_count_by_kind():
+    fingerprinter = TreeFingerprinter()
+    statement = parse().statements[0]
+
+    def marked(tree):
+        return tree.with_markers(tree.markers.with_markers([Opaque(random_id())]))
+
+    assert fingerprinter.fingerprint(marked(statement)) == fingerprinter.fingerprint(marked(statement))
+    assert fingerprinter.fingerprint(marked(statement)) != fingerprinter.fingerprint(statement)
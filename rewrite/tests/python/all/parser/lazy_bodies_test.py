@@ -0,0 +1,152 @@
+import ast
+import gc
+import weakref
+from io import StringIO
+from pathlib import Path
+
+from rewrite import ExecutionContext, ParserInput, PrintEqualsInputMode
+from rewrite.java import tree as j, Deferred, Space
+from rewrite.python import CompilationUnit, PythonVisitor
+from rewrite.python._parser_visitor import ParserVisitor
+from rewrite.python._pickling import dumps, loads
+from rewrite.python.parser import PythonParserBuilder
+
+# language=python
+SOURCE = """import os
+
+
+@decorator
+class A(Base):
+    x = 'ö'  # one
+
+    def f(self, a: int) -> int:
+        from os import (path,
+                        sep)
+
+
+        return a,  # tuple
+
+    async def g(self): return await self.f(1);  # semicolon
+
+
+def h():
+    def inner(): return (1,
+                         2)  # nested
+    del os
+
+
+h()
+"""
+
+
+class Context(ExecutionContext):
+    def __init__(self, **messages):
+        self._messages = dict(messages)
+
+    def get_message(self, key, default_value=None):
+        return self._messages.get(key, default_value)
+
+    def put_message(self, key, value):
+        self._messages[key] = value
+
+
+def parse(lazy: bool) -> CompilationUnit:
+    ctx = Context(**{ExecutionContext.PRINT_EQUALS_INPUT_MODE: PrintEqualsInputMode.OFF})
+    source = ParserInput(Path("m.py"), None, True, lambda: StringIO(SOURCE))
+    return next(iter(PythonParserBuilder().lazy(lazy).build().parse_inputs([source], None, ctx)))
+
+
+def identifiers(cu: CompilationUnit):
+    class Collect(PythonVisitor[list]):
+        def visit_identifier(self, ident, p):
+            p.append(ident.simple_name)
+            return ident
+
+    names = []
+    Collect().visit(cu, names)
+    return names
+
+
+def test_bodies_are_mapped_when_used():
+    cu = parse(True)
+    class_declaration = cu.statements[1]
+    copy = class_declaration.with_prefix(Space.SINGLE_SPACE)
+
+    assert isinstance(class_declaration._body, Deferred)
+    class_body = class_declaration.body
+    assert type(class_body) is j.Block and class_declaration._body is class_body
+    assert isinstance(class_body.statements[0], j.Assignment)
+    assert copy.body is class_body
+    assert isinstance(cu.statements[2]._body, Deferred)
+
+
+def test_lazy_matches_eager():
+    lazy = parse(True)
+
+    assert lazy.print_all() == SOURCE
+    assert identifiers(lazy) == identifiers(parse(False))
+
+
+def test_pickle_lazy_body():
+    cu = loads(dumps(parse(True)))
+
+    assert type(cu.statements[1].body) is j.Block
+    assert cu.print_all() == SOURCE
+
+
+def test_unused_bodies_are_not_mapped(monkeypatch):
+    returns = []
+    visit_return = ParserVisitor.visit_Return
+    monkeypatch.setattr(ParserVisitor, 'visit_Return',
+                        lambda self, node: returns.append(node) or visit_return(self, node))
+
+    parse(False)
+    assert len(returns) == 3
+    returns.clear()
+
+    cu = parse(True)
+    assert returns == []
+    h = cu.statements[2]
+    assert isinstance(h.body.statements[0].body.statements[0], j.Return)
+    assert len(returns) == 1
+
+
+def test_deferred_bodies_do_not_keep_the_visitor_alive():
+    visitor = ParserVisitor(SOURCE, lazy=True)
+    cu = visitor.visit(ast.parse(SOURCE))
+    collected = weakref.ref(visitor)
+    del visitor
+    gc.collect()
+
+    assert collected() is None
+    assert cu.print_all() == SOURCE
+
+
+class TypeRecorder:
+    """Records the types of the nodes that a remote sender adds."""
+
+    def __init__(self):
+        self.types = []
+
+    def send_node(self, diff_event, visitor):
+        if diff_event.event_type.name == 'Add':
+            if diff_event.concrete_type:
+                self.types.append(diff_event.concrete_type)
+            visitor(self)
+
+    def send_value(self, diff_event):
+        pass
+
+    def flush(self):
+        pass
+
+
+def test_remote_sender_sends_deferred_bodies_as_blocks():
+    from rewrite_remote import SenderContext
+    from rewrite.python.remote import PythonSender
+
+    recording = TypeRecorder()
+    PythonSender().send(parse(True), None, SenderContext(recording))
+
+    assert 'org.openrewrite.java.tree.J$Block' in recording.types
+    assert not [t for t in recording.types if not t.startswith('org.openrewrite.')]
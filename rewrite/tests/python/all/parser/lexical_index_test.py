@@ -0,0 +1,23 @@
+from rewrite.python._tokens import LexicalIndex, TokenTable
+
+# language=python
+SOURCE = """x = f(a)  # g(b) =
+s = ': not a delimiter'
+if x:
+    pass
+"""
+
+
+def test_delimiters_in_comments_and_strings_are_not_found():
+    index = LexicalIndex.build(TokenTable(SOURCE))
+
+    assert index.position_of_next('=', 0) == SOURCE.index('=')
+    assert index.position_of_next('=', SOURCE.index('=') + 1) == SOURCE.index('s =') + 2
+    assert index.position_of_next(':', 0) == SOURCE.index('x:') + 1
+    assert index.position_of_next('g', 0) == -1
+    assert index.position_of_next('if', 0, stop='s') == -1
+
+
+def test_covered_delimiters():
+    assert all(LexicalIndex.covers(delim) for delim in ('(', '**=', '->', ':=', 'if', 'match', '_'))
+    assert not any(LexicalIndex.covers(delim) for delim in ('', 'not in', '#', '"'))
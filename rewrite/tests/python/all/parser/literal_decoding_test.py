@@ -0,0 +1,25 @@
+import ast
+
+import pytest
+
+from rewrite.python._literals import decode_string
+
+
+@pytest.mark.parametrize('text', [
+    "'plain'",
+    '"""multi\nline"""',
+    r"'\t\n\\\'\"\a\b\f\v\r'",
+    r"'\x41\101é\U0001F600\N{BULLET}'",
+    r"'\d\中'",
+    "'a\\\nb'",
+    "'''a\r\nb'''",
+    r"r'\d\n'",
+    r"Rb'\x00'",
+    r"b'\x00\777\n\u1234'",
+    r"u'ünïcödé'",
+])
+def test_decode_string(text):
+    expected = ast.literal_eval(ast.parse(text, mode='eval').body)
+
+    assert decode_string(text) == expected
+    assert type(decode_string(text)) is type(expected)
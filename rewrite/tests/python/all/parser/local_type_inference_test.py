@@ -0,0 +1,103 @@
+import ast
+from typing import List
+
+from rewrite.java import tree as j, JavaType
+from rewrite.python import CompilationUnit, PythonVisitor
+from rewrite.python._type_inference import LocalTypes
+from rewrite.python.parser import PythonParserBuilder
+
+# language=python
+SOURCE = """import os.path
+from collections import OrderedDict
+from typing import Optional
+
+
+def make(n: int) -> 'Widget':
+    return Widget(str(n))
+
+
+class Widget:
+    def size(self) -> int:
+        return len(self.name)
+
+
+def use(items: list[str], w: Optional[Widget] = None):
+    d = OrderedDict()
+    p = os.path.join('a', 'b')
+    x = 1
+    x = x / 2
+    w.size()
+    for w in items:
+        w.size()
+    FACTORY()
+"""
+
+
+def parse(source: str) -> CompilationUnit:
+    return next(iter(PythonParserBuilder().build().parse_strings(source)))
+
+
+def method_types(cu: CompilationUnit) -> List[JavaType.Method]:
+    class Collect(PythonVisitor[list]):
+        def visit_method_invocation(self, method, p):
+            p.append(method.method_type)
+            return super().visit_method_invocation(method, p)
+
+    types = []
+    Collect().visit(cu, types)
+    return types
+
+
+def identifier_types(cu: CompilationUnit, name: str) -> list:
+    class Collect(PythonVisitor[list]):
+        def visit_identifier(self, ident, p):
+            if ident.simple_name == name:
+                p.append(ident.type)
+            return ident
+
+    types = []
+    Collect().visit(cu, types)
+    return types
+
+
+def test_call_types():
+    widget, str_, len_, ordered_dict, join, size, unknown, factory = method_types(parse(SOURCE))
+
+    assert widget.declaring_type._fully_qualified_name == 'Widget'
+    assert widget.return_type is widget.declaring_type
+    assert (str_.declaring_type._fully_qualified_name, str_.return_type) == ('builtins.str', JavaType.Primitive.String)
+    assert (len_.declaring_type._fully_qualified_name, len_.return_type) == ('builtins', JavaType.Primitive.Int)
+    # without a stub index, an imported name is not known to be a class
+    assert (ordered_dict.declaring_type._fully_qualified_name, ordered_dict.return_type) == ('collections', None)
+    assert (join.declaring_type._fully_qualified_name, join.name) == ('os.path', 'join')
+    assert size.return_type is JavaType.Primitive.Int
+    assert unknown is None
+    assert factory is None
+
+
+def test_variable_types():
+    cu = parse(SOURCE)
+
+    assert identifier_types(cu, 'x') == [JavaType.Primitive.Int, JavaType.Primitive.Double, JavaType.Primitive.Int]
+    assert identifier_types(cu, 'n') == [JavaType.Primitive.Int, JavaType.Primitive.Int]
+    items = identifier_types(cu, 'items')[0]
+    assert isinstance(items, JavaType.Parameterized)
+    assert items._type_parameters == [JavaType.Primitive.String]
+    assert identifier_types(cu, 'd') == [None]
+
+
+def test_method_declaration_type():
+    make = parse(SOURCE).statements[3]
+
+    assert isinstance(make, j.MethodDeclaration)
+    assert make.method_type.return_type._fully_qualified_name == 'Widget'
+    assert make.method_type.parameter_names == ['n']
+
+
+def test_relative_imports_of_packages():
+    module = ast.parse("from .dep import make\nmake()\n")
+    for package, declaring in ((True, 'pkg.dep'), (False, 'dep')):
+        types = LocalTypes('pkg', package=package)
+        types.declare_module(module)
+
+        assert types.method_invocation_type(module.body[1].value).declaring_type._fully_qualified_name == declaring
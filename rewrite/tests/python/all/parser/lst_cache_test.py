@@ -0,0 +1,89 @@
+from io import StringIO
+from pathlib import Path
+from typing import Optional
+
+from rewrite import InMemoryExecutionContext, ParserInput, ExecutionContext, PrintEqualsInputMode
+from rewrite.python import PythonParserBuilder
+
+
+class Context(ExecutionContext):
+    def __init__(self, **messages):
+        self._messages = dict(messages)
+
+    def get_message(self, key, default_value=None):
+        return self._messages.get(key, default_value)
+
+    def put_message(self, key, value):
+        self._messages[key] = value
+
+
+def parse(builder: PythonParserBuilder, *sources: str, ctx: Optional[ExecutionContext] = None):
+    inputs = [ParserInput(Path(f"f{i}.py"), None, True, lambda s=s: StringIO(s)) for i, s in enumerate(sources)]
+    return list(builder.build().parse_inputs(inputs, None, InMemoryExecutionContext() if ctx is None else ctx))
+
+
+def test_unchanged_source_is_loaded_from_cache(tmp_path):
+    first = parse(PythonParserBuilder().cache(tmp_path), "import os\n", "x = 1\n")
+    second = parse(PythonParserBuilder().cache(tmp_path), "import os\n", "x = 2\n")
+
+    assert second[0].id == first[0].id
+    assert second[0].print_all() == "import os\n"
+    assert second[1].id != first[1].id
+    assert second[1].print_all() == "x = 2\n"
+
+
+def test_identical_sources_in_one_run_get_distinct_trees(tmp_path):
+    parse(PythonParserBuilder().cache(tmp_path), "import os\n")
+    parsed = parse(PythonParserBuilder().cache(tmp_path), "import os\n", "import os\n")
+
+    assert parsed[0].id != parsed[1].id
+
+
+def test_parser_is_served_its_own_entries(tmp_path):
+    parser = PythonParserBuilder().cache(tmp_path).build()
+    source = ParserInput(Path('f.py'), None, True, lambda: StringIO("import os\n"))
+    first = next(iter(parser.parse_inputs([source], None, InMemoryExecutionContext())))
+
+    assert next(iter(parser.parse_inputs([source], None, InMemoryExecutionContext()))).id == first.id
+
+
+def test_trees_cached_without_print_idempotence_check_are_checked(tmp_path):
+    unchecked = Context(**{ExecutionContext.PRINT_EQUALS_INPUT_MODE: PrintEqualsInputMode.OFF})
+    parse(PythonParserBuilder().cache(tmp_path), "import os\n", ctx=unchecked)
+    ctx = Context()
+    parse(PythonParserBuilder().cache(tmp_path), "import os\n", ctx=ctx)
+
+    assert ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED) == 1
+
+
+def test_only_the_owner_can_access_the_cache(tmp_path):
+    parse(PythonParserBuilder().cache(tmp_path / 'lst'), "import os\n")
+
+    entry, = (tmp_path / 'lst').glob('*/*.lst')
+    assert (tmp_path / 'lst').stat().st_mode & 0o777 == 0o700
+    assert entry.parent.stat().st_mode & 0o777 == 0o700
+    assert entry.stat().st_mode & 0o777 == 0o600
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    parse(PythonParserBuilder().cache(tmp_path, max_size=4096), *[f"x{i} = {i}\n" for i in range(50)])
+
+    assert sum(f.stat().st_size for f in tmp_path.glob('*/*.lst')) <= 4096
+
+
+def test_cached_trees_depend_on_project_types(tmp_path):
+    # language=python
+    app = "from .dep import make\n\nw = make()\n"
+    root = tmp_path / 'src'
+    (root / 'pkg').mkdir(parents=True)
+    (root / 'pkg' / 'app.py').write_text(app)
+
+    def return_type(cls: str) -> str:
+        (root / 'pkg' / 'dep.py').write_text(f"class {cls}:\n    pass\n\n\ndef make():\n    return {cls}()\n")
+        parser = PythonParserBuilder().cache(tmp_path / 'lst').type_attribution(tmp_path / 'stubs').build()
+        parsed = {cu.source_path.name: cu for cu in parser.parse([root / 'pkg' / 'app.py', root / 'pkg' / 'dep.py'],
+                                                                 root, InMemoryExecutionContext())}
+        return parsed['app.py'].statements[1].assignment.method_type.return_type._fully_qualified_name
+
+    assert return_type('Apple') == 'pkg.dep.Apple'
+    assert return_type('Banana') == 'pkg.dep.Banana'
@@ -0,0 +1,75 @@
+import os
+from io import BytesIO, StringIO
+from pathlib import Path
+
+from rewrite import InMemoryExecutionContext, ParserInput, ParseError, Markers
+from rewrite.java import Space, TypeTable
+from rewrite.python import PythonParserBuilder, CompilationUnit, parser as python_parser
+from rewrite.python.parser import _parse_in_worker
+
+
+def test_results_in_input_order():
+    sources = [f"x{i} = {i}\n" for i in range(20)]
+    sources[7] = "def f(:\n"
+    inputs = [ParserInput(Path(f"f{i}.py"), None, True, lambda s=s: StringIO(s)) for i, s in enumerate(sources)]
+
+    parsed = list(PythonParserBuilder().parallelism(2).build().parse_inputs(inputs, None, InMemoryExecutionContext()))
+
+    assert [p.source_path for p in parsed] == [i.path for i in inputs]
+    assert isinstance(parsed[7], ParseError)
+    for i, p in enumerate(parsed):
+        if i != 7:
+            assert isinstance(p, CompilationUnit)
+            assert p.print_all() == sources[i]
+
+
+def test_shared_instances_survive_transfer():
+    inputs = [ParserInput(Path("a.py"), None, True, lambda: StringIO("import os\n"))]
+
+    cu = next(iter(PythonParserBuilder().parallelism(2).build().parse_inputs(inputs, None, InMemoryExecutionContext())))
+
+    assert cu.statements[0].markers is Markers.EMPTY
+    assert cu.prefix is Space.EMPTY
+
+
+def test_unreadable_input_becomes_parse_error():
+    def unreadable():
+        raise OSError("permission denied")
+
+    inputs = [ParserInput(Path("a.py"), None, True, lambda: StringIO("a = 1\n")),
+              ParserInput(Path("b.py"), None, True, unreadable),
+              ParserInput(Path("c.py"), None, True, lambda: BytesIO(b"c = '\xff'\n"))]
+
+    parsed = list(PythonParserBuilder().parallelism(2).build().parse_inputs(inputs, None, InMemoryExecutionContext()))
+
+    assert [type(p) for p in parsed] == [CompilationUnit, ParseError, ParseError]
+
+
+def _crash_on_b(source):
+    if source.path.name == 'b.py':
+        os._exit(1)
+    return _parse_in_worker(source)
+
+
+def test_worker_crash_becomes_parse_error(monkeypatch):
+    monkeypatch.setattr(python_parser, '_parse_in_worker', _crash_on_b)
+    inputs = [ParserInput(Path(name), None, True, lambda name=name: StringIO(f"{name[0]} = 1\n"))
+              for name in ('a.py', 'b.py', 'c.py', 'd.py', 'e.py', 'f.py', 'g.py')]
+
+    parsed = list(PythonParserBuilder().parallelism(2).build().parse_inputs(inputs, None, InMemoryExecutionContext()))
+
+    assert [p.source_path for p in parsed] == [i.path for i in inputs]
+    assert isinstance(parsed[1], ParseError)
+    assert isinstance(parsed[-1], CompilationUnit)
+
+
+def test_parser_is_sent_to_each_worker_once(monkeypatch):
+    pickled = []
+    reduce = TypeTable.__reduce__
+    monkeypatch.setattr(TypeTable, '__reduce__', lambda table: pickled.append(table) or reduce(table))
+    inputs = [ParserInput(Path(f"f{i}.py"), None, True, lambda i=i: StringIO(f"x = {i}\n")) for i in range(8)]
+
+    parsed = list(PythonParserBuilder().parallelism(2).build().parse_inputs(inputs, None, InMemoryExecutionContext()))
+
+    assert all(isinstance(p, CompilationUnit) for p in parsed)
+    assert len(pickled) <= 2
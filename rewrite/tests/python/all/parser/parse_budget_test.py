@@ -0,0 +1,59 @@
+import time
+from io import StringIO
+from pathlib import Path
+
+from rewrite import ParserInput, ParseError, InMemoryExecutionContext
+from rewrite.python import PythonParserBuilder, PythonParser, CompilationUnit, ParseBudgetExceeded, \
+    parser as python_parser
+
+
+def parse(parser, *sources: str):
+    inputs = [ParserInput(Path(f"m{i}.py"), None, True, lambda s=s: StringIO(s)) for i, s in enumerate(sources)]
+    ctx = InMemoryExecutionContext()
+    ctx.put_message(PythonParser.SLOWEST_FILES, [])
+    return list(parser.parse_inputs(inputs, None, ctx)), ctx
+
+
+def test_size_budget():
+    parsed, _ = parse(PythonParserBuilder().budget(max_size=20).build(), "x = 1\n", "y = [" + "1, " * 20 + "]\n")
+
+    assert isinstance(parsed[0], CompilationUnit)
+    assert isinstance(parsed[1], ParseError)
+    exceeded = parsed[1].markers.find_first(ParseBudgetExceeded)
+    assert exceeded.budget == ParseBudgetExceeded.Budget.SIZE
+    assert exceeded.size == 67
+    assert parsed[1].text == "y = [" + "1, " * 20 + "]\n"
+
+
+def test_time_budget():
+    source = "".join(f"x{i} = {i}\n" for i in range(2000))
+
+    parsed, _ = parse(PythonParserBuilder().budget(max_seconds=0.001).build(), source)
+
+    assert isinstance(parsed[0], ParseError)
+    exceeded = parsed[0].markers.find_first(ParseBudgetExceeded)
+    assert exceeded.budget == ParseBudgetExceeded.Budget.TIME
+    assert exceeded.elapsed >= 0.001
+
+
+def test_time_budget_covers_print_idempotence_check(monkeypatch):
+    def slow_check(parser, cu, *args):
+        time.sleep(0.05)
+        return cu
+
+    monkeypatch.setattr(python_parser, 'require_print_equals_input', slow_check)
+    parsed, _ = parse(PythonParserBuilder().budget(max_seconds=0.02).build(), "x = 1\n")
+
+    assert isinstance(parsed[0], ParseError)
+    assert parsed[0].markers.find_first(ParseBudgetExceeded).budget == ParseBudgetExceeded.Budget.TIME
+
+
+def test_slowest_files():
+    sources = ["x = 1\n", "".join(f"x{i} = {i}\n" for i in range(500)), "y = 2\n"]
+
+    _, ctx = parse(PythonParserBuilder().build(), *sources)
+
+    slowest = ctx.get_message(PythonParser.SLOWEST_FILES)
+    assert slowest[0].path == Path("m1.py")
+    assert slowest[0].size == len(sources[1])
+    assert [t.seconds for t in slowest] == sorted((t.seconds for t in slowest), reverse=True)
@@ -0,0 +1,39 @@
+from io import StringIO
+from pathlib import Path
+
+from rewrite import InMemoryExecutionContext, ParserInput, ExecutionContext
+from rewrite.python import PythonParser, CompilationUnit
+
+
+def test_source_is_read_once():
+    opened = []
+
+    def source():
+        opened.append(1)
+        return StringIO("x = 1\n")
+
+    ctx = InMemoryExecutionContext()
+    ctx.put_message(ExecutionContext.REQUIRE_PRINT_EQUALS_INPUT, True)
+    cu = next(iter(PythonParser(None).parse_inputs([ParserInput(Path("x.py"), None, True, source)], None, ctx)))
+
+    assert isinstance(cu, CompilationUnit)
+    assert len(opened) == 1
+
+
+def test_parse_files(tmp_path):
+    first, second = tmp_path / "first.py", tmp_path / "second.py"
+    first.write_text("s = 'ä'\n", encoding='utf-8')
+    second.write_text("".join(f"x{i} = 'ö{i}'\n" for i in range(20)), encoding='utf-8')
+
+    parsed = list(PythonParser(None).parse([first, second], tmp_path, InMemoryExecutionContext()))
+
+    assert [p.print_all() for p in parsed] == [first.read_text(encoding='utf-8'), second.read_text(encoding='utf-8')]
+
+
+def test_text_is_dropped_once_parsed():
+    inputs = [ParserInput(Path(f"{name}.py"), None, True, lambda name=name: StringIO(f"{name} = 1\n"))
+              for name in ('a', 'b')]
+    parsed = PythonParser(None).parse_inputs(inputs, None, InMemoryExecutionContext())
+
+    next(iter(parsed))
+    assert inputs[0]._text is None
@@ -0,0 +1,61 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from rewrite import ExecutionContext, ParserInput, PrintEqualsInputMode, ParseError
+from rewrite.parser import require_print_equals_input
+from rewrite.python import PythonParser, CompilationUnit
+
+
+class Context(ExecutionContext):
+    def __init__(self, **messages):
+        self._messages = dict(messages)
+
+    def get_message(self, key, default_value=None):
+        return self._messages.get(key, default_value)
+
+    def put_message(self, key, value):
+        self._messages[key] = value
+
+
+def parse_all(ctx, count=20):
+    inputs = [ParserInput(Path(f"m{i}.py"), None, True, lambda i=i: StringIO(f"x = {i}  # {i}\n"))
+              for i in range(count)]
+    return list(PythonParser(None).parse_inputs(inputs, None, ctx))
+
+
+@pytest.mark.parametrize('mode, verified', [
+    (PrintEqualsInputMode.FULL, 20),
+    (PrintEqualsInputMode.HASH, 20),
+    (PrintEqualsInputMode.OFF, 0),
+])
+def test_verified_count(mode, verified):
+    ctx = Context(**{ExecutionContext.PRINT_EQUALS_INPUT_MODE: mode})
+
+    parsed = parse_all(ctx)
+
+    assert all(isinstance(cu, CompilationUnit) for cu in parsed)
+    assert ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED, 0) == verified
+
+
+def test_sampled_is_stable():
+    ctx = Context(**{ExecutionContext.PRINT_EQUALS_INPUT_MODE: 'sampled',
+                     ExecutionContext.PRINT_EQUALS_INPUT_SAMPLE_RATE: 50})
+
+    parse_all(ctx, 100)
+    first = ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED)
+    parse_all(ctx, 100)
+
+    assert 0 < first < 100
+    assert ctx.get_message(ExecutionContext.PRINT_EQUALS_INPUT_VERIFIED) == 2 * first
+
+
+def test_hash_mode_detects_mismatch():
+    ctx = Context(**{ExecutionContext.PRINT_EQUALS_INPUT_MODE: PrintEqualsInputMode.HASH})
+    parser = PythonParser(None)
+    cu = parse_all(ctx, 1)[0]
+
+    other = ParserInput(Path("m0.py"), None, True, lambda: StringIO("x = 1\n"))
+
+    assert isinstance(require_print_equals_input(parser, cu, other, None, ctx), ParseError)
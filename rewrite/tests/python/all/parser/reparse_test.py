@@ -0,0 +1,58 @@
+import gc
+import weakref
+
+from rewrite.python import PythonParser, CompilationUnit
+
+
+def parse(source: str) -> CompilationUnit:
+    return next(iter(PythonParser(None).parse_strings(source)))
+
+
+def test_unchanged_statements_are_reused():
+    # language=python
+    cu = parse("import os\n\n\ndef f():\n    return 1\n\n\ndef g():\n    return 2\n")
+
+    reparsed = PythonParser(None).reparse(cu, "import os\n\n\ndef f():\n    return 3\n\n\ndef g():\n    return 2\n")
+
+    assert isinstance(reparsed, CompilationUnit)
+    assert reparsed.id == cu.id
+    assert reparsed.print_all() == "import os\n\n\ndef f():\n    return 3\n\n\ndef g():\n    return 2\n"
+    assert reparsed.padding.statements[0] is cu.padding.statements[0]
+    assert reparsed.padding.statements[1] is not cu.padding.statements[1]
+    assert reparsed.padding.statements[2] is cu.padding.statements[2]
+
+
+def test_inserted_and_removed_statements():
+    cu = parse("a = 1\nb = 2\nc = 3\n")
+
+    inserted = PythonParser(None).reparse(cu, "a = 1\nb = 2\nx = 0\nc = 3\n")
+    removed = PythonParser(None).reparse(inserted, "a = 1\nx = 0\nc = 3\n")
+
+    assert inserted.print_all() == "a = 1\nb = 2\nx = 0\nc = 3\n"
+    assert removed.print_all() == "a = 1\nx = 0\nc = 3\n"
+    assert removed.padding.statements[1] is inserted.padding.statements[2]
+
+
+def test_edit_at_end_of_file():
+    cu = parse("a = 1\nb = 2\n")
+
+    reparsed = PythonParser(None).reparse(cu, "a = 1\nb = 2\n# done\n")
+
+    assert reparsed.print_all() == "a = 1\nb = 2\n# done\n"
+    assert reparsed.padding.statements[1] is cu.padding.statements[1]
+
+
+def test_invalid_source_becomes_parse_error():
+    cu = parse("a = 1\n")
+
+    assert not isinstance(PythonParser(None).reparse(cu, "a = (\n"), CompilationUnit)
+
+
+def test_reparsed_trees_are_not_kept_alive():
+    cu = parse("a = 1\nb = 2\n")
+    reparsed = weakref.ref(PythonParser(None).reparse(cu, "a = 1\nb = 3\n"))
+    original = weakref.ref(cu)
+    del cu
+    gc.collect()
+
+    assert original() is None and reparsed() is None
@@ -0,0 +1,57 @@
+import dataclasses
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from pathlib import Path
+from uuid import UUID
+
+from rewrite import InMemoryExecutionContext, ParserInput, SequentialIdGenerator, Markers, random_id, use_id_generator
+from rewrite.python import PythonParserBuilder
+
+
+def collect_ids(tree, ids):
+    if isinstance(tree, UUID):
+        ids.append(tree)
+    elif isinstance(tree, (list, tuple)):
+        for element in tree:
+            collect_ids(element, ids)
+    elif dataclasses.is_dataclass(tree) and not isinstance(tree, type) and tree is not Markers.EMPTY:
+        for f in dataclasses.fields(tree):
+            collect_ids(getattr(tree, f.name), ids)
+    return ids
+
+
+def prefix(generator: SequentialIdGenerator) -> int:
+    return generator().int >> 64
+
+
+def test_ids_are_unique_across_workers():
+    sources = [f"def f{i}(a, b):\n    return a + b * {i}\n" for i in range(8)]
+    inputs = [ParserInput(Path(f"f{i}.py"), None, True, lambda s=s: StringIO(s)) for i, s in enumerate(sources)]
+
+    parser = PythonParserBuilder().parallelism(2).id_generator(SequentialIdGenerator()).build()
+    parsed = list(parser.parse_inputs(inputs, None, InMemoryExecutionContext()))
+
+    ids = collect_ids(parsed, [])
+    assert ids and all(i.version == 8 for i in ids)
+    assert len(set(ids)) == len(ids)
+    assert random_id().version == 4
+
+
+def test_id_generator_is_scoped():
+    generator = SequentialIdGenerator()
+    with use_id_generator(generator):
+        assert random_id().version == 8
+        with use_id_generator(None):
+            assert random_id().version == 8
+    assert random_id().version == 4
+
+
+def test_prefix_is_drawn_once_per_worker():
+    generator = SequentialIdGenerator()
+    assert pickle.loads(pickle.dumps(generator)) is generator
+
+    with ProcessPoolExecutor(1) as executor:
+        prefixes = {executor.submit(prefix, generator).result() for _ in range(3)}
+    assert len(prefixes) == 1
+    assert prefix(generator) not in prefixes
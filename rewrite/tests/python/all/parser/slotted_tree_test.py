@@ -0,0 +1,81 @@
+import copy
+import gc
+import weakref
+
+from rewrite import Markers, Tree
+from rewrite.java import tree as j, Space, JRightPadded, JLeftPadded, JContainer
+from rewrite.python import CompilationUnit, PythonVisitor
+from rewrite.python._pickling import dumps, loads
+from rewrite.python.parser import PythonParserBuilder
+
+# language=python
+SOURCE = """import os  # comment
+
+
+def f(a, b=1, *args, **kwargs):
+    return os.path.join(a, str(b))[0]
+"""
+
+
+def parse() -> CompilationUnit:
+    return next(iter(PythonParserBuilder().build().parse_strings(SOURCE)))
+
+
+def collect(cu: CompilationUnit) -> list:
+    objects = []
+    stack = [cu]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, list):
+            stack.extend(obj)
+        elif isinstance(obj, (Tree, Space, JRightPadded, JLeftPadded, JContainer, Markers)):
+            objects.append(obj)
+            stack.extend(getattr(obj, name) for cls in type(obj).__mro__ for name in getattr(cls, '__slots__', ())
+                         if name != '__weakref__' and hasattr(obj, name))
+            stack.extend(getattr(obj, '_comments', []))
+    return objects
+
+
+def test_trees_have_no_instance_dict():
+    objects = collect(parse())
+
+    assert {type(o) for o in objects} >= {j.MethodInvocation, Space, JRightPadded, JLeftPadded, JContainer, Markers}
+    assert [o for o in objects if hasattr(o, '__dict__')] == []
+
+
+def test_padding_and_with_methods():
+    cu = parse()
+    invocation = cu.statements[1].body.statements[0].expression.indexed
+
+    assert invocation.padding.arguments is invocation.padding.arguments
+    renamed = invocation.with_name(invocation.name.with_simple_name('split'))
+    assert renamed.padding.arguments is invocation.padding.arguments
+    assert renamed.padding.with_select(None).select is None
+    assert invocation.name.simple_name == 'join'
+
+
+def test_copy_and_pickle():
+    cu = parse()
+    cu.statements[1].body.statements[0].expression.indexed.padding.arguments
+
+    assert copy.copy(cu).padding.statements is cu.padding.statements
+    assert copy.deepcopy(cu).print_all() == SOURCE
+    assert loads(dumps(cu)).print_all() == SOURCE
+    assert weakref.ref(cu)() is cu
+
+
+def test_padding_helper_does_not_keep_node_alive():
+    cu = parse()
+    invocation = cu.statements[1].body.statements[0].expression.indexed
+    method = cu.statements[1]
+
+    assert not hasattr(invocation.padding, '__dict__')
+    assert invocation.padding._t is invocation and method.annotations._t is method
+    assert cu.padding.statements is cu.padding.statements
+    collected = weakref.ref(cu)
+    gc.disable()
+    try:
+        del cu, invocation, method
+        assert collected() is None
+    finally:
+        gc.enable()
@@ -0,0 +1,17 @@
+from rewrite.java import Space
+from rewrite.python import PythonParser
+
+
+def test_equal_whitespace_is_shared():
+    # language=python
+    cu = next(iter(PythonParser(None).parse_strings("a = 1\nb = 2\n")))
+
+    a, b = cu.statements
+    assert a.padding.assignment.before is b.padding.assignment.before
+    assert cu.statements[1].prefix is Space.build([], '\n')
+
+
+def test_with_whitespace_interns():
+    assert Space.EMPTY.with_whitespace('\n    ') is Space.build([], '\n    ')
+    assert Space.SINGLE_SPACE.with_whitespace(''.join([' '])) is Space.SINGLE_SPACE
+    assert Space.build([], ' ' * 200) is not Space.build([], ' ' * 200)
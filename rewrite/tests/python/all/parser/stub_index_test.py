@@ -0,0 +1,143 @@
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from rewrite.java import JavaType
+from rewrite.python import CompilationUnit, PythonVisitor
+from rewrite.python._stub_index import StubIndex, CLASS, FUNCTION
+from rewrite.python.parser import PythonParserBuilder
+
+STUBS = {
+    'builtins.pyi': """
+class object: ...
+class int: ...
+class str:
+    def upper(self) -> str: ...
+class list(Generic[_T]): ...
+def len(obj: object, /) -> int: ...
+""",
+    'typing.pyi': "class _Alias: ...\nList = _Alias()\n",
+    'os/__init__.pyi': "from . import path as path\n",
+    'os/path.pyi': "from posixpath import *\n",
+    'posixpath.pyi': """
+import sys
+__all__ = ['join', 'split']
+def join(a: str, *paths: str) -> str: ...
+if sys.version_info >= (3, 0):
+    def split(p: str) -> tuple[str, str]: ...
+else:
+    def split(p: bytes) -> bytes: ...
+def _private() -> None: ...
+""",
+    'shapes.pyi': """
+from typing import List, Optional
+class Shape:
+    def area(self) -> float: ...
+class Square(Shape):
+    @property
+    def side(self) -> int: ...
+    def parts(self) -> List[Shape]: ...
+def find(name: str) -> Optional[Shape]: ...
+""",
+}
+
+
+@pytest.fixture
+def index(tmp_path: Path) -> StubIndex:
+    root = tmp_path / 'stubs'
+    for name, text in STUBS.items():
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text(text)
+    return StubIndex.build(tmp_path / 'index.bin', [root])
+
+
+def test_index_file_mode_follows_umask(index):
+    umask = os.umask(0)
+    os.umask(umask)
+    assert index.path.stat().st_mode & 0o777 == 0o666 & ~umask
+
+
+def test_build_from_command_line(tmp_path):
+    stdlib = tmp_path / 'typeshed' / 'stdlib'
+    for name, text in STUBS.items():
+        (stdlib / name).parent.mkdir(parents=True, exist_ok=True)
+        (stdlib / name).write_text(text)
+
+    result = subprocess.run([sys.executable, '-W', 'error::RuntimeWarning', '-m', 'rewrite.python._build_stub_index',
+                             str(tmp_path / 'index.bin'), '--typeshed', str(tmp_path / 'typeshed')],
+                            capture_output=True, text=True, check=True)
+
+    assert 'RuntimeWarning' not in result.stderr
+    assert StubIndex(tmp_path / 'index.bin').symbol('os.path.join') is not None
+
+
+def test_symbols(index):
+    join = index.symbol('os.path.join')
+    assert (join.name, join.kind) == ('posixpath.join', FUNCTION)
+    assert index.symbol('shapes.Square').kind == CLASS
+    assert index.symbol('posixpath._private') is not None
+    assert index.symbol('os.path._private') is None
+    assert index.symbol('shapes.Circle') is None
+
+
+def test_member_of_base_class(index):
+    area = index.member('shapes.Square', 'area')
+    assert area.name == 'shapes.Shape.area'
+    assert index.method(area, index.type('shapes.Square')).return_type is JavaType.Primitive.Double
+
+
+def test_types(index):
+    parts = index.method(index.member('shapes.Square', 'parts'), None).return_type
+    assert isinstance(parts, JavaType.Parameterized)
+    assert parts._type._fully_qualified_name == 'builtins.list'
+    assert parts._type_parameters[0]._fully_qualified_name == 'shapes.Shape'
+    assert index.method(index.symbol('shapes.find'), None).return_type._fully_qualified_name == 'shapes.Shape'
+    assert index.method(index.symbol('posixpath.split'), None).parameter_types == [JavaType.Primitive.String]
+
+
+def test_pickles_as_path(index):
+    copy = pickle.loads(pickle.dumps(index))
+    assert copy.path == index.path
+    assert copy.symbol('os.path.join') == index.symbol('os.path.join')
+
+
+def method_types(cu: CompilationUnit) -> List[JavaType.Method]:
+    class Collect(PythonVisitor[list]):
+        def visit_method_invocation(self, method, p):
+            p.append(method.method_type)
+            return super().visit_method_invocation(method, p)
+
+    types = []
+    Collect().visit(cu, types)
+    return types
+
+
+def test_parse_with_stub_index(index):
+    parser = PythonParserBuilder().stub_index(index.path).build()
+    cu = next(iter(parser.parse_strings("import os.path\nfrom shapes import find\n\n"
+                                        "os.path.join('a', 'b').upper()\nfind('a').area()\n")))
+
+    upper, join, area, find = method_types(cu)
+    assert (join.declaring_type._fully_qualified_name, join.name) == ('os.path', 'join')
+    assert join.return_type is JavaType.Primitive.String
+    assert join.parameter_names == ['a', 'paths']
+    assert (upper.declaring_type._fully_qualified_name, upper.parameter_names) == ('builtins.str', [])
+    assert find.return_type._fully_qualified_name == 'shapes.Shape'
+    assert area.return_type is JavaType.Primitive.Double
+
+
+def test_reparse_with_stub_index(index):
+    parser = PythonParserBuilder().stub_index(index.path).build()
+    cu = next(iter(parser.parse_strings("import os.path\n\nx = 1\n")))
+
+    reparsed = parser.reparse(cu, "import os.path\n\nx = os.path.join('a', 'b')\n")
+
+    assert reparsed.padding.statements[0] is cu.padding.statements[0]
+    join, = method_types(reparsed)
+    assert (join.declaring_type._fully_qualified_name, join.name) == ('os.path', 'join')
+    assert join.return_type is JavaType.Primitive.String
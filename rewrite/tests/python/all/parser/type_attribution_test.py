@@ -0,0 +1,121 @@
+import os
+from io import BytesIO, StringIO
+from pathlib import Path
+from typing import cast
+
+from rewrite import InMemoryExecutionContext, ParserInput, ParseError
+from rewrite.java import tree as j
+from rewrite.python import CompilationUnit
+from rewrite.python import _type_attribution
+from rewrite.python.parser import PythonParserBuilder
+
+# language=python
+DEP = """class Widget:
+    def name(self):
+        return 'w'
+
+
+def make(n):
+    return Widget()
+"""
+
+# language=python
+APP = """from .dep import make
+from pkg import dep
+
+w = make(1)
+v = dep.Widget()
+"""
+
+
+def parse(root: Path, cache: Path):
+    parser = PythonParserBuilder().type_attribution(cache).build()
+    return {cu.source_path.name: cu for cu in parser.parse(sorted(root.rglob('*.py')), root,
+                                                           InMemoryExecutionContext())}
+
+
+def method_types(cu: CompilationUnit):
+    invocations = [cast(j.Assignment, s).assignment for s in cu.statements[2:]]
+    assert all(isinstance(i, j.MethodInvocation) for i in invocations)
+    return [i.method_type for i in invocations]
+
+
+def test_types_from_imported_project_modules(tmp_path, monkeypatch):
+    root = tmp_path / 'src'
+    (root / 'pkg').mkdir(parents=True)
+    (root / 'pkg' / '__init__.py').write_text('')
+    (root / 'pkg' / 'dep.py').write_text(DEP)
+    (root / 'pkg' / 'app.py').write_text(APP)
+
+    make, widget = method_types(parse(root, tmp_path / 'cache')['app.py'])
+
+    assert make.name == 'make'
+    assert make.declaring_type._fully_qualified_name == 'pkg.dep'
+    assert make.return_type._fully_qualified_name == 'pkg.dep.Widget'
+    assert widget.return_type is make.return_type
+
+    # unchanged modules are not analyzed again
+    monkeypatch.setattr(_type_attribution, '_infer_stub', None)
+    make, _ = method_types(parse(root, tmp_path / 'cache')['app.py'])
+    assert make.return_type._fully_qualified_name == 'pkg.dep.Widget'
+
+
+def test_module_name():
+    assert _type_attribution.module_name(Path('/src/pkg/mod.py'), Path('/src')) == 'pkg.mod'
+    assert _type_attribution.module_name(Path('pkg/__init__.py')) == 'pkg'
+
+
+def test_unreadable_modules_become_parse_errors(tmp_path):
+    def unreadable():
+        raise OSError("permission denied")
+
+    inputs = [ParserInput(Path('pkg/dep.py'), None, True, lambda: StringIO(DEP)),
+              ParserInput(Path('pkg/broken.py'), None, True, unreadable),
+              ParserInput(Path('pkg/latin.py'), None, True, lambda: BytesIO(b"c = '\xff'\n"))]
+
+    parser = PythonParserBuilder().type_attribution(tmp_path / 'cache').build()
+    parsed = list(parser.parse_inputs(inputs, None, InMemoryExecutionContext()))
+
+    assert [type(p) for p in parsed] == [CompilationUnit, ParseError, ParseError]
+
+
+def _crash(*args):
+    os._exit(1)
+
+
+def test_project_is_parsed_without_types_when_inference_fails(tmp_path, monkeypatch):
+    monkeypatch.setattr(_type_attribution, '_infer_stub', _crash)
+    root = tmp_path / 'src'
+    (root / 'pkg').mkdir(parents=True)
+    (root / 'pkg' / 'dep.py').write_text(DEP)
+    (root / 'pkg' / 'app.py').write_text(APP)
+
+    parser = PythonParserBuilder().type_attribution(tmp_path / 'cache', parallelism=2).build()
+    parsed = {cu.source_path.name: cu for cu in parser.parse(sorted(root.rglob('*.py')), root,
+                                                             InMemoryExecutionContext())}
+
+    assert all(isinstance(cu, CompilationUnit) for cu in parsed.values())
+    assert parsed['app.py'].print_all() == APP
+
+
+def test_local_names_shadow_imported_project_modules(tmp_path):
+    root = tmp_path / 'src'
+    (root / 'pkg').mkdir(parents=True)
+    (root / 'pkg' / '__init__.py').write_text('')
+    (root / 'pkg' / 'dep.py').write_text(DEP)
+    # language=python
+    (root / 'pkg' / 'app.py').write_text(APP + """
+
+def run(make, dep):
+    a = make(1)
+    b = dep.Widget()
+""")
+
+    cu = parse(root, tmp_path / 'cache')['app.py']
+    run = cast(j.MethodDeclaration, cu.statements[-1])
+    make, widget = [cast(j.Assignment, s).assignment for s in run.body.statements]
+
+    assert make.method_type is None or make.method_type.declaring_type._fully_qualified_name != 'pkg.dep'
+    assert widget.method_type is None or widget.method_type.declaring_type._fully_qualified_name != 'pkg.dep'
+    assert cast(j.Assignment, cu.statements[2]).assignment.method_type.declaring_type._fully_qualified_name == \
+           'pkg.dep'
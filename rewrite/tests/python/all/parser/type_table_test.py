@@ -0,0 +1,149 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import cast
+
+from rewrite.java import JavaType, TypeTable
+from rewrite.java import tree as j
+from rewrite.python import PythonParser
+from rewrite.python import _pickling
+
+
+def test_class_types_are_shared():
+    table = TypeTable()
+    str_type = table.class_type('str')
+
+    assert table.class_type('str') is str_type
+    assert table.parameterized(str_type, [table.class_type('int')]) is \
+           table.parameterized(table.class_type('str'), [table.class_type('int')])
+
+
+def test_intern_equivalent_method():
+    table = TypeTable()
+    method = table.method(table.class_type('m'), 'f', table.class_type('int'), ['a'], [table.class_type('str')])
+    equivalent = JavaType.Method(_declaring_type=table.class_type('m'), _name='f',
+                                 _return_type=table.class_type('int'), _parameter_names=['a'],
+                                 _parameter_types=[table.class_type('str')])
+
+    assert table.intern(equivalent) is method
+    assert table.intern(JavaType.ShallowClass()) is not table.intern(JavaType.ShallowClass())
+
+
+def test_least_recently_used_types_are_evicted():
+    table = TypeTable(max_size=2)
+    a = table.class_type('a')
+    table.class_type('b')
+    assert table.class_type('a') is a
+    table.class_type('c')
+
+    assert len(table) == 2
+    assert table.get('a') is a
+    assert table.get('b') is None
+
+
+def test_concurrent_interning():
+    table = TypeTable()
+    with ThreadPoolExecutor(8) as executor:
+        types = list(executor.map(lambda i: table.class_type(f"t{i % 10}"), range(1000)))
+
+    assert len(table) == 10
+    assert all(t is table.get(t._fully_qualified_name) for t in types)
+
+
+def test_more_complete_types_replace_interned_ones():
+    table = TypeTable()
+    bare = table.class_type('a')
+    complete = JavaType.Class()
+    complete._flags_bit_map = 0
+    complete._kind = JavaType.FullyQualified.Kind.Class
+    complete._fully_qualified_name = 'a'
+    complete._methods = [table.method(bare, 'f')]
+
+    assert table.intern(complete) is complete
+    assert table.class_type('a') is complete
+    assert table.intern(bare) is complete
+    assert not hasattr(bare, '_methods')
+
+
+def test_remote_types_referred_to_by_their_members_are_kept():
+    from rewrite.java.remote import register
+
+    class Remoting:
+        def __init__(self):
+            self.ids = {}
+
+        def add_by_id(self, key, value):
+            self.ids[key] = value
+
+    context = SimpleNamespace(remoting_context=Remoting())
+    interned = JavaType.Class()
+    interned._fully_qualified_name = 'type_table_test.Remote'
+    interned._methods = [JavaType.Method(_declaring_type=interned, _name=name) for name in ('f', 'g')]
+    remote = JavaType.Class()
+    remote._fully_qualified_name = 'type_table_test.Remote'
+    remote._methods = [JavaType.Method(_declaring_type=remote, _name='f')]
+    bare = JavaType.Class()
+    bare._fully_qualified_name = 'type_table_test.Remote'
+
+    with TypeTable().activate() as table:
+        assert table.intern(interned) is interned
+        assert register._intern(remote, 1, context) is remote
+        assert register._intern(bare, 2, context) is interned
+    assert context.remoting_context.ids == {2: interned}
+
+
+def test_interned_classes_are_not_changed():
+    table = TypeTable()
+    bare = table.class_type('b')
+    with_interfaces = table.class_type('b', interfaces=[table.class_type('base')])
+
+    assert bare._interfaces == [] and with_interfaces is not bare
+    assert table.class_type('b') is with_interfaces
+
+
+def self_referring_class(table: TypeTable) -> JavaType.Class:
+    """A class with a method returning a list of the class, so that the class is referred to two levels down."""
+    cls = JavaType.Class()
+    cls._fully_qualified_name = 'type_table_test.Node'
+    cls._methods = [table.method(cls, 'children', table.parameterized(table.class_type('list'), [cls]))]
+    return cls
+
+
+def test_types_referring_back_through_other_types():
+    table = TypeTable()
+    cls = self_referring_class(table)
+
+    assert TypeTable.refers_back(cls)
+    assert TypeTable.refers_back(cls._methods[0])
+    assert not TypeTable.refers_back(table.class_type('list'))
+
+
+def test_parsers_do_not_share_types():
+    def declared_type(parser: PythonParser, source: str) -> JavaType.Class:
+        cu = next(iter(parser.parse_strings(source)))
+        return cast(j.ClassDeclaration, cu.statements[0]).type
+
+    parser = PythonParser(None)
+    first = declared_type(parser, "class A:\n    pass\n")
+
+    assert declared_type(parser, "class A:\n    x = 1\n") is first
+    assert declared_type(PythonParser(None), "class A:\n    pass\n") is not first
+    assert TypeTable.current() is TypeTable.DEFAULT
+
+
+def test_types_are_interned_on_load():
+    table = TypeTable()
+    method = table.method(table.class_type('m'), 'f', table.class_type('int'))
+    cls = self_referring_class(table)
+    data = _pickling.dumps([method, cls])
+
+    with table.activate():
+        loaded_method, loaded_cls = _pickling.loads(data)
+    assert loaded_method is method
+    assert loaded_cls is not cls
+    assert loaded_cls._methods[0].declaring_type is loaded_cls
+    assert loaded_cls._methods[0].return_type._type is table.class_type('list')
+
+    with TypeTable().activate() as other:
+        loaded_method, _ = _pickling.loads(data)
+    assert loaded_method is not method
+    assert other.get(TypeTable.signature(method)) is loaded_method